@@ -0,0 +1,74 @@
+"""
+Synthetic PDF corpus for the benchmarks: papers with Markdown-friendly
+headings, body text and a references section, generated deterministically
+from a seed so every run and every commit measures the same documents.
+"""
+import os
+import random
+
+
+WORDS = ("model data results method analysis training network performance evaluation system "
+         "learning approach dataset layer feature accuracy baseline proposed experiment table "
+         "figure section error parameter optimization sample distribution inference task").split()
+
+SECTIONS = ("Introduction", "Related Work", "Method", "Experiments", "Results", "Discussion", "Conclusion")
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 in points
+MARGIN = 56
+
+
+def sentence(rng):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 20))]
+    return " ".join(words).capitalize() + "."
+
+
+def paragraph(rng):
+    return " ".join(sentence(rng) for _ in range(rng.randint(3, 6)))
+
+
+def write_pdf(path, rng, pages, references_pages):
+    """One paper: title, a section every page or so, then the references"""
+    import pymupdf
+
+    doc = pymupdf.open()
+    rect = pymupdf.Rect(MARGIN, MARGIN, PAGE_WIDTH - MARGIN, PAGE_HEIGHT - MARGIN)
+    for number in range(pages + references_pages):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        if number >= pages:
+            heading = "References" if number == pages else ""
+            body = "\n".join(f"[{i}] {sentence(rng)}" for i in range(1, 25))
+        elif number == 0:
+            heading = sentence(rng).rstrip('.')
+            body = "Abstract\n" + paragraph(rng)
+        else:
+            heading = SECTIONS[(number - 1) % len(SECTIONS)]
+            body = "\n\n".join(paragraph(rng) for _ in range(3))
+        y = rect.y0
+        if heading:
+            page.insert_text((rect.x0, y + 18), heading, fontsize=16, fontname="helv")
+            y += 36
+        page.insert_textbox(pymupdf.Rect(rect.x0, y, rect.x1, rect.y1), body, fontsize=10, fontname="helv")
+    doc.save(path)
+    doc.close()
+
+
+def generate_corpus(folder, files=20, pages=8, references_pages=2, seed=1234):
+    """
+    Writes the corpus to folder (skipping files that already exist) and returns
+    {'files': [...], 'pages': total content pages}. Page counts vary +-50%
+    around pages so the pipeline sees uneven documents.
+    """
+    os.makedirs(folder, exist_ok=True)
+    rng = random.Random(seed)
+    names = []
+    total_pages = 0
+    for index in range(files):
+        doc_pages = max(1, int(pages * rng.uniform(0.5, 1.5)))
+        doc_rng = random.Random(rng.random())
+        name = f"paper_{index:04d}.pdf"
+        path = os.path.join(folder, name)
+        if not os.path.exists(path):
+            write_pdf(path, doc_rng, doc_pages, references_pages)
+        names.append(name)
+        total_pages += doc_pages
+    return {'files': names, 'pages': total_pages}
@@ -0,0 +1,41 @@
+"""
+Runs the mock OpenAI-compatible endpoint (core/mock_backend.py) as a
+standalone server, e.g. for a daemon or another machine to point its
+'api_base_url' at.
+
+    python -m benchmarks.mock_server --port 8765 --ttft 0.5 --tps 80 --error-rate 0.02
+"""
+import argparse
+
+from core.mock_backend import (DEFAULT_MOCK_OUTPUT_TOKENS, DEFAULT_MOCK_TPS, DEFAULT_MOCK_TTFT,
+                               DEFAULT_MOCK_TTFT_SIGMA, MockConfig, MockServer)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible chat completions server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--ttft', type=float, default=DEFAULT_MOCK_TTFT, help="median time to first token (s)")
+    parser.add_argument('--ttft-sigma', type=float, default=DEFAULT_MOCK_TTFT_SIGMA,
+                        help="log-normal spread of the TTFT")
+    parser.add_argument('--tps', type=float, default=DEFAULT_MOCK_TPS, help="output tokens per second")
+    parser.add_argument('--output-tokens', type=int, default=DEFAULT_MOCK_OUTPUT_TOKENS)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    config = MockConfig(args.ttft, args.ttft_sigma, args.tps, args.output_tokens,
+                        args.error_rate, args.throttle_rate, args.seed)
+    server = MockServer(config, args.host, args.port)
+    print(f"Mock endpoint at {server.url}", flush=True)
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Benchmark harness: runs the scenarios against a generated corpus and a
+local mock endpoint and writes a JSON report that can be compared across
+commits.
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --quick --scenarios extraction,state_save
+    python -m benchmarks.run --output new.json --compare old.json
+
+Everything runs in a scratch directory, so the caches, manifests and state
+database of the application are never touched.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+import multiprocessing
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks import scenarios
+from benchmarks.corpus import generate_corpus
+from core.mock_backend import MockConfig
+
+
+# (full, --quick) parameters of each run
+PARAMS = {
+    'corpus_files': (40, 8),
+    'corpus_pages': (10, 4),
+    'concurrency_levels': ([1, 4, 16], [1, 4]),
+    'state_records': (5000, 500),
+    'gui_events': (500000, 50000),
+}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def flatten(results, prefix=''):
+    """{'a': {'b': 1}} -> {'a.b': 1}, keeping only numbers, so reports diff key by key"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def run_scenarios(names, params, args):
+    from utils.extraction_pool import default_pool_size
+
+    corpus_folder = os.path.abspath(args.corpus or 'corpus')
+    corpus = None
+    if {'extraction', 'end_to_end'} & set(names):
+        print(f"Generating corpus in {corpus_folder}...", flush=True)
+        corpus = generate_corpus(corpus_folder, params['corpus_files'], params['corpus_pages'], seed=args.seed)
+
+    results = {}
+    for name in names:
+        print(f"Running {name}...", flush=True)
+        start = time.perf_counter()
+        if name == 'extraction':
+            worker_counts = sorted({1, default_pool_size()})
+            results[name] = scenarios.extraction(corpus_folder, corpus, worker_counts)
+        elif name == 'end_to_end':
+            mock = MockConfig(args.ttft, 0.5, args.tps, args.output_tokens, args.error_rate,
+                              args.throttle_rate, args.seed)
+            results[name] = scenarios.end_to_end(corpus_folder, corpus, params['concurrency_levels'], mock)
+        elif name == 'state_save':
+            results[name] = scenarios.state_save(params['state_records'])
+        elif name == 'gui_events':
+            results[name] = scenarios.gui_events(events=params['gui_events'])
+        print(f"  {name} took {time.perf_counter() - start:.1f}s", flush=True)
+    return results
+
+
+def compare(report, baseline):
+    """Prints the change of every metric present in both reports"""
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'} ({baseline.get('timestamp')}):")
+    old = baseline.get('metrics', {})
+    for key, value in sorted(report['metrics'].items()):
+        if key not in old:
+            continue
+        before = old[key]
+        change = f"{(value - before) / before * 100:+.1f}%" if before else "n/a"
+        print(f"  {key:<55} {before:>12.3f} -> {value:>12.3f}  {change}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks of the extraction and processing pipeline")
+    parser.add_argument('--scenarios', default=','.join(scenarios.SCENARIOS),
+                        help=f"comma-separated subset of {', '.join(scenarios.SCENARIOS)}")
+    parser.add_argument('--quick', action='store_true', help="smaller corpus and fewer events, for a smoke run")
+    parser.add_argument('--output', help="write the JSON report here")
+    parser.add_argument('--compare', help="an earlier JSON report to compare with")
+    parser.add_argument('--corpus', help="keep the generated corpus in this folder and reuse it")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--ttft', type=float, default=0.5, help="mock median time to first token (s)")
+    parser.add_argument('--tps', type=float, default=200.0, help="mock output tokens per second")
+    parser.add_argument('--output-tokens', type=int, default=300, help="mock output tokens per request")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of mock requests failing with 5xx")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="share of mock requests answered 429")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in names if name not in scenarios.SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    params = {key: values[1 if args.quick else 0] for key, values in PARAMS.items()}
+
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    if args.corpus:
+        args.corpus = os.path.abspath(args.corpus)
+
+    workdir = tempfile.mkdtemp(prefix='pdf-bench-')
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        results = run_scenarios(names, params, args)
+    finally:
+        from core.async_engine import shutdown_async_engine
+        from utils.extraction_pool import shutdown_extraction_pool
+        shutdown_extraction_pool()
+        shutdown_async_engine()
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': args.seed,
+        'quick': args.quick,
+        'params': params,
+        'mock': {'ttft': args.ttft, 'tps': args.tps, 'output_tokens': args.output_tokens,
+                 'error_rate': args.error_rate, 'throttle_rate': args.throttle_rate},
+        'results': results,
+        'metrics': flatten(results),
+    }
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"Report written to {output}")
+    else:
+        print(text)
+    if baseline:
+        compare(report, baseline)
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,198 @@
+"""
+Benchmark scenarios. Each returns a dict of results whose numeric values
+are compared across reports; the working directory is a scratch directory,
+so the application's saves/ paths point there and never at real data.
+"""
+import os
+import math
+import time
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+
+def extraction(corpus_folder, corpus, worker_counts):
+    """PDF to Markdown throughput, uncached, for each process pool size"""
+    from utils.pdf_extract import extract_text_with_precision, load_extractor
+
+    paths = [os.path.join(corpus_folder, name) for name in corpus['files']]
+    results = {}
+    for workers in worker_counts:
+        with ProcessPoolExecutor(max_workers=workers, initializer=load_extractor) as pool:
+            # Start the workers (and load the libraries) outside the timing
+            list(pool.map(int, range(workers)))
+            start = time.perf_counter()
+            texts = list(pool.map(extract_text_with_precision, paths, [False] * len(paths)))
+            elapsed = time.perf_counter() - start
+        results[f"workers_{workers}"] = {
+            'seconds': elapsed,
+            'files_per_second': len(paths) / elapsed,
+            'pages_per_second': corpus['pages'] / elapsed,
+            'failed_files': sum(1 for text in texts if not text),
+        }
+    return results
+
+
+def run_headless_process(process_id, pdf_folder, output_folder, settings, concurrency):
+    """Runs one process on the asyncio engine and waits for it; returns (success, message, seconds)"""
+    from core.async_engine import AsyncProcessRunner, get_async_engine
+    from core.pipeline import ProcessEvents
+
+    record = {
+        'id': process_id,
+        'name': process_id,
+        'instruction': "Summarize the paper in five bullet points.",
+        'pdf_folder': pdf_folder,
+        'output_folder': output_folder,
+        'model_name': 'mock/model:bench',
+        'max_concurrent_files': concurrency,
+        'reuse_cached_results': False,
+        'stream_responses': True,
+        'status': 'pending',
+        'created_at': datetime.now().isoformat(),
+    }
+    outcome = {}
+
+    def finished(_, success, message):
+        outcome.update(success=success, message=message)
+
+    runner = AsyncProcessRunner(record, settings, ProcessEvents(finished=finished))
+    start = time.perf_counter()
+    get_async_engine().submit(runner.run()).result()
+    return outcome.get('success', False), outcome.get('message', ''), time.perf_counter() - start
+
+
+def end_to_end(corpus_folder, corpus, concurrency_levels, mock_config):
+    """
+    Files per minute through extraction, scheduling, streaming and result
+    writes against the mock endpoint, for each files-in-flight setting.
+    Extraction is warmed into the cache first, so this measures the API stage.
+    """
+    from core.mock_backend import MockServer
+    from core.scheduler import get_scheduler
+    from utils.extraction_pool import submit_extraction
+
+    for future in [submit_extraction(os.path.join(corpus_folder, name)) for name in corpus['files']]:
+        future.result()
+
+    results = {}
+    with MockServer(mock_config) as server:
+        settings = {
+            'hf_api_key': 'benchmark',
+            'api_base_url': server.url,
+            'global_max_concurrent_requests': max(concurrency_levels),
+            'max_retries': 5,
+            'max_input_tokens': 0,
+        }
+        get_scheduler().configure(settings)
+        for concurrency in concurrency_levels:
+            before = server.stats.snapshot()
+            process_id = f"bench_e2e_{concurrency}_{int(time.time() * 1000)}"
+            success, message, elapsed = run_headless_process(
+                process_id, corpus_folder, os.path.join('output', process_id), settings, concurrency)
+            after = server.stats.snapshot()
+            results[f"concurrency_{concurrency}"] = {
+                'success': success,
+                'message': message,
+                'seconds': elapsed,
+                'files_per_minute': len(corpus['files']) * 60 / elapsed,
+                'requests': after['requests'] - before['requests'],
+                'injected_failures': after['failures'] - before['failures'],
+            }
+    return results
+
+
+def state_save(records=2000, batch_sizes=(1, 50, 500)):
+    """SQLite upsert cost of process records, as written by the debounced state store"""
+    from core.database import Database
+
+    db = Database(os.path.join('saves', 'bench_state.db'))
+    record_size = 0
+    results = {}
+    try:
+        template = {
+            'name': 'Benchmark process', 'instruction': 'Summarize. ' * 40, 'pdf_folder': '/data/pdfs',
+            'output_folder': '/data/out', 'model_name': 'mock/model:bench', 'folder_id': 'root',
+            'status': 'running', 'current': 10, 'total': 200, 'progress': 5,
+            'preflight_tokens': {f"paper_{i:04d}.pdf": 5000 + i for i in range(200)},
+            'created_at': datetime.now().isoformat(),
+        }
+        all_records = [dict(template, id=f"process_{i:06d}") for i in range(records)]
+        record_size = len(json.dumps(all_records[0]))
+        for batch in batch_sizes:
+            start = time.perf_counter()
+            for offset in range(0, records, batch):
+                db.save_processes(all_records[offset:offset + batch])
+            elapsed = time.perf_counter() - start
+            results[f"batch_{batch}"] = {
+                'seconds': elapsed,
+                'records_per_second': records / elapsed,
+                'ms_per_transaction': elapsed * 1000 / math.ceil(records / batch),
+            }
+    finally:
+        db.close()
+    results['record_bytes'] = record_size
+    return results
+
+
+def gui_events(processes=200, events=200000):
+    """
+    Worker events through the update coalescer into the process list model,
+    as the main window wires them; measures events/s and the number of row
+    refreshes they collapse into.
+    """
+    from PyQt6.QtCore import QCoreApplication, QObject, pyqtSignal
+    from core.process_model import ProcessListModel
+    from core.ui_updates import UpdateCoalescer
+
+    class Emitter(QObject):
+        progress_updated = pyqtSignal(str, int, int)
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    records = {f"process_{i}": {'id': f"process_{i}", 'name': f"Process {i}", 'status': 'running',
+                                'current': 0, 'total': events} for i in range(processes)}
+    model = ProcessListModel(records)
+    model.set_processes(list(records))
+    refreshes = {'count': 0}
+
+    def on_progress(process_id, current, total):
+        records[process_id]['current'] = current
+        refreshes['count'] += 1
+        model.refresh(process_id)
+
+    def on_status(process_id, status):
+        records[process_id]['status'] = status
+        model.refresh(process_id)
+
+    coalescer = UpdateCoalescer(on_progress, on_status, lambda entries: None, model.set_token_progress)
+    # Signals emitted on a worker thread reach the coalescer through queued
+    # connections, exactly as ProcessWorker's signals reach the main window
+    emitter = Emitter()
+    emitter.progress_updated.connect(coalescer.queue_progress)
+    process_ids = list(records)
+    done = threading.Event()
+
+    def emit():
+        for i in range(events):
+            emitter.progress_updated.emit(process_ids[i % processes], i, events)
+        done.set()
+
+    start = time.perf_counter()
+    thread = threading.Thread(target=emit)
+    thread.start()
+    while not done.is_set():
+        app.processEvents()
+    thread.join()
+    app.processEvents()  # the last queued signals
+    coalescer.flush()
+    elapsed = time.perf_counter() - start
+    return {
+        'seconds': elapsed,
+        'events_per_second': events / elapsed,
+        'row_refreshes': refreshes['count'],
+        'events_per_refresh': events / max(1, refreshes['count']),
+    }
+
+
+SCENARIOS = ('extraction', 'end_to_end', 'state_save', 'gui_events')
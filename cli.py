@@ -0,0 +1,416 @@
+"""
+Headless runner: processes PDF folders without the GUI.
+
+    python cli.py run --name NAME --instruction-file FILE --pdf-folder DIR
+    python cli.py submit --name NAME --instruction-file FILE --pdf-folder DIR
+    python cli.py daemon
+    python cli.py estimate --instruction-file FILE --pdf-folder DIR
+    python cli.py list
+    python cli.py --backend mock run ...   (offline dry run against the bundled mock endpoint)
+
+Processes run on the asyncio engine and share the GUI's state database,
+caches and logs. Progress is written to stdout as one JSON object per line.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import multiprocessing
+from datetime import datetime
+
+
+# Progress is saved to the database at most this often, like the GUI's StateStore;
+# status changes and the end of a process are saved immediately
+PROGRESS_SAVE_INTERVAL = 1.0
+
+
+class EventWriter:
+    """Writes worker events to stdout, as JSON lines or readable text"""
+
+    def __init__(self, fmt='jsonl'):
+        self.fmt = fmt
+        self.lock = threading.Lock()
+
+    def write(self, event, process_id, **fields):
+        with self.lock:
+            if self.fmt == 'jsonl':
+                record = {'time': datetime.now().isoformat(timespec='seconds'), 'event': event,
+                          'process_id': process_id}
+                record.update(fields)
+                print(json.dumps(record, ensure_ascii=False), flush=True)
+            elif event == 'progress':
+                print(f"[{process_id}] {fields['current']}/{fields['total']}", flush=True)
+            elif event != 'tokens':
+                print(f"[{process_id}] {event}: {next(iter(fields.values()), '')}", flush=True)
+
+
+class HeadlessProcess:
+    """Runs one process record on the asyncio engine and persists its progress"""
+
+    def __init__(self, record, settings, db, log_store, writer):
+        from core.async_engine import AsyncProcessRunner
+        from core.pipeline import ProcessEvents
+
+        self.record = record
+        self.db = db
+        self.log_store = log_store
+        self.writer = writer
+        self.success = False
+        self.last_save = 0.0
+        events = ProcessEvents(progress=self.on_progress, status=self.on_status, finished=self.on_finished,
+                               log=self.on_log, tokens=self.on_tokens)
+        self.runner = AsyncProcessRunner(record, settings, events)
+        self.future = None
+
+    def start(self):
+        """Starts the process; returns False if another runner holds its lease"""
+        from core.async_engine import get_async_engine
+
+        # Leased, so the GUI doesn't resume the process while this runner owns it
+        process_id = self.record['id']
+        if not self.db.acquire_lease(process_id):
+            self.on_log(process_id, "Not started: the process is running in another instance")
+            return False
+        self.future = get_async_engine().submit(self.runner.run())
+        self.future.add_done_callback(lambda _: self.db.release_lease(process_id))
+        return True
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    def save(self):
+        self.last_save = time.monotonic()
+        try:
+            self.db.save_processes([self.record])
+        except Exception as e:
+            print(f"Error saving process {self.record['id']}: {e}", file=sys.stderr)
+
+    def on_progress(self, process_id, current, total):
+        self.record['current'] = current
+        self.record['total'] = total
+        self.record['progress'] = int(current / total * 100) if total else 0
+        if time.monotonic() - self.last_save >= PROGRESS_SAVE_INTERVAL:
+            self.save()
+        self.writer.write('progress', process_id, current=current, total=total)
+
+    def on_status(self, process_id, status):
+        self.record['status'] = status
+        self.save()
+        self.writer.write('status', process_id, status=status)
+
+    def on_finished(self, process_id, success, message):
+        self.success = success
+        if not success and self.record.get('status') not in ('cancelled', 'failed'):
+            self.on_status(process_id, 'failed')
+        else:
+            self.save()  # the final progress
+        self.log_store.append([(process_id, message)])
+        self.writer.write('finished', process_id, success=success, message=message)
+
+    def on_log(self, process_id, message):
+        self.log_store.append([(process_id, message)])
+        self.writer.write('log', process_id, message=message)
+
+    def on_tokens(self, process_id, pdf_file, tokens):
+        self.writer.write('tokens', process_id, file=pdf_file, tokens=tokens)
+
+
+def load_instruction(args):
+    if args.instruction_file:
+        with open(args.instruction_file, 'r', encoding='utf-8') as f:
+            return f.read()
+    return args.instruction
+
+
+def new_process_record(args, settings, status):
+    """Builds a process record the same way the GUI's new-process dialog does"""
+    from core.pipeline import DEFAULT_MODEL_NAME, DEFAULT_MAX_CONCURRENT_FILES
+
+    instruction = load_instruction(args)
+    if not instruction:
+        raise ValueError("An instruction (--instruction or --instruction-file) is required")
+    if not os.path.isdir(args.pdf_folder):
+        raise ValueError(f"PDF folder does not exist: {args.pdf_folder}")
+
+    output_folder = args.output_folder or os.path.join(
+        settings.get('default_output_folder', os.getcwd()), args.name)
+    os.makedirs(output_folder, exist_ok=True)
+
+    return {
+        'id': f"process_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}",
+        'name': args.name,
+        'instruction': instruction,
+        'pdf_folder': os.path.abspath(args.pdf_folder),
+        'output_folder': os.path.abspath(output_folder),
+        'model_name': args.model or settings.get('model_name', DEFAULT_MODEL_NAME),
+        'max_concurrent_files': args.concurrency or settings.get('max_concurrent_files',
+                                                                 DEFAULT_MAX_CONCURRENT_FILES),
+        'priority': args.priority,
+        'reuse_cached_results': not args.no_cache,
+        'stream_responses': not args.no_stream,
+        'token_budget': args.token_budget,
+        'cost_budget': args.cost_budget,
+        'folder_id': args.folder,
+        'status': status,
+        'current': 0,
+        'total': 0,
+        'progress': 0,
+        'created_at': datetime.now().isoformat()
+    }
+
+
+def add_budget_estimates(record, settings):
+    """With a budget, estimates every file first so the process runs smallest files first"""
+    from core.preflight import run_preflight
+
+    if record['token_budget'] or record['cost_budget']:
+        report = run_preflight(record['pdf_folder'], record['instruction'], record['model_name'], settings,
+                               record['max_concurrent_files'])
+        record['preflight_tokens'] = report.token_estimates()
+
+
+def open_state(args):
+    from core.database import get_database
+    from core.log_store import ProcessLogStore
+    from core.scheduler import get_scheduler
+
+    db = get_database()
+    settings = db.load_settings()
+    if os.environ.get('HF_API_KEY'):
+        settings['hf_api_key'] = os.environ['HF_API_KEY']
+    # Command line overrides of the API backend, for this run only
+    if args.base_url:
+        settings['api_base_url'] = args.base_url
+        settings['api_backend'] = args.backend or 'custom'
+    elif args.backend:
+        settings['api_backend'] = args.backend
+    get_scheduler().configure(settings)
+    return db, settings, ProcessLogStore()
+
+
+def start_heartbeat(db):
+    """Renews the leases of the processes this runner owns until it exits"""
+    from core.database import LEASE_HEARTBEAT_INTERVAL
+
+    def beat():
+        while True:
+            time.sleep(LEASE_HEARTBEAT_INTERVAL)
+            try:
+                db.renew_leases()
+            except Exception as e:
+                print(f"Error renewing process leases: {e}", file=sys.stderr)
+
+    threading.Thread(target=beat, name="lease-heartbeat", daemon=True).start()
+
+
+def shutdown():
+    from core.async_engine import shutdown_async_engine
+    from core.database import get_database
+    from core.mock_backend import shutdown_mock_backend
+    from utils.extraction_pool import shutdown_extraction_pool
+
+    shutdown_async_engine()
+    shutdown_extraction_pool()
+    shutdown_mock_backend()
+    get_database().release_leases()
+
+
+def wait_for(processes, poll_interval=0.2):
+    """Waits for processes to finish; Ctrl+C cancels them and waits for a clean stop"""
+    try:
+        while not all(p.done() for p in processes):
+            time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        for p in processes:
+            p.runner.cancel()
+        while not all(p.done() for p in processes):
+            time.sleep(poll_interval)
+        raise
+
+
+def cmd_run(args):
+    db, settings, log_store = open_state(args)
+    record = new_process_record(args, settings, 'pending')
+    add_budget_estimates(record, settings)
+    db.save_processes([record])
+    start_heartbeat(db)
+
+    process = HeadlessProcess(record, settings, db, log_store, EventWriter(args.format))
+    if not process.start():
+        shutdown()
+        return 1
+    try:
+        wait_for([process])
+    finally:
+        shutdown()
+    return 0 if process.success else 1
+
+
+def cmd_submit(args):
+    from core.database import QUEUED_STATUS
+
+    db, settings, _ = open_state(args)
+    record = new_process_record(args, settings, QUEUED_STATUS)
+    add_budget_estimates(record, settings)
+    db.save_processes([record])
+    print(json.dumps({'event': 'queued', 'process_id': record['id']}), flush=True)
+    return 0
+
+
+def cmd_daemon(args):
+    """Runs queued processes as they appear, highest priority first"""
+    from core.database import QUEUED_STATUS
+
+    db, settings, log_store = open_state(args)
+    writer = EventWriter(args.format)
+    running = []
+    start_heartbeat(db)
+    try:
+        while True:
+            running = [p for p in running if not p.done()]
+            free = args.max_processes - len(running)
+            if free > 0:
+                queued = db.load_processes(statuses=(QUEUED_STATUS,)).values()
+                for record in sorted(queued, key=lambda p: -p.get('priority', 0))[:free]:
+                    record = db.claim_process(record['id'], QUEUED_STATUS, 'pending')
+                    if record is None:
+                        continue
+                    process = HeadlessProcess(record, settings, db, log_store, writer)
+                    if not process.start():
+                        continue
+                    running.append(process)
+                    writer.write('started', record['id'], name=record.get('name', ''))
+
+            if args.once and not running:
+                return 0
+            time.sleep(args.poll_interval)
+    except KeyboardInterrupt:
+        for p in running:
+            p.runner.cancel()
+        wait_for(running)
+        return 130
+    finally:
+        shutdown()
+
+
+def cmd_estimate(args):
+    """Pre-flight estimate of tokens, cost and time for a folder, without sending anything"""
+    from core.pipeline import DEFAULT_MODEL_NAME
+    from core.preflight import run_preflight
+
+    _, settings, _ = open_state(args)
+    instruction = load_instruction(args)
+    if not os.path.isdir(args.pdf_folder):
+        raise ValueError(f"PDF folder does not exist: {args.pdf_folder}")
+    model_name = args.model or settings.get('model_name', DEFAULT_MODEL_NAME)
+    try:
+        report = run_preflight(args.pdf_folder, instruction, model_name, settings, args.concurrency)
+    finally:
+        shutdown()
+
+    if args.format == 'text':
+        print(report.summary(args.token_budget, args.cost_budget))
+        return 0
+    print(json.dumps({
+        'model': report.model_name,
+        'files': len(report.estimates),
+        'unreadable': report.unreadable,
+        'requests': report.requests,
+        'input_tokens': report.input_tokens,
+        'output_tokens': report.output_tokens,
+        'cost': round(report.cost, 4),
+        'wall_time_seconds': round(report.wall_time()),
+        'files_within_budget': report.files_within(args.token_budget, args.cost_budget),
+        'per_file': report.token_estimates(),
+    }, ensure_ascii=False))
+    return 0
+
+
+def cmd_list(args):
+    from core.database import get_database
+
+    records = get_database().load_processes(statuses=args.status or None)
+    for record in records.values():
+        print(json.dumps({key: record.get(key) for key in
+                          ('id', 'name', 'status', 'current', 'total', 'folder_id', 'created_at')}))
+    return 0
+
+
+def build_parser():
+    from core.clients import API_BACKENDS
+
+    parser = argparse.ArgumentParser(prog='cli.py', description="Process PDF folders without the GUI")
+    parser.add_argument('--format', choices=('jsonl', 'text'), default='jsonl',
+                        help="progress output format (default: jsonl)")
+    parser.add_argument('--backend', choices=API_BACKENDS,
+                        help="API backend for this run (default: from the settings); mock needs no key or network")
+    parser.add_argument('--base-url', help="OpenAI-compatible endpoint, e.g. http://localhost:8000/v1")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_process_arguments(command):
+        command.add_argument('--name', required=True)
+        source = command.add_mutually_exclusive_group(required=True)
+        source.add_argument('--instruction')
+        source.add_argument('--instruction-file')
+        command.add_argument('--pdf-folder', required=True)
+        command.add_argument('--output-folder', help="default: <default output folder>/<name>")
+        command.add_argument('--model')
+        command.add_argument('--concurrency', type=int, help="files in flight")
+        command.add_argument('--priority', type=int, default=0)
+        command.add_argument('--folder', default='root', help="GUI folder id to file the process under")
+        command.add_argument('--no-cache', action='store_true', help="don't reuse cached responses")
+        command.add_argument('--no-stream', action='store_true', help="don't stream responses")
+        add_budget_arguments(command)
+
+    def add_budget_arguments(command):
+        command.add_argument('--token-budget', type=int, default=0, help="max tokens for the process (0: no limit)")
+        command.add_argument('--cost-budget', type=float, default=0.0, help="max dollars for the process (0: no limit)")
+
+    run = commands.add_parser('run', help="run one process and wait for it")
+    add_process_arguments(run)
+    run.set_defaults(handler=cmd_run)
+
+    submit = commands.add_parser('submit', help="queue a process for the daemon")
+    add_process_arguments(submit)
+    submit.set_defaults(handler=cmd_submit)
+
+    daemon = commands.add_parser('daemon', help="run queued processes as they are submitted")
+    daemon.add_argument('--max-processes', type=int, default=4)
+    daemon.add_argument('--poll-interval', type=float, default=5.0)
+    daemon.add_argument('--once', action='store_true', help="exit when the queue is empty")
+    daemon.set_defaults(handler=cmd_daemon)
+
+    estimate = commands.add_parser('estimate', help="estimate tokens, cost and time for a folder")
+    source = estimate.add_mutually_exclusive_group(required=True)
+    source.add_argument('--instruction')
+    source.add_argument('--instruction-file')
+    estimate.add_argument('--pdf-folder', required=True)
+    estimate.add_argument('--model')
+    estimate.add_argument('--concurrency', type=int, help="files in flight")
+    add_budget_arguments(estimate)
+    estimate.set_defaults(handler=cmd_estimate)
+
+    list_command = commands.add_parser('list', help="list processes")
+    list_command.add_argument('--status', action='append')
+    list_command.set_defaults(handler=cmd_list)
+    return parser
+
+
+def main(argv=None):
+    # Required for the extraction process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
+
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except KeyboardInterrupt:
+        return 130
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+import time
+import asyncio
+import threading
+
+from core.clients import get_client_manager
+from core.pipeline import (REQUEST_PARAMS, ProcessRun, FileJob, StreamRecorder, max_concurrent_files,
+                           document_requests, advance)
+from core.scheduler import get_scheduler
+from utils.fileio import atomic_write_text
+
+
+class EventLoopThread:
+    """One background thread running the event loop shared by every async process"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loop = None
+        self.thread = None
+
+    def get_loop(self):
+        with self.lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(target=self.loop.run_forever, name="async-engine", daemon=True)
+                self.thread.start()
+            return self.loop
+
+    def submit(self, coro):
+        """Schedules a coroutine on the loop; returns a concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.get_loop())
+
+    def call(self, callback, *args):
+        """Runs a plain callback on the loop thread, if the loop is running"""
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(callback, *args)
+
+    def shutdown(self, timeout=2.0):
+        with self.lock:
+            loop, self.loop = self.loop, None
+            thread, self.thread = self.thread, None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(
+                get_client_manager().aclose_async_clients(), loop).result(timeout)
+        except Exception as e:
+            print(f"Error stopping async engine: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+
+
+_engine = EventLoopThread()
+
+
+def get_async_engine():
+    """Returns the event loop thread shared by all async processes"""
+    return _engine
+
+
+def shutdown_async_engine():
+    _engine.shutdown()
+
+
+class AsyncProcessRunner:
+    """
+    Processes the PDFs of one process as tasks on the shared event loop.
+
+    The asyncio counterpart of ProcessWorker: every file is a task, files in
+    flight are bounded by semaphores instead of threads, and pause/cancel are
+    events rather than polling. Progress is reported through `events`, an
+    object with ProcessWorker's signals (Qt signals or pipeline.ProcessEvents).
+    """
+
+    def __init__(self, process_data, settings, events):
+        self.process_data = process_data
+        self.settings = settings
+        self.events = events
+        self.engine = get_async_engine()
+        self.is_paused = False
+        self.is_cancelled = False
+        self.resume_event = asyncio.Event()
+        self.resume_event.set()
+        self.cancel_event = asyncio.Event()
+        self.run_state = ProcessRun(process_data, settings, events)
+
+    # --- controls, called from any thread ---
+
+    def pause(self):
+        self.is_paused = True
+        self.engine.call(self.resume_event.clear)
+
+    def resume(self):
+        self.is_paused = False
+        self.engine.call(self.resume_event.set)
+
+    def cancel(self):
+        self.is_cancelled = True
+        self.engine.call(self.cancel_event.set)
+        # Release anything waiting on pause so it can see the cancellation
+        self.engine.call(self.resume_event.set)
+
+    async def wait_while_paused(self):
+        """Wait while paused. Returns False if the process was cancelled."""
+        if self.is_paused and not self.is_cancelled:
+            await self.resume_event.wait()
+        return not self.is_cancelled
+
+    async def sleep(self, delay):
+        """Sleep that ends early on cancel. Returns False if cancelled."""
+        try:
+            await asyncio.wait_for(self.cancel_event.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        return not self.is_cancelled
+
+    # --- processing ---
+
+    async def run(self):
+        """Execute the PDF processing"""
+        process_id = self.process_data['id']
+        try:
+            await self.run_process()
+        except Exception as e:
+            self.events.status_changed.emit(process_id, "failed")
+            self.events.finished.emit(process_id, False, f"Error: {str(e)}")
+        finally:
+            get_scheduler().forget(process_id)
+
+    async def run_process(self):
+        run = self.run_state
+        prepared = await asyncio.to_thread(run.prepare)
+        if prepared is None:
+            return
+        api_key, work_items = prepared
+
+        client = get_client_manager().get_async_client(api_key, self.settings)
+        try:
+            await self.process_files(client, work_items)
+        finally:
+            await get_client_manager().release_async_client(client)
+
+    async def process_files(self, client, work_items):
+        run = self.run_state
+        max_concurrent = max(1, min(max_concurrent_files(self.process_data, self.settings), len(work_items)))
+        await asyncio.to_thread(run.start, client, max_concurrent)
+
+        # Like the threaded worker's bounded queue: extraction may run up to
+        # max_concurrent files ahead of the max_concurrent files in the API stage
+        lookahead = asyncio.Semaphore(2 * max_concurrent)
+        api_slots = asyncio.Semaphore(max_concurrent)
+        tasks = [asyncio.create_task(self.process_file(client, idx, pdf_file, lookahead, api_slots))
+                 for idx, pdf_file in work_items]
+        try:
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        run.finish(self.is_cancelled)
+
+    async def process_file(self, client, idx, pdf_file, lookahead, api_slots):
+        """Extract one PDF in the process pool, send it to the model and save the result"""
+        from utils.extraction_pool import submit_extraction
+
+        job = FileJob(self.run_state, idx, pdf_file)
+        async with lookahead:
+            if not await self.wait_while_paused():
+                return
+
+            extraction = submit_extraction(job.pdf_path, self.settings.get('extraction_workers'),
+                                           self.settings.get('max_pages_per_pdf'))
+            try:
+                async with api_slots:
+                    await asyncio.to_thread(job.begin)
+
+                    try:
+                        result, error = await asyncio.wrap_future(extraction), None
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as pdf_error:
+                        result, error = None, pdf_error
+
+                    if await asyncio.to_thread(job.check_extraction, result, error):
+                        if not await self.wait_while_paused():
+                            return
+
+                        if not await asyncio.to_thread(job.use_cached_response):
+                            await asyncio.to_thread(job.reserve)
+                            try:
+                                response = await self.complete_document(client, job)
+                            finally:
+                                job.settle()
+                            if response is None:
+                                return  # Cancelled; the file stays unrecorded
+                            await asyncio.to_thread(job.complete, response)
+
+            except asyncio.CancelledError:
+                extraction.cancel()
+                raise
+            except Exception as e:
+                await asyncio.to_thread(job.fail, e)
+
+            await asyncio.to_thread(job.record_metrics)
+            self.run_state.file_finished(job.success)
+
+    async def complete_document(self, client, job):
+        """
+        Runs the instruction on a document and returns the result, or None if
+        cancelled. Parts of a split document are sent as concurrent tasks.
+        """
+        # Splitting and merging count tokens, so the plan advances off the loop
+        plan = document_requests(self.run_state, job)
+        tasks = []
+        try:
+            requests, response = await asyncio.to_thread(advance, plan)
+            while requests is not None:
+                tasks = [asyncio.create_task(self.request_completion(client, *request, job.metrics))
+                         for request in requests]
+                results = await asyncio.gather(*tasks)
+                requests, response = await asyncio.to_thread(advance, plan, results)
+            return response
+        finally:
+            # One failed part fails the document; don't leave the others running
+            for task in tasks:
+                task.cancel()
+            try:
+                plan.close()
+            except ValueError:
+                pass  # Still advancing in a thread; its part files go when it is collected
+
+    async def request_completion(self, client, messages, pdf_file, result_path, metrics):
+        """
+        Sends one completion request through the global scheduler, retrying
+        throttled and transient failures with backoff. Writes the result to
+        result_path and returns it, or None if cancelled. Timings and token
+        usage are added to metrics.
+        """
+        process_id = self.process_data['id']
+        model_name = self.run_state.model_name
+        scheduler = get_scheduler()
+        attempt = 0
+
+        while True:
+            queued = time.monotonic()
+            if not await scheduler.acquire_async(process_id, model_name, self.process_data.get('priority', 0),
+                                                 lambda: self.is_cancelled):
+                return None
+            started = time.monotonic()
+            metrics.add_queue_wait(started - queued)
+            try:
+                if self.process_data.get('stream_responses', True):
+                    response, usage = await self.stream_completion(client, messages, pdf_file, result_path,
+                                                                   metrics)
+                    if response is None:
+                        return None
+                else:
+                    completion = await client.chat.completions.create(
+                        model=model_name,
+                        messages=messages,
+                        **REQUEST_PARAMS,
+                    )
+                    response = completion.choices[0].message.content
+                    usage = completion.usage
+                    await asyncio.to_thread(atomic_write_text, result_path, response)
+            except Exception as e:
+                delay = self.run_state.retry_delay(e, attempt, pdf_file)
+            else:
+                self.run_state.request_succeeded(started, usage, messages, response, metrics)
+                return response
+            finally:
+                scheduler.release(model_name)
+
+            # Back off without holding a slot, so other requests can use it
+            attempt += 1
+            if not await self.sleep(delay):
+                return None
+
+    async def stream_completion(self, client, messages, pdf_file, result_path, metrics):
+        """
+        Streams the completion into result_path + '.partial' as tokens arrive and
+        renames it into place when done. Returns (full text, usage if the provider
+        sent it), or (None, None) if cancelled.
+        """
+        stream = await client.chat.completions.create(
+            model=self.run_state.model_name,
+            messages=messages,
+            stream=True,
+            **REQUEST_PARAMS,
+        )
+        recorder = StreamRecorder(self.run_state, pdf_file, result_path, metrics)
+        try:
+            async for chunk in stream:
+                if not await self.wait_while_paused():
+                    break
+                recorder.add(chunk)
+        except BaseException:
+            recorder.discard()
+            raise
+        finally:
+            await stream.close()
+            recorder.end()
+
+        if self.is_cancelled:
+            recorder.discard()
+            return None, None
+        return recorder.commit()
@@ -0,0 +1,184 @@
+import os
+import re
+import threading
+
+
+# Input tokens per request before a document is split (0 = never split)
+DEFAULT_MAX_INPUT_TOKENS = 48000
+
+# How the partial results of a split document are merged:
+#   'model'       - the model merges them, following the process instruction
+#   'concatenate' - joined in document order, no extra request
+REDUCE_MODES = ('model', 'concatenate')
+DEFAULT_REDUCE_MODE = 'model'
+
+REDUCE_INSTRUCTION = (
+    "The user message contains partial results, produced by applying the instructions below "
+    "to consecutive parts of one document. Merge them into a single result for the whole "
+    "document that follows the same instructions and output format, without repeating "
+    "anything or mentioning the parts.\n\n"
+    "Instructions:\n{instruction}"
+)
+
+TIKTOKEN_ENCODING = 'cl100k_base'
+CHARS_PER_TOKEN = 4  # estimate used when tiktoken is not installed
+
+# Split points, coarsest first: Markdown headings from pymupdf4llm, paragraphs, lines.
+# Zero-width patterns, so joining the pieces gives back the original text.
+SPLIT_PATTERNS = (
+    re.compile(r'(?m)(?=^#{1,6} )'),
+    re.compile(r'(?<=\n\n)'),
+    re.compile(r'(?<=\n)'),
+)
+
+_encoding = None
+_encoding_lock = threading.Lock()
+
+
+def get_encoding():
+    """The tiktoken encoding, or False if tiktoken is not installed"""
+    global _encoding
+    with _encoding_lock:
+        if _encoding is None:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding(TIKTOKEN_ENCODING)
+            except Exception:
+                _encoding = False
+        return _encoding
+
+
+def count_tokens(text):
+    """
+    Tokens in text. Exact for OpenAI-style tokenizers when tiktoken is installed,
+    a ~4 characters per token estimate otherwise; either way close enough to
+    keep requests under the limit for the router's models.
+    """
+    encoding = get_encoding()
+    if encoding:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def max_input_tokens(settings):
+    try:
+        return max(0, int(settings.get('max_input_tokens', DEFAULT_MAX_INPUT_TOKENS)))
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_INPUT_TOKENS
+
+
+def reduce_mode(settings):
+    mode = settings.get('chunk_reduce', DEFAULT_REDUCE_MODE)
+    return mode if mode in REDUCE_MODES else DEFAULT_REDUCE_MODE
+
+
+def chunking_options(settings):
+    """The settings that change how a document is split and merged, e.g. for cache keys"""
+    return {
+        'max_input_tokens': max_input_tokens(settings),
+        'reduce_mode': reduce_mode(settings),
+        'reduce_instruction': REDUCE_INSTRUCTION,
+    }
+
+
+def split_text(text, max_tokens, level=0):
+    """
+    Splits text into chunks of at most max_tokens, at the coarsest split points
+    that work: sections are packed together up to the limit, and only a section
+    that is too large on its own is split on paragraphs, then lines, then by length.
+    """
+    tokens = count_tokens(text)
+    if tokens <= max_tokens:
+        return [text]
+    if level == len(SPLIT_PATTERNS):
+        size = max(1, len(text) * max_tokens // tokens)
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    for piece in SPLIT_PATTERNS[level].split(text):
+        if not piece:
+            continue
+        piece_tokens = count_tokens(piece)
+        if current and current_tokens + piece_tokens > max_tokens:
+            chunks.append("".join(current))
+            current = []
+            current_tokens = 0
+        if piece_tokens > max_tokens:
+            chunks.extend(split_text(piece, max_tokens, level + 1))
+        else:
+            current.append(piece)
+            current_tokens += piece_tokens
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+def split_document(instruction, content, settings):
+    """
+    The chunks to send for a document: [content] when the request fits, else
+    heading-aligned chunks that each fit alongside the instruction.
+    """
+    limit = max_input_tokens(settings)
+    if not limit:
+        return [content]
+    budget = max(1, limit - count_tokens(instruction))
+    if count_tokens(content) <= budget:
+        return [content]
+    return [chunk for chunk in split_text(content, budget) if chunk.strip()]
+
+
+def reduce_batches(instruction, partials, settings):
+    """
+    Groups partial results into batches that each fit in one reduce request, in
+    order. More than one batch means another round of reducing is needed.
+    """
+    limit = max_input_tokens(settings)
+    budget = max(1, limit - count_tokens(REDUCE_INSTRUCTION.format(instruction=instruction))) if limit else 0
+    batches = []
+    current = []
+    current_tokens = 0
+    for partial in partials:
+        tokens = count_tokens(partial)
+        # A batch needs at least two partials to make progress
+        if budget and len(current) >= 2 and current_tokens + tokens > budget:
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(partial)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_reduce_messages(instruction, partials):
+    parts = "\n\n".join(f"## Part {n}\n\n{partial.strip()}" for n, partial in enumerate(partials, 1))
+    return [
+        {"role": "system", "content": REDUCE_INSTRUCTION.format(instruction=instruction)},
+        {"role": "user", "content": parts}
+    ]
+
+
+def concatenate_results(partials):
+    return "\n\n---\n\n".join(partial.strip() for partial in partials)
+
+
+def part_path(result_path, n):
+    """Where the result of one part of a split document is written, next to the final result"""
+    stem, ext = os.path.splitext(result_path)
+    return f"{stem}.part{n:02d}{ext}"
+
+
+def part_label(pdf_file, n, total):
+    """Name shown in logs and token counts for one request of a split document"""
+    return f"{pdf_file} (part {n}/{total})"
+
+
+def remove_parts(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
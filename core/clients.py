@@ -0,0 +1,200 @@
+import asyncio
+import threading
+
+
+HF_ROUTER_BASE_URL = "https://router.huggingface.co/v1"
+
+# 'api_backend' setting: the Hugging Face router, any OpenAI-compatible URL
+# ('api_base_url'), or the bundled mock endpoint (core/mock_backend.py)
+API_BACKENDS = ('huggingface', 'custom', 'mock')
+
+DEFAULT_HTTP_MAX_CONNECTIONS = 64
+DEFAULT_HTTP_KEEPALIVE_CONNECTIONS = 32
+DEFAULT_HTTP_TIMEOUT = 600  # seconds; reasoning models can take minutes per file
+HTTP_CONNECT_TIMEOUT = 10
+
+
+def api_backend(settings):
+    """Selected backend; settings with only an 'api_base_url' count as custom"""
+    backend = settings.get('api_backend')
+    if backend in API_BACKENDS:
+        return backend
+    return 'custom' if settings.get('api_base_url') else 'huggingface'
+
+
+def base_url_for(settings):
+    """OpenAI-compatible endpoint requests go to; starts the mock endpoint if that is the backend"""
+    backend = api_backend(settings)
+    if backend == 'mock':
+        from core.mock_backend import get_mock_backend
+        return get_mock_backend(settings).url
+    if backend == 'custom':
+        return settings.get('api_base_url') or HF_ROUTER_BASE_URL
+    return HF_ROUTER_BASE_URL
+
+
+def api_key_for(settings):
+    """
+    Key sent with requests, or '' if one is required and missing. Only the
+    Hugging Face router requires one; local servers usually ignore it, but
+    the OpenAI client needs a non-empty value.
+    """
+    api_key = settings.get('hf_api_key', '')
+    if api_backend(settings) == 'huggingface':
+        return api_key
+    return api_key or 'not-needed'
+
+
+class ClientManager:
+    """
+    Process-wide OpenAI clients backed by pooled keep-alive HTTP connections.
+
+    One client is kept per (base URL, API key) and shared by every worker,
+    so TLS handshakes and connection setup are paid once instead of per
+    process. Retries are left to core.retry, so the SDK's own are disabled.
+
+    Processes hold a client from get_client() until they release it. When the
+    key or pool settings change, the endpoint's old client is retired: it is
+    closed once the last process using it releases it.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clients = {}  # (base_url, api_key, pool settings) -> OpenAI
+        self.async_clients = {}  # same keys -> AsyncOpenAI, used on the asyncio engine's loop only
+        self.users = {}  # id(client) -> processes holding it
+        self.retired = []  # replaced clients still held by a process
+        self.retired_async = []
+
+    def pool_settings(self, settings):
+        return (int(settings.get('http_max_connections', DEFAULT_HTTP_MAX_CONNECTIONS)),
+                int(settings.get('http_keepalive_connections', DEFAULT_HTTP_KEEPALIVE_CONNECTIONS)),
+                float(settings.get('http_timeout', DEFAULT_HTTP_TIMEOUT)))
+
+    def http_limits(self, pool):
+        import httpx
+
+        max_connections, keepalive, timeout = pool
+        return (httpx.Limits(max_connections=max_connections,
+                             max_keepalive_connections=min(keepalive, max_connections)),
+                httpx.Timeout(timeout, connect=HTTP_CONNECT_TIMEOUT))
+
+    def acquire(self, clients, retired, key, create):
+        """
+        The client for key from clients, created if needed and counted as held.
+        Returns (client, replaced clients nobody holds, which the caller closes).
+        """
+        to_close = []
+        client = clients.get(key)
+        if client is None:
+            client = create()
+            # Settings or key changed: stop handing out the endpoint's old clients
+            for old_key in [k for k in clients if k[0] == key[0]]:
+                old = clients.pop(old_key)
+                if self.users.get(id(old)):
+                    retired.append(old)
+                else:
+                    to_close.append(old)
+            clients[key] = client
+        self.users[id(client)] = self.users.get(id(client), 0) + 1
+        return client, to_close
+
+    def release(self, client, retired):
+        """Counts a process as done with client; returns True if a retired client is now unused"""
+        count = self.users.get(id(client), 0) - 1
+        if count > 0:
+            self.users[id(client)] = count
+            return False
+        self.users.pop(id(client), None)
+        if client in retired:
+            retired.remove(client)
+            return True
+        return False
+
+    def get_client(self, api_key, settings, base_url=None):
+        """Client for the settings' endpoint; hand it back with release_client() when done"""
+        base_url = base_url or base_url_for(settings)
+        pool = self.pool_settings(settings)
+
+        def create():
+            import httpx
+            from openai import OpenAI
+
+            limits, timeout = self.http_limits(pool)
+            return OpenAI(base_url=base_url, api_key=api_key, max_retries=0,
+                          http_client=httpx.Client(limits=limits, timeout=timeout))
+
+        with self.lock:
+            client, to_close = self.acquire(self.clients, self.retired, (base_url, api_key, pool), create)
+        for old in to_close:
+            self.close_client(old)
+        return client
+
+    def release_client(self, client):
+        with self.lock:
+            unused = self.release(client, self.retired)
+        if unused:
+            self.close_client(client)
+
+    def get_async_client(self, api_key, settings, base_url=None):
+        """
+        AsyncOpenAI counterpart of get_client(); must be called from the
+        engine's event loop, and handed back with release_async_client()
+        """
+        base_url = base_url or base_url_for(settings)
+        pool = self.pool_settings(settings)
+
+        def create():
+            import httpx
+            from openai import AsyncOpenAI
+
+            limits, timeout = self.http_limits(pool)
+            return AsyncOpenAI(base_url=base_url, api_key=api_key, max_retries=0,
+                               http_client=httpx.AsyncClient(limits=limits, timeout=timeout))
+
+        with self.lock:
+            client, to_close = self.acquire(self.async_clients, self.retired_async,
+                                            (base_url, api_key, pool), create)
+        for old in to_close:
+            asyncio.ensure_future(self.aclose_client(old))
+        return client
+
+    async def release_async_client(self, client):
+        with self.lock:
+            unused = self.release(client, self.retired_async)
+        if unused:
+            await self.aclose_client(client)
+
+    async def aclose_client(self, client):
+        try:
+            await client.close()
+        except Exception as e:
+            print(f"Error closing API client: {e}")
+
+    async def aclose_async_clients(self):
+        with self.lock:
+            clients = list(self.async_clients.values()) + self.retired_async
+            self.async_clients, self.retired_async = {}, []
+        for client in clients:
+            await self.aclose_client(client)
+
+    def close_client(self, client):
+        try:
+            client.close()
+        except Exception as e:
+            print(f"Error closing API client: {e}")
+
+    def close_all(self):
+        with self.lock:
+            for client in list(self.clients.values()) + self.retired:
+                self.close_client(client)
+            self.clients.clear()
+            self.retired.clear()
+
+
+_client_manager = ClientManager()
+
+
+def get_client_manager():
+    """Returns the client manager shared by all workers"""
+    return _client_manager
@@ -0,0 +1,360 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import threading
+from datetime import datetime
+
+
+DATABASE_FILE = os.path.join("saves", "state.db")
+
+# Legacy JSON state, imported once into the database
+LEGACY_SETTINGS_FILE = os.path.join("saves", "app_settings.json")
+LEGACY_FOLDERS_FILE = os.path.join("saves", "folders_state.json")
+LEGACY_PROCESSES_FILE = os.path.join("saves", "processes_state.json")
+LEGACY_MANIFESTS_DIR = os.path.join("saves", "manifests")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS folders (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    created_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS processes (
+    id TEXT PRIMARY KEY,
+    folder_id TEXT NOT NULL DEFAULT 'root',
+    status TEXT NOT NULL,
+    created_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_processes_folder_status ON processes(folder_id, status);
+CREATE INDEX IF NOT EXISTS idx_processes_status ON processes(status);
+CREATE TABLE IF NOT EXISTS file_results (
+    process_id TEXT NOT NULL,
+    pdf_file TEXT NOT NULL,
+    file_index INTEGER NOT NULL,
+    state TEXT,
+    content_hash TEXT,
+    output_path TEXT,
+    error TEXT,
+    updated_at TEXT,
+    PRIMARY KEY (process_id, pdf_file)
+);
+CREATE TABLE IF NOT EXISTS file_metrics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    process_id TEXT NOT NULL,
+    pdf_file TEXT NOT NULL,
+    model_name TEXT,
+    outcome TEXT NOT NULL,
+    finished_at REAL NOT NULL,
+    extraction_seconds REAL,
+    queue_wait_seconds REAL,
+    ttft_seconds REAL,
+    api_seconds REAL,
+    requests INTEGER,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    reasoning_tokens INTEGER,
+    usage_estimated INTEGER,
+    output_bytes INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_file_metrics_finished ON file_metrics(finished_at);
+CREATE TABLE IF NOT EXISTS process_leases (
+    process_id TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    heartbeat REAL NOT NULL
+);
+"""
+
+# Columns of file_metrics written by save_file_metrics, in order
+FILE_METRICS_COLUMNS = ('process_id', 'pdf_file', 'model_name', 'outcome', 'finished_at',
+                        'extraction_seconds', 'queue_wait_seconds', 'ttft_seconds', 'api_seconds', 'requests',
+                        'prompt_tokens', 'completion_tokens', 'reasoning_tokens', 'usage_estimated',
+                        'output_bytes')
+
+# Statuses that should be restarted when the application starts
+UNFINISHED_STATUSES = ('pending', 'running', 'paused')
+
+# Processes submitted for the headless daemon; the GUI leaves them alone
+QUEUED_STATUS = 'queued'
+
+# A runner (GUI or cli.py) holds a lease on every process it runs and renews
+# it every LEASE_HEARTBEAT_INTERVAL seconds; a lease not renewed for
+# LEASE_TTL seconds belongs to a runner that died and can be taken over
+LEASE_HEARTBEAT_INTERVAL = 10
+LEASE_TTL = 60
+
+
+class Database:
+    """
+    SQLite (WAL mode) store for settings, folders, processes and per-file
+    results.
+
+    A single connection is shared by the GUI and worker threads and guarded
+    by a lock; WAL keeps readers from blocking on the occasional write.
+    """
+
+    def __init__(self, path=DATABASE_FILE):
+        self.path = path
+        self.lock = threading.RLock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.lock, self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # --- meta ---
+
+    def get_meta(self, key, default=None):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    # --- settings ---
+
+    def load_settings(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT key, value FROM settings").fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def save_settings(self, settings):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM settings")
+            self.conn.executemany("INSERT INTO settings (key, value) VALUES (?, ?)",
+                                  [(key, json.dumps(value)) for key, value in settings.items()])
+
+    # --- folders ---
+
+    def load_folders(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT data FROM folders ORDER BY created_at, id").fetchall()
+        folders = [json.loads(row[0]) for row in rows]
+        return {folder['id']: folder for folder in folders}
+
+    def save_folder(self, folder):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO folders (id, name, created_at, data) VALUES (?, ?, ?, ?)",
+                (folder['id'], folder['name'], folder.get('created_at'), json.dumps(folder)))
+
+    def delete_folder(self, folder_id):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM folders WHERE id = ?", (folder_id,))
+
+    # --- processes ---
+
+    def load_processes(self, folder_id=None, statuses=None):
+        """Returns {process_id: record}, optionally filtered by folder and/or status"""
+        query = "SELECT data FROM processes"
+        clauses, params = [], []
+        if folder_id is not None:
+            clauses.append("folder_id = ?")
+            params.append(folder_id)
+        if statuses:
+            clauses.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(statuses)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY created_at, id"
+
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        records = [json.loads(row[0]) for row in rows]
+        return {record['id']: record for record in records}
+
+    def load_process_index(self):
+        """Returns [(id, folder_id, status)] for every process, without decoding the records"""
+        with self.lock:
+            return self.conn.execute("SELECT id, folder_id, status FROM processes").fetchall()
+
+    def save_processes(self, records, deleted_ids=()):
+        """Upserts records and deletes removed processes in one transaction"""
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO processes (id, folder_id, status, created_at, data) VALUES (?, ?, ?, ?, ?)",
+                [(record['id'], record.get('folder_id', 'root'), record.get('status', 'pending'),
+                  record.get('created_at'), json.dumps(record)) for record in records])
+            for process_id in deleted_ids:
+                self.conn.execute("DELETE FROM processes WHERE id = ?", (process_id,))
+                self.conn.execute("DELETE FROM file_results WHERE process_id = ?", (process_id,))
+                self.conn.execute("DELETE FROM process_leases WHERE process_id = ?", (process_id,))
+
+    def claim_process(self, process_id, from_status, to_status):
+        """
+        Atomically moves a process from one status to another. Returns the
+        updated record, or None if it was not in from_status (e.g. another
+        runner claimed it first).
+        """
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT data FROM processes WHERE id = ? AND status = ?",
+                                    (process_id, from_status)).fetchone()
+            if row is None:
+                return None
+            record = json.loads(row[0])
+            record['status'] = to_status
+            self.conn.execute("UPDATE processes SET status = ?, data = ? WHERE id = ?",
+                              (to_status, json.dumps(record), process_id))
+        return record
+
+    # --- leases ---
+
+    def lease_owner(self):
+        return socket.gethostname(), os.getpid()
+
+    def acquire_lease(self, process_id, ttl=LEASE_TTL):
+        """
+        Takes the lease on a process for this runner. Returns False if another
+        runner holds it and has renewed it within ttl seconds.
+        """
+        host, pid = self.lease_owner()
+        now = time.time()
+        with self.lock, self.conn:
+            # One statement, so two runners racing for the lease cannot both win
+            cursor = self.conn.execute(
+                "INSERT INTO process_leases (process_id, host, pid, heartbeat) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(process_id) DO UPDATE SET host = excluded.host, pid = excluded.pid, "
+                "heartbeat = excluded.heartbeat "
+                "WHERE (process_leases.host = excluded.host AND process_leases.pid = excluded.pid) "
+                "OR process_leases.heartbeat < ?",
+                (process_id, host, pid, now, now - ttl))
+        return cursor.rowcount > 0
+
+    def renew_leases(self):
+        """Heartbeat: refreshes every lease held by this runner"""
+        host, pid = self.lease_owner()
+        with self.lock, self.conn:
+            self.conn.execute("UPDATE process_leases SET heartbeat = ? WHERE host = ? AND pid = ?",
+                              (time.time(), host, pid))
+
+    def release_lease(self, process_id):
+        host, pid = self.lease_owner()
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM process_leases WHERE process_id = ? AND host = ? AND pid = ?",
+                              (process_id, host, pid))
+
+    def release_leases(self):
+        """Releases every lease held by this runner, e.g. on shutdown"""
+        host, pid = self.lease_owner()
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM process_leases WHERE host = ? AND pid = ?", (host, pid))
+
+    # --- per-file results ---
+
+    def load_file_results(self, process_id):
+        """Returns {pdf_file: result} for a process"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT pdf_file, file_index, state, content_hash, output_path, error, updated_at "
+                "FROM file_results WHERE process_id = ?", (process_id,)).fetchall()
+        return {row[0]: {'index': row[1], 'state': row[2], 'content_hash': row[3],
+                         'output_path': row[4], 'error': row[5], 'updated_at': row[6]} for row in rows}
+
+    def save_file_result(self, process_id, pdf_file, result):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO file_results "
+                "(process_id, pdf_file, file_index, state, content_hash, output_path, error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (process_id, pdf_file, result['index'], result.get('state'), result.get('content_hash'),
+                 result.get('output_path'), result.get('error'), result.get('updated_at')))
+
+    def save_file_indexes(self, process_id, indexes):
+        """Registers new files with their output index, leaving existing rows untouched"""
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO file_results (process_id, pdf_file, file_index) VALUES (?, ?, ?)",
+                [(process_id, pdf_file, index) for pdf_file, index in indexes.items()])
+
+    def delete_file_results(self, process_id):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM file_results WHERE process_id = ?", (process_id,))
+
+    # --- per-file metrics ---
+
+    def save_file_metrics(self, rows):
+        """Appends metrics rows (dicts keyed by FILE_METRICS_COLUMNS)"""
+        with self.lock, self.conn:
+            self.conn.executemany(
+                f"INSERT INTO file_metrics ({', '.join(FILE_METRICS_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in FILE_METRICS_COLUMNS)})",
+                [tuple(row.get(column) for column in FILE_METRICS_COLUMNS) for row in rows])
+
+    def load_file_metrics(self, since=None):
+        """Metrics rows as dicts, oldest first; since is a Unix timestamp"""
+        query = f"SELECT {', '.join(FILE_METRICS_COLUMNS)} FROM file_metrics"
+        params = ()
+        if since is not None:
+            query += " WHERE finished_at >= ?"
+            params = (since,)
+        with self.lock:
+            rows = self.conn.execute(query + " ORDER BY finished_at", params).fetchall()
+        return [dict(zip(FILE_METRICS_COLUMNS, row)) for row in rows]
+
+    # --- migration ---
+
+    def migrate_from_json(self, settings_file=LEGACY_SETTINGS_FILE, folders_file=LEGACY_FOLDERS_FILE,
+                          processes_file=LEGACY_PROCESSES_FILE, manifests_dir=LEGACY_MANIFESTS_DIR):
+        """One-time import of the JSON files used before the database existed"""
+        if self.get_meta('json_migrated'):
+            return
+
+        def read_json(path):
+            try:
+                if os.path.exists(path):
+                    with open(path, 'r', encoding='utf-8') as f:
+                        return json.load(f)
+            except Exception as e:
+                print(f"Error migrating {path}: {e}")
+            return {}
+
+        settings = read_json(settings_file)
+        if settings:
+            self.save_settings(settings)
+
+        for folder in read_json(folders_file).values():
+            self.save_folder(folder)
+
+        processes = read_json(processes_file)
+        self.save_processes(list(processes.values()))
+
+        for process_id in processes:
+            manifest = read_json(os.path.join(manifests_dir, f"{process_id}.json"))
+            for pdf_file, result in manifest.get('files', {}).items():
+                if 'index' in result:
+                    self.save_file_result(process_id, pdf_file, result)
+
+        self.set_meta('json_migrated', datetime.now().isoformat())
+
+
+_database = None
+_database_lock = threading.Lock()
+
+
+def get_database():
+    """Returns the application-wide database, creating and migrating it on first use"""
+    global _database
+    with _database_lock:
+        if _database is None:
+            _database = Database()
+            _database.migrate_from_json()
+        return _database
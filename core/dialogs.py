@@ -1,9 +1,25 @@
-import os
-import json
+import time
+from datetime import datetime
+
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QLabel, QLineEdit, QGroupBox, QFormLayout, 
-                             QFileDialog, QMessageBox, QComboBox)
-from PyQt6.QtCore import Qt
+                             QFileDialog, QMessageBox, QComboBox, QSpinBox,
+                             QPlainTextEdit, QDoubleSpinBox, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QAbstractItemView, QScrollArea, QWidget)
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QTextCursor
+
+from core.database import get_database
+from core.metrics import PERIODS, summarize, throughput, trend
+from core.scheduler import DEFAULT_GLOBAL_MAX_CONCURRENT_REQUESTS
+from core.retry import DEFAULT_MAX_RETRIES
+from core.chunking import max_input_tokens, reduce_mode
+from core.preflight import DEFAULT_OUTPUT_TOKENS_PER_REQUEST, DEFAULT_OUTPUT_TOKENS_PER_SECOND, model_prices
+from core.clients import DEFAULT_HTTP_MAX_CONNECTIONS, DEFAULT_HTTP_TIMEOUT, api_backend
+from core.mock_backend import (DEFAULT_MOCK_OUTPUT_TOKENS, DEFAULT_MOCK_TPS, DEFAULT_MOCK_TTFT,
+                               DEFAULT_MOCK_TTFT_SIGMA)
+from core.pipeline import DEFAULT_MAX_CONCURRENT_FILES
+from utils.response_cache import DEFAULT_RESPONSE_CACHE_MAX_MB, DEFAULT_RESPONSE_CACHE_MAX_AGE_DAYS
 
 
 class SettingsDialog(QDialog):
@@ -14,21 +30,34 @@ class SettingsDialog(QDialog):
         self.theme = theme
         self.setWindowTitle("Settings")
         self.setMinimumWidth(500)
-        self.setMinimumHeight(450)
-        self.settings_file = "saves/app_settings.json"
+        self.setMinimumHeight(650)
+        self.setObjectName("settingsDialog")
+        self.db = get_database()
         self.settings = self.load_settings()
         self.init_ui()
-        self.apply_theme()
 
     def init_ui(self):
         layout = QVBoxLayout()
 
         # API Key Section
-        api_group = QGroupBox("Hugging Face API Configuration")
+        api_group = QGroupBox("API Configuration")
         api_group.setObjectName("apiGroup")
         api_layout = QFormLayout()
         api_layout.setSpacing(15)
 
+        # Where requests go: the Hugging Face router, another OpenAI-compatible server, or the local mock
+        self.backend_combo = QComboBox()
+        self.backend_combo.addItem("Hugging Face Router", "huggingface")
+        self.backend_combo.addItem("Custom OpenAI-compatible URL", "custom")
+        self.backend_combo.addItem("Mock (offline, no cost)", "mock")
+        self.backend_combo.setCurrentIndex(max(0, self.backend_combo.findData(api_backend(self.settings))))
+        api_layout.addRow("Backend:", self.backend_combo)
+
+        self.base_url_input = QLineEdit()
+        self.base_url_input.setText(self.settings.get('api_base_url', ''))
+        self.base_url_input.setPlaceholderText("e.g., http://localhost:8000/v1")
+        api_layout.addRow("Base URL:", self.base_url_input)
+
         self.api_key_input = QLineEdit()
         self.api_key_input.setEchoMode(QLineEdit.EchoMode.Password)
         self.api_key_input.setText(self.settings.get('hf_api_key', ''))
@@ -49,6 +78,82 @@ class SettingsDialog(QDialog):
         self.model_input.setPlaceholderText("e.g., ServiceNow-AI/Apriel-1.6-15b-Thinker:together")
         api_layout.addRow("Default Model:", self.model_input)
 
+        # Files processed concurrently by each new process
+        self.concurrency_input = QSpinBox()
+        self.concurrency_input.setRange(1, 64)
+        self.concurrency_input.setValue(int(self.settings.get('max_concurrent_files', DEFAULT_MAX_CONCURRENT_FILES)))
+        api_layout.addRow("Files in Flight:", self.concurrency_input)
+
+        # Limits shared by all processes (0 = unlimited)
+        self.global_concurrency_input = QSpinBox()
+        self.global_concurrency_input.setRange(1, 256)
+        self.global_concurrency_input.setValue(int(self.settings.get('global_max_concurrent_requests',
+                                                                     DEFAULT_GLOBAL_MAX_CONCURRENT_REQUESTS)))
+        api_layout.addRow("Max Requests (all processes):", self.global_concurrency_input)
+
+        self.model_rpm_input = QSpinBox()
+        self.model_rpm_input.setRange(0, 100000)
+        self.model_rpm_input.setSpecialValueText("Unlimited")
+        self.model_rpm_input.setSuffix(" req/min")
+        self.model_rpm_input.setValue(int(self.settings.get('model_rate_limit_rpm', 0)))
+        api_layout.addRow("Rate Limit per Model:", self.model_rpm_input)
+
+        self.provider_rpm_input = QSpinBox()
+        self.provider_rpm_input.setRange(0, 100000)
+        self.provider_rpm_input.setSpecialValueText("Unlimited")
+        self.provider_rpm_input.setSuffix(" req/min")
+        self.provider_rpm_input.setValue(int(self.settings.get('provider_rate_limit_rpm', 0)))
+        api_layout.addRow("Rate Limit per Provider:", self.provider_rpm_input)
+
+        # Retries for throttled or transiently failing requests
+        self.retries_input = QSpinBox()
+        self.retries_input.setRange(0, 20)
+        self.retries_input.setSpecialValueText("Never")
+        self.retries_input.setValue(int(self.settings.get('max_retries', DEFAULT_MAX_RETRIES)))
+        api_layout.addRow("Retries per Request:", self.retries_input)
+
+        # Shared HTTP connection pool
+        self.pool_size_input = QSpinBox()
+        self.pool_size_input.setRange(1, 1024)
+        self.pool_size_input.setValue(int(self.settings.get('http_max_connections', DEFAULT_HTTP_MAX_CONNECTIONS)))
+        api_layout.addRow("Connection Pool Size:", self.pool_size_input)
+
+        self.timeout_input = QSpinBox()
+        self.timeout_input.setRange(10, 3600)
+        self.timeout_input.setSuffix(" s")
+        self.timeout_input.setValue(int(self.settings.get('http_timeout', DEFAULT_HTTP_TIMEOUT)))
+        api_layout.addRow("Request Timeout:", self.timeout_input)
+
+        # Long documents: only the first pages are converted and sent
+        self.max_pages_input = QSpinBox()
+        self.max_pages_input.setRange(0, 10000)
+        self.max_pages_input.setSpecialValueText("All")
+        self.max_pages_input.setValue(int(self.settings.get('max_pages_per_pdf', 0) or 0))
+        api_layout.addRow("Max Pages per PDF:", self.max_pages_input)
+
+        # Documents over the limit are split on headings and the results merged
+        self.max_input_tokens_input = QSpinBox()
+        self.max_input_tokens_input.setRange(0, 2000000)
+        self.max_input_tokens_input.setSingleStep(1000)
+        self.max_input_tokens_input.setSpecialValueText("Never split")
+        self.max_input_tokens_input.setSuffix(" tokens")
+        self.max_input_tokens_input.setValue(max_input_tokens(self.settings))
+        api_layout.addRow("Max Input per Request:", self.max_input_tokens_input)
+
+        self.reduce_combo = QComboBox()
+        self.reduce_combo.addItem("Merge with the model", "model")
+        self.reduce_combo.addItem("Concatenate", "concatenate")
+        self.reduce_combo.setCurrentIndex(max(0, self.reduce_combo.findData(reduce_mode(self.settings))))
+        api_layout.addRow("Combine Split Results:", self.reduce_combo)
+
+        # Threads: one QThread per process; asyncio: all processes as tasks on one event loop
+        self.engine_combo = QComboBox()
+        self.engine_combo.addItem("Threads", "threads")
+        self.engine_combo.addItem("Asyncio", "asyncio")
+        self.engine_combo.setCurrentIndex(max(0, self.engine_combo.findData(
+            self.settings.get('execution_engine', 'threads'))))
+        api_layout.addRow("Execution Engine:", self.engine_combo)
+
         api_group.setLayout(api_layout)
 
         # Default Folder Section
@@ -76,6 +181,116 @@ class SettingsDialog(QDialog):
 
         folder_group.setLayout(folder_layout)
 
+        # Response Cache Section
+        cache_group = QGroupBox("Response Cache")
+        cache_group.setObjectName("cacheGroup")
+        cache_layout = QFormLayout()
+        cache_layout.setSpacing(10)
+
+        self.cache_size_input = QSpinBox()
+        self.cache_size_input.setRange(0, 100000)
+        self.cache_size_input.setSuffix(" MB")
+        self.cache_size_input.setValue(int(self.settings.get('response_cache_max_mb', DEFAULT_RESPONSE_CACHE_MAX_MB)))
+        cache_layout.addRow("Maximum Size:", self.cache_size_input)
+
+        self.cache_age_input = QSpinBox()
+        self.cache_age_input.setRange(1, 3650)
+        self.cache_age_input.setSuffix(" days")
+        self.cache_age_input.setValue(int(self.settings.get('response_cache_max_age_days',
+                                                            DEFAULT_RESPONSE_CACHE_MAX_AGE_DAYS)))
+        cache_layout.addRow("Keep Results For:", self.cache_age_input)
+
+        cache_group.setLayout(cache_layout)
+
+        # Numbers behind the pre-flight estimates and cost budgets
+        estimate_group = QGroupBox("Cost Estimates")
+        estimate_group.setObjectName("estimateGroup")
+        estimate_layout = QFormLayout()
+        estimate_layout.setSpacing(10)
+
+        # Prices for models without an entry in 'model_prices'
+        input_price, output_price = model_prices(None, self.settings)
+        self.input_price_input = QDoubleSpinBox()
+        self.input_price_input.setRange(0, 10000)
+        self.input_price_input.setDecimals(3)
+        self.input_price_input.setPrefix("$")
+        self.input_price_input.setSuffix(" / 1M tokens")
+        self.input_price_input.setValue(input_price)
+        estimate_layout.addRow("Input Price:", self.input_price_input)
+
+        self.output_price_input = QDoubleSpinBox()
+        self.output_price_input.setRange(0, 10000)
+        self.output_price_input.setDecimals(3)
+        self.output_price_input.setPrefix("$")
+        self.output_price_input.setSuffix(" / 1M tokens")
+        self.output_price_input.setValue(output_price)
+        estimate_layout.addRow("Output Price:", self.output_price_input)
+
+        self.output_tokens_input = QSpinBox()
+        self.output_tokens_input.setRange(1, 1000000)
+        self.output_tokens_input.setSuffix(" tokens")
+        self.output_tokens_input.setValue(int(self.settings.get('estimated_output_tokens',
+                                                                DEFAULT_OUTPUT_TOKENS_PER_REQUEST)))
+        estimate_layout.addRow("Expected Output per Request:", self.output_tokens_input)
+
+        self.output_tps_input = QSpinBox()
+        self.output_tps_input.setRange(1, 100000)
+        self.output_tps_input.setSuffix(" tokens/s")
+        self.output_tps_input.setValue(int(self.settings.get('estimated_output_tps',
+                                                             DEFAULT_OUTPUT_TOKENS_PER_SECOND)))
+        estimate_layout.addRow("Expected Output Speed:", self.output_tps_input)
+
+        estimate_group.setLayout(estimate_layout)
+
+        # Behaviour of the mock backend, for load tests and dry runs
+        self.mock_group = QGroupBox("Mock Backend")
+        self.mock_group.setObjectName("mockGroup")
+        mock_layout = QFormLayout()
+        mock_layout.setSpacing(10)
+
+        self.mock_ttft_input = QDoubleSpinBox()
+        self.mock_ttft_input.setRange(0, 600)
+        self.mock_ttft_input.setDecimals(2)
+        self.mock_ttft_input.setSuffix(" s")
+        self.mock_ttft_input.setValue(float(self.settings.get('mock_ttft', DEFAULT_MOCK_TTFT)))
+        mock_layout.addRow("Median Time to First Token:", self.mock_ttft_input)
+
+        self.mock_ttft_sigma_input = QDoubleSpinBox()
+        self.mock_ttft_sigma_input.setRange(0, 3)
+        self.mock_ttft_sigma_input.setDecimals(2)
+        self.mock_ttft_sigma_input.setSingleStep(0.1)
+        self.mock_ttft_sigma_input.setValue(float(self.settings.get('mock_ttft_sigma', DEFAULT_MOCK_TTFT_SIGMA)))
+        mock_layout.addRow("Latency Spread (log-normal):", self.mock_ttft_sigma_input)
+
+        self.mock_tps_input = QSpinBox()
+        self.mock_tps_input.setRange(1, 100000)
+        self.mock_tps_input.setSuffix(" tokens/s")
+        self.mock_tps_input.setValue(int(self.settings.get('mock_tps', DEFAULT_MOCK_TPS)))
+        mock_layout.addRow("Output Speed:", self.mock_tps_input)
+
+        self.mock_output_tokens_input = QSpinBox()
+        self.mock_output_tokens_input.setRange(1, 1000000)
+        self.mock_output_tokens_input.setSuffix(" tokens")
+        self.mock_output_tokens_input.setValue(int(self.settings.get('mock_output_tokens', DEFAULT_MOCK_OUTPUT_TOKENS)))
+        mock_layout.addRow("Output per Request:", self.mock_output_tokens_input)
+
+        # Rates are stored as fractions and shown as percentages
+        self.mock_error_rate_input = QDoubleSpinBox()
+        self.mock_error_rate_input.setRange(0, 100)
+        self.mock_error_rate_input.setDecimals(1)
+        self.mock_error_rate_input.setSuffix(" %")
+        self.mock_error_rate_input.setValue(float(self.settings.get('mock_error_rate', 0)) * 100)
+        mock_layout.addRow("Server Errors (5xx):", self.mock_error_rate_input)
+
+        self.mock_throttle_rate_input = QDoubleSpinBox()
+        self.mock_throttle_rate_input.setRange(0, 100)
+        self.mock_throttle_rate_input.setDecimals(1)
+        self.mock_throttle_rate_input.setSuffix(" %")
+        self.mock_throttle_rate_input.setValue(float(self.settings.get('mock_throttle_rate', 0)) * 100)
+        mock_layout.addRow("Throttled (429):", self.mock_throttle_rate_input)
+
+        self.mock_group.setLayout(mock_layout)
+
         # Theme Section
         theme_group = QGroupBox("Appearance")
         theme_group.setObjectName("themeGroup")
@@ -106,11 +321,25 @@ class SettingsDialog(QDialog):
         button_layout.addWidget(save_btn)
         button_layout.addWidget(cancel_btn)
 
+        # The groups scroll, so Save and Cancel stay visible on small screens
+        content = QWidget()
+        content.setObjectName("settingsContent")
+        content_layout = QVBoxLayout(content)
+        content_layout.setContentsMargins(0, 0, 0, 0)
+        content_layout.addWidget(api_group)
+        content_layout.addWidget(folder_group)
+        content_layout.addWidget(cache_group)
+        content_layout.addWidget(estimate_group)
+        content_layout.addWidget(self.mock_group)
+        content_layout.addWidget(theme_group)
+        content_layout.addStretch()
+
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setWidget(content)
+
         # Add all to main layout
-        layout.addWidget(api_group)
-        layout.addWidget(folder_group)
-        layout.addWidget(theme_group)
-        layout.addStretch()
+        layout.addWidget(scroll_area)
         layout.addLayout(button_layout)
 
         self.setLayout(layout)
@@ -118,186 +347,14 @@ class SettingsDialog(QDialog):
         # Connect signals
         show_key_btn.pressed.connect(lambda: self.api_key_input.setEchoMode(QLineEdit.EchoMode.Normal))
         show_key_btn.released.connect(lambda: self.api_key_input.setEchoMode(QLineEdit.EchoMode.Password))
+        self.backend_combo.currentIndexChanged.connect(self.update_backend_fields)
+        self.update_backend_fields()
 
-    def apply_theme(self):
-        if self.theme == 'dark':
-            self.setStyleSheet("""
-                SettingsDialog {
-                    background-color: #2C3E50;
-                }
-                QGroupBox#apiGroup, QGroupBox#folderGroup, QGroupBox#themeGroup {
-                    font-weight: bold;
-                    border: 2px solid #4A90E2;
-                    border-radius: 8px;
-                    margin-top: 10px;
-                    padding-top: 15px;
-                    background-color: #34495E;
-                    color: #ECF0F1;
-                }
-                QGroupBox::title {
-                    subcontrol-origin: margin;
-                    left: 10px;
-                    padding: 0 10px 0 10px;
-                    color: #ECF0F1;
-                }
-                QLineEdit {
-                    padding: 8px;
-                    border: 1px solid #5D6D7E;
-                    border-radius: 4px;
-                    background-color: #2C3E50;
-                    color: #ECF0F1;
-                }
-                QLineEdit:focus {
-                    border: 2px solid #3498DB;
-                    background-color: #34495E;
-                }
-                QLineEdit[readOnly="true"] {
-                    background-color: #2C3E50;
-                    color: #BDC3C7;
-                }
-                QPushButton {
-                    border: none;
-                    padding: 8px 16px;
-                    border-radius: 4px;
-                    font-weight: bold;
-                }
-                QPushButton#saveButton {
-                    background-color: #27AE60;
-                    color: white;
-                }
-                QPushButton#saveButton:hover {
-                    background-color: #229954;
-                }
-                QPushButton#saveButton:pressed {
-                    background-color: #1E8449;
-                }
-                QPushButton#cancelButton {
-                    background-color: #E74C3C;
-                    color: white;
-                }
-                QPushButton#cancelButton:hover {
-                    background-color: #CB4335;
-                }
-                QPushButton#cancelButton:pressed {
-                    background-color: #B03A2E;
-                }
-                QPushButton:not(#saveButton):not(#cancelButton) {
-                    background-color: #7F8C8D;
-                    color: white;
-                }
-                QPushButton:not(#saveButton):not(#cancelButton):hover {
-                    background-color: #717D7E;
-                }
-                QPushButton:not(#saveButton):not(#cancelButton):pressed {
-                    background-color: #616A6B;
-                }
-                QLabel#folderInfo {
-                    color: #BDC3C7;
-                    font-size: 10px;
-                    padding: 5px;
-                }
-                QComboBox {
-                    padding: 6px;
-                    border: 1px solid #5D6D7E;
-                    border-radius: 4px;
-                    background-color: #2C3E50;
-                    color: #ECF0F1;
-                }
-                QComboBox:hover {
-                    border: 1px solid #3498DB;
-                }
-                QComboBox::drop-down {
-                    border: none;
-                }
-                QComboBox::down-arrow {
-                    image: none;
-                    border: none;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                SettingsDialog {
-                    background-color: #ECF0F1;
-                }
-                QGroupBox#apiGroup, QGroupBox#folderGroup, QGroupBox#themeGroup {
-                    font-weight: bold;
-                    border: 2px solid #4A90E2;
-                    border-radius: 8px;
-                    margin-top: 10px;
-                    padding-top: 15px;
-                    background-color: #FFFFFF;
-                }
-                QGroupBox::title {
-                    subcontrol-origin: margin;
-                    left: 10px;
-                    padding: 0 10px 0 10px;
-                    color: #2C3E50;
-                }
-                QLineEdit {
-                    padding: 8px;
-                    border: 1px solid #BDC3C7;
-                    border-radius: 4px;
-                    background-color: #F8F9FA;
-                }
-                QLineEdit:focus {
-                    border: 2px solid #3498DB;
-                    background-color: #FFFFFF;
-                }
-                QLineEdit[readOnly="true"] {
-                    background-color: #ECF0F1;
-                    color: #2C3E50;
-                }
-                QPushButton {
-                    border: none;
-                    padding: 8px 16px;
-                    border-radius: 4px;
-                    font-weight: bold;
-                }
-                QPushButton#saveButton {
-                    background-color: #2ECC71;
-                    color: white;
-                }
-                QPushButton#saveButton:hover {
-                    background-color: #27AE60;
-                }
-                QPushButton#saveButton:pressed {
-                    background-color: #219653;
-                }
-                QPushButton#cancelButton {
-                    background-color: #E74C3C;
-                    color: white;
-                }
-                QPushButton#cancelButton:hover {
-                    background-color: #C0392B;
-                }
-                QPushButton#cancelButton:pressed {
-                    background-color: #A93226;
-                }
-                QPushButton:not(#saveButton):not(#cancelButton) {
-                    background-color: #7F8C8D;
-                    color: white;
-                }
-                QPushButton:not(#saveButton):not(#cancelButton):hover {
-                    background-color: #95A5A6;
-                }
-                QPushButton:not(#saveButton):not(#cancelButton):pressed {
-                    background-color: #6C7B7D;
-                }
-                QLabel#folderInfo {
-                    color: #7F8C8D;
-                    font-size: 10px;
-                    padding: 5px;
-                }
-                QComboBox {
-                    padding: 6px;
-                    border: 1px solid #BDC3C7;
-                    border-radius: 4px;
-                    background-color: #F8F9FA;
-                }
-                QComboBox:hover {
-                    border: 1px solid #3498DB;
-                }
-            """)
+
+    def update_backend_fields(self):
+        backend = self.backend_combo.currentData()
+        self.base_url_input.setEnabled(backend == 'custom')
+        self.mock_group.setEnabled(backend == 'mock')
 
     def browse_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Select Output Folder")
@@ -306,28 +363,243 @@ class SettingsDialog(QDialog):
 
     def load_settings(self):
         try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r') as f:
-                    return json.load(f)
+            return self.db.load_settings()
         except Exception as e:
             print(f"Error loading settings: {e}")
         return {}
 
     def save_settings(self):
         try:
+            self.settings['api_backend'] = self.backend_combo.currentData()
+            self.settings['api_base_url'] = self.base_url_input.text().strip()
             self.settings['hf_api_key'] = self.api_key_input.text()
             self.settings['model_name'] = self.model_input.text()
+            self.settings['max_concurrent_files'] = self.concurrency_input.value()
+            self.settings['global_max_concurrent_requests'] = self.global_concurrency_input.value()
+            self.settings['model_rate_limit_rpm'] = self.model_rpm_input.value()
+            self.settings['provider_rate_limit_rpm'] = self.provider_rpm_input.value()
+            self.settings['max_retries'] = self.retries_input.value()
+            self.settings['http_max_connections'] = self.pool_size_input.value()
+            self.settings['http_timeout'] = self.timeout_input.value()
+            self.settings['max_pages_per_pdf'] = self.max_pages_input.value()
+            self.settings['max_input_tokens'] = self.max_input_tokens_input.value()
+            self.settings['chunk_reduce'] = self.reduce_combo.currentData()
+            self.settings['execution_engine'] = self.engine_combo.currentData()
             self.settings['default_output_folder'] = self.folder_path_input.text()
+            self.settings['response_cache_max_mb'] = self.cache_size_input.value()
+            self.settings['response_cache_max_age_days'] = self.cache_age_input.value()
+            self.settings['price_input_per_mtok'] = self.input_price_input.value()
+            self.settings['price_output_per_mtok'] = self.output_price_input.value()
+            self.settings['estimated_output_tokens'] = self.output_tokens_input.value()
+            self.settings['estimated_output_tps'] = self.output_tps_input.value()
+            self.settings['mock_ttft'] = self.mock_ttft_input.value()
+            self.settings['mock_ttft_sigma'] = self.mock_ttft_sigma_input.value()
+            self.settings['mock_tps'] = self.mock_tps_input.value()
+            self.settings['mock_output_tokens'] = self.mock_output_tokens_input.value()
+            self.settings['mock_error_rate'] = self.mock_error_rate_input.value() / 100
+            self.settings['mock_throttle_rate'] = self.mock_throttle_rate_input.value() / 100
             self.settings['theme'] = self.theme_combo.currentText()
 
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.settings, f, indent=2)
+            self.db.save_settings(self.settings)
 
             QMessageBox.information(self, "Success",
-                                    "Settings saved successfully!\nRestart the application for theme changes to take full effect.")
+                                    "Settings saved successfully!")
             self.accept()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save settings: {str(e)}")
 
     def get_settings(self):
         return self.settings
+
+
+class LogViewerDialog(QDialog):
+    """
+    Log window for a single process.
+
+    Shows the newest page of the log file, loads older pages on demand and
+    tails new lines from the store's in-memory buffer while open.
+    """
+
+    def __init__(self, log_store, process_id, process_name, parent=None, theme='light'):
+        super().__init__(parent)
+        self.log_store = log_store
+        self.process_id = process_id
+        self.theme = theme
+        self.setWindowTitle(f"📋 Logs - {process_name}")
+        self.setMinimumWidth(600)
+        self.setMinimumHeight(400)
+        self.setObjectName("logDialog")
+
+        self.cursor, self.sequence = self.log_store.snapshot(process_id)
+        self.init_ui()
+        self.load_older()
+
+        self.tail_timer = QTimer(self)
+        self.tail_timer.timeout.connect(self.tail)
+        self.tail_timer.start(1000)
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        self.load_older_btn = QPushButton("⬆ Load Older")
+        self.load_older_btn.setObjectName("loadOlderButton")
+        self.load_older_btn.clicked.connect(self.load_older)
+
+        self.log_display = QPlainTextEdit()
+        self.log_display.setReadOnly(True)
+        self.log_display.setObjectName("logDisplay")
+        self.log_display.setPlaceholderText("No logs available yet.")
+
+        close_btn = QPushButton("Close")
+        close_btn.setObjectName("closeLogButton")
+        close_btn.clicked.connect(self.accept)
+
+        layout.addWidget(self.load_older_btn)
+        layout.addWidget(self.log_display)
+        layout.addWidget(close_btn)
+
+        self.setLayout(layout)
+
+    def load_older(self):
+        """Prepend the previous page of the log"""
+        text, self.cursor = self.log_store.read_before(self.process_id, self.cursor)
+        if text is None:
+            self.load_older_btn.setEnabled(False)
+            return
+
+        scrollbar = self.log_display.verticalScrollBar()
+        distance_from_bottom = scrollbar.maximum() - scrollbar.value()
+
+        cursor = QTextCursor(self.log_display.document())
+        cursor.movePosition(QTextCursor.MoveOperation.Start)
+        if self.log_display.document().isEmpty():
+            text = text.rstrip("\n")
+        elif not text.endswith("\n"):
+            text += "\n"
+        cursor.insertText(text)
+
+        scrollbar.setValue(scrollbar.maximum() - distance_from_bottom)
+
+    def tail(self):
+        """Append lines logged since the dialog was opened"""
+        lines, self.sequence = self.log_store.lines_since(self.process_id, self.sequence)
+        if lines:
+            self.log_display.appendPlainText("\n".join(lines))
+
+
+
+class AnalyticsDialog(QDialog):
+    """
+    Throughput and latency dashboard built from the per-file metrics: one row
+    per model with files/min, tokens/s and p50/p95 latencies, and an hourly
+    trend. Refreshes itself while open.
+    """
+
+    MODEL_COLUMNS = ("Model", "Files", "Failed", "Files/min", "Tokens/s", "API p50", "API p95",
+                     "TTFT p50", "TTFT p95", "Queue p50", "Extract p50", "Prompt tok", "Output tok")
+    TREND_COLUMNS = ("Hour", "Files", "Output tokens", "API p50")
+
+    def __init__(self, parent=None, theme='light'):
+        super().__init__(parent)
+        self.db = get_database()
+        self.theme = theme
+        self.setWindowTitle("📈 Analytics")
+        self.setMinimumWidth(900)
+        self.setMinimumHeight(550)
+        self.setObjectName("analyticsDialog")
+
+        self.init_ui()
+        self.refresh()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(5000)
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        period_layout = QHBoxLayout()
+        self.period_combo = QComboBox()
+        for label, seconds in PERIODS:
+            self.period_combo.addItem(label, seconds)
+        self.period_combo.setCurrentIndex(1)
+        self.period_combo.currentIndexChanged.connect(self.refresh)
+        period_layout.addWidget(QLabel("Period:"))
+        period_layout.addWidget(self.period_combo)
+        period_layout.addStretch()
+
+        self.summary_label = QLabel()
+        self.summary_label.setObjectName("analyticsSummary")
+        self.summary_label.setWordWrap(True)
+
+        self.model_table = self.create_table(self.MODEL_COLUMNS)
+        self.trend_table = self.create_table(self.TREND_COLUMNS)
+
+        close_btn = QPushButton("Close")
+        close_btn.setObjectName("closeAnalyticsButton")
+        close_btn.clicked.connect(self.accept)
+
+        layout.addLayout(period_layout)
+        layout.addWidget(self.summary_label)
+        layout.addWidget(QLabel("Per model"))
+        layout.addWidget(self.model_table, 2)
+        layout.addWidget(QLabel("Trend"))
+        layout.addWidget(self.trend_table, 1)
+        layout.addWidget(close_btn)
+
+        self.setLayout(layout)
+
+    def create_table(self, columns):
+        table = QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
+    def refresh(self):
+        seconds = self.period_combo.currentData()
+        try:
+            rows = self.db.load_file_metrics(time.time() - seconds if seconds else None)
+        except Exception as e:
+            print(f"Error loading metrics: {e}")
+            return
+
+        if not rows:
+            self.summary_label.setText("No files processed in this period yet.")
+        else:
+            files_per_minute, tokens_per_second = throughput([row for row in rows if row['requests']])
+            estimated = sum(1 for row in rows if row['usage_estimated'])
+            text = (f"{len(rows)} files, {files_per_minute:.1f} files/min, "
+                    f"{tokens_per_second:.0f} output tokens/s")
+            if estimated:
+                text += f" ({estimated} files with estimated token counts; the provider sent no usage)"
+            self.summary_label.setText(text)
+
+        summary = summarize(rows)
+        self.model_table.setRowCount(len(summary))
+        for row, (model_name, stats) in enumerate(summary.items()):
+            values = (model_name, stats['files'], stats['failed'], f"{stats['files_per_minute']:.1f}",
+                      f"{stats['tokens_per_second']:.0f}", seconds_text(stats['api_p50']),
+                      seconds_text(stats['api_p95']), seconds_text(stats['ttft_p50']),
+                      seconds_text(stats['ttft_p95']), seconds_text(stats['queue_p50']),
+                      seconds_text(stats['extraction_p50']), f"{stats['prompt_tokens']:,}",
+                      f"{stats['completion_tokens']:,}")
+            self.set_row(self.model_table, row, values)
+
+        buckets = list(reversed(trend(rows)))
+        self.trend_table.setRowCount(len(buckets))
+        for row, (start, files, tokens, api_p50) in enumerate(buckets):
+            values = (datetime.fromtimestamp(start).strftime('%Y-%m-%d %H:00'), files, f"{tokens:,}",
+                      seconds_text(api_p50))
+            self.set_row(self.trend_table, row, values)
+
+    def set_row(self, table, row, values):
+        for column, value in enumerate(values):
+            table.setItem(row, column, QTableWidgetItem(str(value)))
+
+
+def seconds_text(seconds):
+    return "-" if seconds is None else f"{seconds:.1f}s"
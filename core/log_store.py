@@ -0,0 +1,136 @@
+import os
+import threading
+from collections import deque
+from datetime import datetime
+
+
+LOGS_DIR = os.path.join("saves", "logs")
+DEFAULT_MAX_LOG_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+RECENT_LINES = 500
+PAGE_BYTES = 64 * 1024
+
+
+class ProcessLogStore:
+    """
+    Per-process logs written to append-only files, rotated by size.
+
+    Only the most recent lines of each process are kept in memory (a ring
+    buffer used for live tailing); everything else stays on disk and is read
+    back a page at a time by the log viewer.
+    """
+
+    def __init__(self, logs_dir=LOGS_DIR, max_bytes=DEFAULT_MAX_LOG_BYTES,
+                 backup_count=DEFAULT_BACKUP_COUNT, recent_lines=RECENT_LINES):
+        self.logs_dir = logs_dir
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.recent_lines = recent_lines
+        self.recent = {}  # process_id -> deque of (sequence, line)
+        self.sequences = {}  # process_id -> last sequence number
+        self.lock = threading.Lock()
+        os.makedirs(logs_dir, exist_ok=True)
+
+    def path_for(self, process_id, generation=0):
+        """Generation 0 is the live file, 1..backup_count are rotated files (1 = newest)"""
+        path = os.path.join(self.logs_dir, f"{process_id}.log")
+        return path if generation == 0 else f"{path}.{generation}"
+
+    def append(self, entries):
+        """Appends [(process_id, message)] with a timestamp to each process's log"""
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        by_process = {}
+        for process_id, message in entries:
+            by_process.setdefault(process_id, []).append(f"[{timestamp}] {message}")
+
+        with self.lock:
+            for process_id, lines in by_process.items():
+                path = self.path_for(process_id)
+                try:
+                    with open(path, 'a', encoding='utf-8') as f:
+                        f.write("\n".join(lines) + "\n")
+                    if os.path.getsize(path) > self.max_bytes:
+                        self.rotate(process_id)
+                except OSError as e:
+                    print(f"Error writing log for {process_id}: {e}")
+
+                recent = self.recent.setdefault(process_id, deque(maxlen=self.recent_lines))
+                sequence = self.sequences.get(process_id, 0)
+                for line in lines:
+                    sequence += 1
+                    recent.append((sequence, line))
+                self.sequences[process_id] = sequence
+
+    def rotate(self, process_id):
+        """Shift process.log -> process.log.1 -> ... dropping the oldest; caller holds the lock"""
+        oldest = self.path_for(process_id, self.backup_count)
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for generation in range(self.backup_count - 1, -1, -1):
+            source = self.path_for(process_id, generation)
+            if os.path.exists(source):
+                os.replace(source, self.path_for(process_id, generation + 1))
+
+    def snapshot(self, process_id):
+        """
+        Returns (cursor, sequence): a read position at the current end of the
+        log for paging backwards, and the ring buffer sequence at that moment
+        for tailing forwards. Both describe the same instant.
+        """
+        with self.lock:
+            try:
+                size = os.path.getsize(self.path_for(process_id))
+            except OSError:
+                size = 0
+            return (0, size), self.sequences.get(process_id, 0)
+
+    def lines_since(self, process_id, sequence):
+        """Returns (lines, last_sequence) for ring buffer lines newer than sequence"""
+        with self.lock:
+            recent = self.recent.get(process_id, ())
+            lines = [line for seq, line in recent if seq > sequence]
+            return lines, self.sequences.get(process_id, sequence)
+
+    def read_before(self, process_id, cursor, page_bytes=PAGE_BYTES):
+        """
+        Reads up to page_bytes of whole lines ending at cursor, continuing into
+        older rotated files. Returns (text, new_cursor), or (None, cursor) when
+        there is nothing older.
+        """
+        generation, offset = cursor
+        while generation <= self.backup_count:
+            if offset > 0:
+                path = self.path_for(process_id, generation)
+                start = max(0, offset - page_bytes)
+                try:
+                    with open(path, 'rb') as f:
+                        f.seek(start)
+                        data = f.read(offset - start)
+                except OSError:
+                    data = b''
+
+                if data:
+                    # Start on a line boundary unless this is the top of the file
+                    if start > 0:
+                        newline = data.find(b"\n")
+                        if 0 <= newline < len(data) - 1:
+                            start += newline + 1
+                            data = data[newline + 1:]
+                    return data.decode('utf-8', errors='replace'), (generation, start)
+
+            generation += 1
+            try:
+                offset = os.path.getsize(self.path_for(process_id, generation))
+            except OSError:
+                offset = 0
+        return None, cursor
+
+    def delete(self, process_id):
+        with self.lock:
+            self.recent.pop(process_id, None)
+            self.sequences.pop(process_id, None)
+            for generation in range(self.backup_count + 1):
+                try:
+                    os.remove(self.path_for(process_id, generation))
+                except OSError:
+                    pass
@@ -0,0 +1,83 @@
+import os
+import threading
+from datetime import datetime
+
+from core.database import get_database
+from utils.fileio import hash_file
+
+
+# Per-file states recorded in the manifest
+FILE_DONE = 'done'
+FILE_FAILED = 'failed'
+FILE_SKIPPED = 'skipped'
+
+NO_TEXT_ERROR = "No text extracted"  # the only reason a file is skipped for good
+
+
+class ProcessManifest:
+    """
+    Per-process record of every PDF's outcome, used to resume a process
+    without redoing files that already completed.
+
+    Each entry stores the file's output index (so output names stay stable
+    across restarts even if files are added to the folder), its state, the
+    output path and the SHA-256 of the PDF it was produced from. Entries are
+    rows of the file_results table, so recording a file is a single upsert.
+    """
+
+    def __init__(self, process_id, database=None):
+        self.process_id = process_id
+        self.db = database or get_database()
+        self.lock = threading.Lock()
+        self.files = self.db.load_file_results(process_id)
+
+    def assign_indexes(self, pdf_files):
+        """
+        Returns {pdf_file: index} for the given (sorted) files. Files seen in a
+        previous run keep their index; new files are numbered after them.
+        """
+        with self.lock:
+            indexes = {name: entry['index'] for name, entry in self.files.items() if name in pdf_files}
+            next_index = max((entry['index'] for entry in self.files.values()), default=-1) + 1
+            new_indexes = {}
+            for pdf_file in pdf_files:
+                if pdf_file not in indexes:
+                    indexes[pdf_file] = new_indexes[pdf_file] = next_index
+                    self.files[pdf_file] = {'index': next_index}
+                    next_index += 1
+            self.db.save_file_indexes(self.process_id, new_indexes)
+            return indexes
+
+    def is_complete(self, pdf_file, pdf_path):
+        """
+        True if the file was finished (done, or skipped for having no text) from
+        the same PDF contents. Failed files, including failed extractions, are retried.
+        """
+        entry = self.files.get(pdf_file)
+        if not entry or entry.get('state') not in (FILE_DONE, FILE_SKIPPED):
+            return False
+        if entry.get('state') == FILE_DONE and not os.path.exists(entry.get('output_path') or ''):
+            return False
+        if entry.get('state') == FILE_SKIPPED and entry.get('error') != NO_TEXT_ERROR:
+            return False  # failed extractions recorded as skipped by older versions
+        try:
+            return entry.get('content_hash') == hash_file(pdf_path)
+        except OSError:
+            return False
+
+    def record(self, pdf_file, state, content_hash=None, output_path=None, error=None):
+        with self.lock:
+            entry = self.files.setdefault(pdf_file, {'index': len(self.files)})
+            entry.update({
+                'state': state,
+                'content_hash': content_hash,
+                'output_path': output_path,
+                'error': error,
+                'updated_at': datetime.now().isoformat(),
+            })
+            self.db.save_file_result(self.process_id, pdf_file, entry)
+
+    def delete(self):
+        with self.lock:
+            self.files = {}
+            self.db.delete_file_results(self.process_id)
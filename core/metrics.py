@@ -0,0 +1,157 @@
+import math
+import time
+import threading
+
+from core.chunking import count_tokens
+
+
+TREND_BUCKET_SECONDS = 3600
+
+# Analytics periods offered in the dashboard: (label, seconds, 0 = everything)
+PERIODS = (
+    ("Last hour", 3600),
+    ("Last 24 hours", 24 * 3600),
+    ("Last 7 days", 7 * 24 * 3600),
+    ("All time", 0),
+)
+
+
+class FileMetrics:
+    """
+    Timings and token counts of one file, filled in as it goes through the
+    pipeline. Split documents and retries add up into the same record.
+    """
+
+    def __init__(self, process_id, pdf_file, model_name):
+        self.process_id = process_id
+        self.pdf_file = pdf_file
+        self.model_name = model_name
+        self.extraction_seconds = None
+        self.queue_wait_seconds = 0.0
+        self.ttft_seconds = None  # of the first streamed request
+        self.api_seconds = 0.0
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.reasoning_tokens = 0
+        self.usage_estimated = False
+        self.lock = threading.Lock()  # parts of a split document report concurrently
+
+    def add_queue_wait(self, seconds):
+        with self.lock:
+            self.queue_wait_seconds += seconds
+
+    def add_first_token(self, seconds):
+        with self.lock:
+            if self.ttft_seconds is None:
+                self.ttft_seconds = seconds
+
+    def add_request(self, api_seconds, usage, messages, response):
+        """
+        Adds one finished request. Token counts come from the API's usage when
+        the provider sends it, and are estimated from the text otherwise.
+        """
+        with self.lock:
+            self.requests += 1
+            self.api_seconds += api_seconds
+            if usage is not None and getattr(usage, 'prompt_tokens', None) is not None:
+                self.prompt_tokens += usage.prompt_tokens
+                self.completion_tokens += usage.completion_tokens or 0
+                details = getattr(usage, 'completion_tokens_details', None)
+                self.reasoning_tokens += getattr(details, 'reasoning_tokens', None) or 0
+            else:
+                self.usage_estimated = True
+                self.prompt_tokens += sum(count_tokens(message['content']) for message in messages)
+                self.completion_tokens += count_tokens(response or "")
+
+    def row(self, outcome, output=None):
+        """The file_metrics row for this file; outcome is done, cached, skipped, budget or failed"""
+        return {
+            'process_id': self.process_id,
+            'pdf_file': self.pdf_file,
+            'model_name': self.model_name,
+            'outcome': outcome,
+            'finished_at': time.time(),
+            'extraction_seconds': self.extraction_seconds,
+            'queue_wait_seconds': self.queue_wait_seconds if self.requests else None,
+            'ttft_seconds': self.ttft_seconds,
+            'api_seconds': self.api_seconds if self.requests else None,
+            'requests': self.requests,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'reasoning_tokens': self.reasoning_tokens,
+            'usage_estimated': int(self.usage_estimated),
+            'output_bytes': len(output.encode('utf-8')) if output else 0,
+        }
+
+
+def record_file_metrics(metrics, outcome, output=None):
+    """Stores the metrics of a finished file; never fails the file"""
+    from core.database import get_database
+
+    try:
+        get_database().save_file_metrics([metrics.row(outcome, output)])
+    except Exception as e:
+        print(f"Error saving metrics for {metrics.pdf_file}: {e}")
+
+
+# --- analytics ---
+
+def percentile(values, p):
+    """Nearest-rank percentile, or None for no values"""
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    rank = max(1, math.ceil(p / 100.0 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+def throughput(rows):
+    """(files per minute, output tokens per second) over the span the rows cover"""
+    if not rows:
+        return 0.0, 0.0
+    first = rows[0]
+    start = first['finished_at'] - (first['extraction_seconds'] or 0) - (first['api_seconds'] or 0)
+    span = max(1.0, rows[-1]['finished_at'] - start)
+    tokens = sum(row['completion_tokens'] or 0 for row in rows)
+    return len(rows) * 60.0 / span, tokens / span
+
+
+def summarize(rows):
+    """Per-model throughput and latency statistics of metrics rows ordered by finished_at"""
+    by_model = {}
+    for row in rows:
+        by_model.setdefault(row['model_name'] or '', []).append(row)
+
+    summary = {}
+    for model_name, model_rows in sorted(by_model.items()):
+        sent = [row for row in model_rows if row['requests']]
+        files_per_minute, tokens_per_second = throughput(sent)
+        summary[model_name] = {
+            'files': len(model_rows),
+            'failed': sum(1 for row in model_rows if row['outcome'] == 'failed'),
+            'cached': sum(1 for row in model_rows if row['outcome'] == 'cached'),
+            'files_per_minute': files_per_minute,
+            'tokens_per_second': tokens_per_second,
+            'api_p50': percentile([row['api_seconds'] for row in sent], 50),
+            'api_p95': percentile([row['api_seconds'] for row in sent], 95),
+            'ttft_p50': percentile([row['ttft_seconds'] for row in sent], 50),
+            'ttft_p95': percentile([row['ttft_seconds'] for row in sent], 95),
+            'queue_p50': percentile([row['queue_wait_seconds'] for row in sent], 50),
+            'extraction_p50': percentile([row['extraction_seconds'] for row in model_rows], 50),
+            'prompt_tokens': sum(row['prompt_tokens'] or 0 for row in model_rows),
+            'completion_tokens': sum(row['completion_tokens'] or 0 for row in model_rows),
+            'reasoning_tokens': sum(row['reasoning_tokens'] or 0 for row in model_rows),
+        }
+    return summary
+
+
+def trend(rows, bucket_seconds=TREND_BUCKET_SECONDS):
+    """[(bucket start, files, output tokens, p50 API seconds)] for each bucket with finished files"""
+    buckets = {}
+    for row in rows:
+        start = int(row['finished_at'] // bucket_seconds * bucket_seconds)
+        buckets.setdefault(start, []).append(row)
+    return [(start, len(bucket), sum(row['completion_tokens'] or 0 for row in bucket),
+             percentile([row['api_seconds'] for row in bucket], 50))
+            for start, bucket in sorted(buckets.items())]
@@ -0,0 +1,260 @@
+"""
+Mock OpenAI-compatible chat completions backend.
+
+Answers /chat/completions (streamed or not, with usage) after a log-normal
+time to first token, at a configurable output speed, and fails a share of
+requests with 429/500/503, so the scheduler, retries and GUI can be
+exercised offline and at no cost. Selected with the 'mock' API backend.
+"""
+import json
+import math
+import time
+import random
+import sys
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+# Defaults of the 'mock_*' settings
+DEFAULT_MOCK_TTFT = 0.5  # median seconds to first token
+DEFAULT_MOCK_TTFT_SIGMA = 0.5  # log-normal spread
+DEFAULT_MOCK_TPS = 80.0  # output tokens per second
+DEFAULT_MOCK_OUTPUT_TOKENS = 400
+
+
+class MockConfig:
+    """
+    Behaviour of the mock model. Time to first token is log-normal around
+    ttft_median; output streams at tokens_per_second. error_rate is the share
+    of requests answered with a 500/503, throttle_rate the share answered 429.
+    """
+
+    def __init__(self, ttft_median=DEFAULT_MOCK_TTFT, ttft_sigma=DEFAULT_MOCK_TTFT_SIGMA,
+                 tokens_per_second=DEFAULT_MOCK_TPS, output_tokens=DEFAULT_MOCK_OUTPUT_TOKENS,
+                 error_rate=0.0, throttle_rate=0.0, seed=None):
+        self.ttft_median = ttft_median
+        self.ttft_sigma = ttft_sigma
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Reads the 'mock_*' settings; rates are fractions (0.02 = 2% of requests)"""
+        return cls(float(settings.get('mock_ttft', DEFAULT_MOCK_TTFT)),
+                   float(settings.get('mock_ttft_sigma', DEFAULT_MOCK_TTFT_SIGMA)),
+                   max(1.0, float(settings.get('mock_tps', DEFAULT_MOCK_TPS))),
+                   int(settings.get('mock_output_tokens', DEFAULT_MOCK_OUTPUT_TOKENS)),
+                   float(settings.get('mock_error_rate', 0.0)),
+                   float(settings.get('mock_throttle_rate', 0.0)),
+                   settings.get('mock_seed'))
+
+    def values(self):
+        return (self.ttft_median, self.ttft_sigma, self.tokens_per_second, self.output_tokens,
+                self.error_rate, self.throttle_rate)
+
+    def draw(self):
+        """(failure status or None, time to first token) for one request"""
+        with self.lock:
+            roll = self.random.random()
+            ttft = self.ttft_median * math.exp(self.random.gauss(0, self.ttft_sigma)) if self.ttft_median else 0.0
+        if roll < self.throttle_rate:
+            return 429, ttft
+        if roll < self.throttle_rate + self.error_rate:
+            return (500 if roll < self.throttle_rate + self.error_rate / 2 else 503), ttft
+        return None, ttft
+
+
+class MockStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.completion_tokens = 0
+
+    def add(self, failed=False, tokens=0):
+        with self.lock:
+            self.requests += 1
+            self.failures += int(failed)
+            self.completion_tokens += tokens
+
+    def snapshot(self):
+        with self.lock:
+            return {'requests': self.requests, 'failures': self.failures,
+                    'completion_tokens': self.completion_tokens}
+
+
+# Errors writing to a client that closed its connection
+CLIENT_GONE = (BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real endpoints
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        try:
+            self.respond()
+        except CLIENT_GONE:
+            # The client cancelled, retried or timed out mid-response
+            self.close_connection = True
+
+    def respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return self.send_json(400, {'error': {'message': 'invalid JSON'}})
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            return self.send_json(404, {'error': {'message': f'unknown path {self.path}'}})
+
+        config = self.server.config
+        failure, ttft = config.draw()
+        time.sleep(ttft)
+        if failure is not None:
+            self.server.stats.add(failed=True)
+            headers = {'Retry-After': '1'} if failure == 429 else {}
+            return self.send_json(failure, {'error': {'message': 'injected failure'}}, headers)
+
+        prompt_tokens = sum(len(str(m.get('content', ''))) for m in body.get('messages', [])) // 4
+        usage = {'prompt_tokens': prompt_tokens, 'completion_tokens': config.output_tokens,
+                 'total_tokens': prompt_tokens + config.output_tokens}
+        model = body.get('model', 'mock')
+        self.server.stats.add(tokens=config.output_tokens)
+
+        if body.get('stream'):
+            self.stream(model, config, usage)
+        else:
+            time.sleep(config.output_tokens / config.tokens_per_second)
+            self.send_json(200, {
+                'id': 'chatcmpl-mock', 'object': 'chat.completion', 'created': int(time.time()), 'model': model,
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': mock_text(config.output_tokens)}}],
+                'usage': usage,
+            })
+
+    def stream(self, model, config, usage):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        def event(payload):
+            data = f"data: {payload}\n\n".encode('utf-8')
+            self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+
+        def chunk(delta, finish_reason=None, usage=None):
+            return json.dumps({'id': 'chatcmpl-mock', 'object': 'chat.completion.chunk',
+                               'created': int(time.time()), 'model': model, 'usage': usage,
+                               'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]})
+
+        # Tokens go out in small batches at the configured rate
+        batch = max(1, int(config.tokens_per_second // 20))
+        start = time.monotonic()
+        sent = 0
+        while sent < config.output_tokens:
+            count = min(batch, config.output_tokens - sent)
+            event(chunk({'content': mock_text(count)}))
+            sent += count
+            delay = start + sent / config.tokens_per_second - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        event(chunk({}, 'stop', usage))
+        event('[DONE]')
+        self.wfile.write(b"0\r\n\r\n")
+
+    def send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # a full client connection pool connects at once
+
+    def handle_error(self, request, client_address):
+        # Disconnects are routine (every cancel drops its streams); anything else gets the traceback
+        if not isinstance(sys.exc_info()[1], CLIENT_GONE):
+            super().handle_error(request, client_address)
+
+
+def mock_text(tokens):
+    return "lorem " * tokens
+
+
+class MockServer:
+    """The mock endpoint on a background thread; use as a context manager or start()/stop()"""
+
+    def __init__(self, config=None, host='127.0.0.1', port=0):
+        self.server = MockHTTPServer((host, port), MockHandler)
+        self.server.config = config or MockConfig()
+        self.server.stats = MockStats()
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def stats(self):
+        return self.server.stats
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="mock-llm", daemon=True)
+        self.thread.start()
+        return self
+
+    def configure(self, config):
+        """Applies new behaviour to the running server; takes effect from the next request"""
+        if config.values() != self.server.config.values():
+            self.server.config = config
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_mock_backend(settings):
+    """
+    Returns the in-process mock endpoint, starting it on first use on
+    127.0.0.1 ('mock_port', any free port by default). Later calls apply
+    changed 'mock_*' settings to the running server.
+    """
+    global _backend
+    with _backend_lock:
+        config = MockConfig.from_settings(settings)
+        if _backend is None:
+            _backend = MockServer(config, port=int(settings.get('mock_port', 0) or 0)).start()
+        else:
+            _backend.configure(config)
+        return _backend
+
+
+def shutdown_mock_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is not None:
+            _backend.stop()
+            _backend = None
@@ -0,0 +1,506 @@
+import os
+import time
+import threading
+from pathlib import Path
+
+from core.chunking import (count_tokens, chunking_options, split_document, reduce_mode, reduce_batches,
+                           build_reduce_messages, concatenate_results, part_path, part_label, remove_parts)
+from core.clients import api_backend, api_key_for, base_url_for
+from core.manifest import ProcessManifest, FILE_DONE, FILE_FAILED, FILE_SKIPPED, NO_TEXT_ERROR
+from core.metrics import FileMetrics, record_file_metrics
+from core.retry import DEFAULT_MAX_RETRIES, classify_error, retry_after_of, backoff_delay
+from core.scheduler import get_scheduler
+from utils.fileio import atomic_write_text, hash_file
+from utils.response_cache import ResponseCache, response_cache_key
+
+
+DEFAULT_MODEL_NAME = 'ServiceNow-AI/Apriel-1.6-15b-Thinker:together'
+DEFAULT_MAX_CONCURRENT_FILES = 4
+
+TOKEN_PROGRESS_INTERVAL = 0.5  # seconds between token_progress signals per file
+
+# Parameters sent with every completion request; also part of the response cache key
+REQUEST_PARAMS = {
+    'max_tokens': 72000,
+    'extra_body': {
+        'reasoning': {
+            'effort': 'high'
+        }
+    },
+}
+
+
+class Callback:
+    """Stand-in for a Qt signal outside the GUI: emit() calls the handler, if any"""
+
+    def __init__(self, handler=None):
+        self.handler = handler
+
+    def emit(self, *args):
+        if self.handler is not None:
+            self.handler(*args)
+
+
+class ProcessEvents:
+    """The signals of a process worker as plain callbacks, for running without Qt"""
+
+    def __init__(self, progress=None, status=None, finished=None, log=None, tokens=None):
+        self.progress_updated = Callback(progress)
+        self.status_changed = Callback(status)
+        self.finished = Callback(finished)
+        self.log_message = Callback(log)
+        self.token_progress = Callback(tokens)
+
+
+def max_concurrent_files(process_data, settings):
+    """Number of files allowed in flight at once for a process"""
+    value = process_data.get('max_concurrent_files',
+                             settings.get('max_concurrent_files', DEFAULT_MAX_CONCURRENT_FILES))
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_CONCURRENT_FILES
+
+
+def list_pdf_files(pdf_folder):
+    """Sorted so that output numbering does not depend on completion order"""
+    return sorted(f for f in os.listdir(pdf_folder) if f.lower().endswith('.pdf'))
+
+
+def plan_work(process_id, pdf_folder, pdf_files):
+    """
+    Loads the manifest of a process and returns (manifest, work_items,
+    resumed_count), skipping files completed by an earlier run. Work items
+    are (index, pdf_file) pairs.
+    """
+    manifest = ProcessManifest(process_id)
+    indexes = manifest.assign_indexes(pdf_files)
+    work_items = []
+    resumed_count = 0
+    for pdf_file in pdf_files:
+        if manifest.is_complete(pdf_file, os.path.join(pdf_folder, pdf_file)):
+            resumed_count += 1
+        else:
+            work_items.append((indexes[pdf_file], pdf_file))
+    return manifest, work_items, resumed_count
+
+
+def extraction_problem(content):
+    """Reason to skip a file given its extracted text, or None if it is usable"""
+    if content is None:
+        return "Extraction failed"
+    if len(content.strip()) == 0:
+        return NO_TEXT_ERROR
+    return None
+
+
+def result_path_for(output_folder, idx, pdf_file):
+    """The index comes from the manifest so names stay stable across completion order and restarts"""
+    return os.path.join(output_folder, f"{idx + 1:03d}_{Path(pdf_file).stem}.md")
+
+
+def build_messages(instruction, content):
+    return [
+        {"role": "system", "content": instruction},
+        {"role": "user", "content": content}
+    ]
+
+
+def plural(count, noun):
+    """'1 file', '4 files'"""
+    return f"{count} {noun}{'' if count == 1 else 's'}"
+
+
+def completion_summary(successful, failed, resumed, total_files):
+    summary = (f"Finished: {successful} successful, "
+               f"{failed} failed/skipped out of {total_files} files")
+    if resumed:
+        summary += f" ({resumed} completed in earlier runs)"
+    return summary
+
+
+# --- steps shared by the threaded and the asyncio engine ---
+#
+# The engines differ only in how they wait: ProcessWorker blocks a thread per
+# file, AsyncProcessRunner awaits tasks on one loop. Everything else about a
+# run lives here, as blocking code the async engine runs with asyncio.to_thread.
+
+class ProcessRun:
+    """
+    One run of a process: configuration checks, resume planning, budget,
+    progress counters and the final summary. `events` has ProcessWorker's
+    signals (Qt signals or ProcessEvents).
+    """
+
+    def __init__(self, process_data, settings, events):
+        from core.preflight import Budget
+
+        self.process_data = process_data
+        self.settings = settings
+        self.events = events
+        self.process_id = process_data['id']
+        self.model_name = process_data.get('model_name', DEFAULT_MODEL_NAME)
+        self.budget = Budget(process_data, settings)
+        self.response_cache = None
+        self.manifest = None
+        self.counter_lock = threading.Lock()
+        self.total_files = 0
+        self.processed_count = 0
+        self.successful_count = 0
+        self.failed_count = 0
+        self.resumed_count = 0
+
+    def log(self, message):
+        self.events.log_message.emit(self.process_id, message)
+
+    def prepare(self):
+        """
+        Checks the configuration and plans which files to process. Returns
+        (api_key, work_items), or None after reporting why the process can't run.
+        """
+        self.log("Initializing process...")
+
+        api_key = api_key_for(self.settings)
+        if not api_key:
+            self.events.finished.emit(self.process_id, False, "API key not configured")
+            return None
+
+        # Mock responses must never be served as real results
+        if self.process_data.get('reuse_cached_results', True) and api_backend(self.settings) != 'mock':
+            self.response_cache = ResponseCache.from_settings(self.settings)
+
+        pdf_folder = self.process_data['pdf_folder']
+        if not os.path.exists(pdf_folder):
+            self.events.finished.emit(self.process_id, False, "PDF folder does not exist")
+            return None
+
+        pdf_files = list_pdf_files(pdf_folder)
+        self.total_files = len(pdf_files)
+        if self.total_files == 0:
+            self.events.finished.emit(self.process_id, False, "No PDF files found in folder")
+            return None
+
+        self.log(f"Found {plural(self.total_files, 'PDF file')}")
+
+        # Skip files already completed by an earlier run of this process
+        self.manifest, work_items, self.resumed_count = plan_work(self.process_id, pdf_folder, pdf_files)
+        self.processed_count = self.resumed_count
+        if self.resumed_count:
+            self.log(f"Resuming: {plural(self.resumed_count, 'file')} already completed")
+        if not work_items:
+            # Nothing left to send; finish without starting the API stage
+            self.events.progress_updated.emit(self.process_id, self.processed_count, self.total_files)
+            self.finish()
+            return None
+
+        if self.budget.enabled:
+            work_items = self.budget.order(work_items)
+            self.log(f"Budget: {self.budget.describe()} used")
+        return api_key, work_items
+
+    def start(self, client, max_concurrent):
+        self.log(f"Using model: {self.model_name}")
+        if api_backend(self.settings) != 'huggingface':
+            self.log(f"API backend: {api_backend(self.settings)} ({client.base_url})")
+        self.log(f"Processing up to {plural(max_concurrent, 'file')} concurrently")
+        self.events.status_changed.emit(self.process_id, "running")
+
+        os.makedirs(self.process_data['output_folder'], exist_ok=True)
+        self.events.progress_updated.emit(self.process_id, self.processed_count, self.total_files)
+
+    def file_finished(self, success):
+        """Progress is reported after every file, whether it succeeded or not"""
+        with self.counter_lock:
+            self.processed_count += 1
+            if success:
+                self.successful_count += 1
+            else:
+                self.failed_count += 1
+            current = self.processed_count
+        self.events.progress_updated.emit(self.process_id, current, self.total_files)
+
+    def finish(self, cancelled=False, error=None):
+        if cancelled:
+            self.events.status_changed.emit(self.process_id, "cancelled")
+            self.events.finished.emit(self.process_id, False, "Process cancelled by user")
+            return
+        if error:
+            self.events.status_changed.emit(self.process_id, "failed")
+            self.events.finished.emit(self.process_id, False, error)
+            return
+
+        if self.budget.enabled:
+            self.log(f"Budget: {self.budget.describe()} used")
+        self.events.status_changed.emit(self.process_id, "completed")
+        self.events.finished.emit(self.process_id, True, completion_summary(
+            self.successful_count, self.failed_count, self.resumed_count, self.total_files))
+
+    # --- requests ---
+
+    def retry_delay(self, error, attempt, pdf_file):
+        """
+        Handles a failed request: reports throttling to the scheduler and
+        returns the backoff before the next attempt, or raises the error if it
+        is not retryable or the retries are used up.
+        """
+        retryable, throttled = classify_error(error)
+        if throttled:
+            get_scheduler().report_throttled(self.model_name)
+        max_retries = int(self.settings.get('max_retries', DEFAULT_MAX_RETRIES))
+        if not retryable or attempt >= max_retries:
+            raise error
+
+        delay = backoff_delay(attempt, retry_after_of(error))
+        self.log(f"Retrying {pdf_file} in {delay:.1f}s (attempt {attempt + 1}/{max_retries}): {error}")
+        return delay
+
+    def request_succeeded(self, started, usage, messages, response, metrics):
+        get_scheduler().report_success(self.model_name)
+        metrics.add_request(time.monotonic() - started, usage, messages, response)
+
+
+class FileJob:
+    """
+    The steps of one file between extraction and the saved result: checking
+    the extracted text, the response cache, the budget reservation, the
+    manifest and the metrics. The engine sends the requests in between.
+    """
+
+    def __init__(self, run, idx, pdf_file):
+        self.run = run
+        self.idx = idx
+        self.pdf_file = pdf_file
+        self.pdf_path = os.path.join(run.process_data['pdf_folder'], pdf_file)
+        self.instruction = run.process_data['instruction']
+        self.result_path = result_path_for(run.process_data['output_folder'], idx, pdf_file)
+        self.metrics = FileMetrics(run.process_id, pdf_file, run.model_name)
+        self.pdf_hash = None
+        self.content = None
+        self.cache_key = None
+        self.reservation = None
+        self.response = None
+        self.outcome = 'failed'
+        self.success = False
+
+    def begin(self):
+        self.run.log(f"Processing: {self.pdf_file}")
+        self.pdf_hash = hash_file(self.pdf_path)
+
+    def check_extraction(self, result, error=None):
+        """
+        Takes the extraction's (content, seconds), or the exception it raised.
+        Returns True if there is text to send; otherwise records the file.
+        """
+        if error is not None:
+            self.run.log(f"PDF Error in {self.pdf_file}: {str(error)}")
+            content = None
+        else:
+            content, self.metrics.extraction_seconds = result
+
+        problem = extraction_problem(content)
+        if problem is None:
+            self.content = content
+            return True
+
+        if content is None:
+            # May be transient (e.g. another PDF crashed the shared pool), so
+            # recorded as failed and retried when the process is resumed
+            self.run.log(f"✗ Could not extract {self.pdf_file}")
+            self.run.manifest.record(self.pdf_file, FILE_FAILED, error=f"{problem}: {error}" if error else problem)
+            self.outcome = 'failed'
+        else:
+            # No text is a property of the file itself; resuming won't change it
+            self.run.log(f"Warning: No text extracted from {self.pdf_file}")
+            self.run.manifest.record(self.pdf_file, FILE_SKIPPED, self.pdf_hash, error=problem)
+            self.outcome = 'skipped'
+        return False
+
+    def use_cached_response(self):
+        """Completes the file from the response cache if it holds a result; returns True if it did"""
+        cache = self.run.response_cache
+        if cache is None:
+            return False
+        self.cache_key = response_cache_key(self.run.model_name, self.instruction, REQUEST_PARAMS, self.content,
+                                            base_url_for(self.run.settings), chunking_options(self.run.settings))
+        response = cache.get(self.cache_key)
+        if response is None:
+            return False
+
+        self.run.log(f"Reusing cached result for: {self.pdf_file}")
+        atomic_write_text(self.result_path, response)
+        self.complete(response, 'cached')
+        return True
+
+    def reserve(self):
+        """Reserves the file's expected tokens; raises BudgetExceeded if they don't fit"""
+        from core.preflight import estimate_file
+
+        budget = self.run.budget
+        if budget.enabled:
+            estimate = estimate_file(self.pdf_file, self.instruction, self.content, self.run.settings)
+            self.reservation = budget.reserve(estimate)
+
+    def settle(self):
+        if self.reservation is not None:
+            self.run.budget.settle(self.reservation, self.metrics.prompt_tokens, self.metrics.completion_tokens)
+            self.reservation = None
+
+    def complete(self, response, outcome='done'):
+        if outcome == 'done' and self.cache_key is not None and response:
+            self.run.response_cache.put(self.cache_key, response, self.run.model_name)
+        self.run.manifest.record(self.pdf_file, FILE_DONE, self.pdf_hash, output_path=self.result_path)
+        self.response = response
+        self.outcome = outcome
+        self.success = True
+        self.run.log(f"✓ Completed: {self.pdf_file}")
+
+    def fail(self, error):
+        from core.preflight import BudgetExceeded
+
+        if isinstance(error, BudgetExceeded):
+            # Not recorded in the manifest, so a later run with a larger budget picks it up
+            self.run.log(f"Skipping {self.pdf_file}: {error}")
+            self.outcome = 'budget'
+            return
+        self.run.log(f"✗ Error processing {self.pdf_file}: {str(error)}")
+        self.run.manifest.record(self.pdf_file, FILE_FAILED, error=str(error))
+        self.outcome = 'failed'
+
+    def record_metrics(self):
+        record_file_metrics(self.metrics, self.outcome, self.response)
+
+
+def document_requests(run, job):
+    """
+    Plans the requests for one document, independent of the engine: a
+    generator that yields lists of (messages, label, result path) to send
+    concurrently and is sent back their results (None if cancelled). It
+    returns the document's response, or None if cancelled.
+
+    Documents over the input token limit are split on their headings, the
+    parts sent concurrently and their results merged, in rounds if needed.
+    Part files are removed when the generator finishes or is closed.
+    """
+    instruction, pdf_file, result_path = job.instruction, job.pdf_file, job.result_path
+    chunks = split_document(instruction, job.content, run.settings)
+    if len(chunks) == 1:
+        results = yield [(build_messages(instruction, job.content), pdf_file, result_path)]
+        return results[0]
+
+    run.log(f"{pdf_file} exceeds the input token limit; processing it in {len(chunks)} parts")
+    paths = [part_path(result_path, n) for n in range(1, len(chunks) + 1)]
+    try:
+        partials = yield [(build_messages(instruction, chunk), part_label(pdf_file, n, len(chunks)), path)
+                          for n, (chunk, path) in enumerate(zip(chunks, paths), 1)]
+        if any(partial is None for partial in partials):
+            return None
+
+        if reduce_mode(run.settings) == 'concatenate':
+            response = concatenate_results(partials)
+            atomic_write_text(result_path, response)
+            return response
+
+        # Merge in rounds until the partial results fit in one request
+        round_number = 0
+        while True:
+            batches = reduce_batches(instruction, partials, run.settings)
+            if len(batches) == 1:
+                run.log(f"Merging {len(partials)} parts of {pdf_file}")
+                results = yield [(build_reduce_messages(instruction, partials), pdf_file, result_path)]
+                return results[0]
+
+            round_number += 1
+            requests = []
+            for n, batch in enumerate(batches, 1):
+                if len(batch) > 1:
+                    path = part_path(result_path, 100 * round_number + n)
+                    paths.append(path)
+                    requests.append((build_reduce_messages(instruction, batch),
+                                     part_label(pdf_file, n, len(batches)), path))
+            merged = iter((yield requests))
+            partials = [batch[0] if len(batch) == 1 else next(merged) for batch in batches]
+            if any(partial is None for partial in partials):
+                return None
+    finally:
+        remove_parts(paths)
+
+
+def advance(plan, results=None):
+    """
+    Sends the results of the last requests to a document_requests plan.
+    Returns (next requests, None), or (None, response) once the plan is done.
+    """
+    try:
+        return (next(plan) if results is None else plan.send(results)), None
+    except StopIteration as done:
+        return None, done.value
+
+
+class StreamRecorder:
+    """
+    Writes a streamed completion into result_path + '.partial' as chunks
+    arrive, reports live token counts and renames the file into place
+    when the stream is complete.
+    """
+
+    def __init__(self, run, pdf_file, result_path, metrics):
+        self.run = run
+        self.pdf_file = pdf_file
+        self.result_path = result_path
+        self.partial_path = result_path + '.partial'
+        self.metrics = metrics
+        self.pieces = []
+        self.tokens = 0
+        self.counted = 0  # pieces included in tokens
+        self.usage = None
+        self.started = time.monotonic()
+        self.last_report = 0.0
+        self.file = open(self.partial_path, 'w', encoding='utf-8')
+
+    def add(self, chunk):
+        # Some providers report usage on the last chunk
+        self.usage = getattr(chunk, 'usage', None) or self.usage
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if not delta:
+            return
+
+        if not self.pieces:
+            self.metrics.add_first_token(time.monotonic() - self.started)
+        self.file.write(delta)
+        self.pieces.append(delta)
+
+        now = time.monotonic()
+        if now - self.last_report >= TOKEN_PROGRESS_INTERVAL:
+            self.file.flush()
+            self.run.events.token_progress.emit(self.run.process_id, self.pdf_file, self.count_tokens())
+            self.last_report = now
+
+    def count_tokens(self):
+        """
+        Tokens received so far. A chunk can carry any number of tokens, so the
+        text is counted with the chunking tokenizer, a batch at a time; the
+        provider's usage replaces the count once it arrives.
+        """
+        completion_tokens = getattr(self.usage, 'completion_tokens', None)
+        if completion_tokens:
+            return completion_tokens
+        if self.counted < len(self.pieces):
+            self.tokens += count_tokens("".join(self.pieces[self.counted:]))
+            self.counted = len(self.pieces)
+        return self.tokens
+
+    def end(self):
+        self.file.close()
+        self.run.events.token_progress.emit(self.run.process_id, self.pdf_file, -1)
+
+    def discard(self):
+        self.file.close()
+        try:
+            os.remove(self.partial_path)
+        except OSError:
+            pass
+
+    def commit(self):
+        """Moves the finished stream into place; returns (full text, usage if the provider sent it)"""
+        os.replace(self.partial_path, self.result_path)
+        return "".join(self.pieces), self.usage
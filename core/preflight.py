@@ -0,0 +1,260 @@
+import os
+import threading
+from collections import deque
+
+from core.chunking import count_tokens, split_document, reduce_mode
+from core.pipeline import DEFAULT_MODEL_NAME, list_pdf_files, max_concurrent_files
+from core.scheduler import DEFAULT_GLOBAL_MAX_CONCURRENT_REQUESTS
+
+
+# Used until real numbers are configured in the settings
+DEFAULT_OUTPUT_TOKENS_PER_REQUEST = 4000  # 'estimated_output_tokens'
+DEFAULT_OUTPUT_TOKENS_PER_SECOND = 40  # 'estimated_output_tps'
+REQUEST_OVERHEAD_SECONDS = 3.0  # queueing, prefill and time to first token
+
+
+def model_prices(model_name, settings):
+    """
+    (input, output) price in dollars per million tokens. Per-model prices come
+    from the 'model_prices' setting ({"model": [input, output]}), with
+    'price_input_per_mtok' / 'price_output_per_mtok' as the fallback.
+    """
+    prices = settings.get('model_prices', {}).get(model_name)
+    if prices:
+        return float(prices[0]), float(prices[1])
+    return (float(settings.get('price_input_per_mtok', 0) or 0),
+            float(settings.get('price_output_per_mtok', 0) or 0))
+
+
+def cost_of(input_tokens, output_tokens, prices):
+    return (input_tokens * prices[0] + output_tokens * prices[1]) / 1000000
+
+
+def output_tokens_per_request(settings):
+    return int(settings.get('estimated_output_tokens', DEFAULT_OUTPUT_TOKENS_PER_REQUEST) or 0)
+
+
+def request_input_tokens(instruction, content):
+    """Input tokens of the request for one document, as sent by build_messages"""
+    return count_tokens(instruction) + count_tokens(content)
+
+
+class FileEstimate:
+    __slots__ = ('pdf_file', 'input_tokens', 'output_tokens', 'requests')
+
+    def __init__(self, pdf_file, input_tokens, output_tokens, requests):
+        self.pdf_file = pdf_file
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.requests = requests
+
+    @property
+    def tokens(self):
+        return self.input_tokens + self.output_tokens
+
+
+def estimate_file(pdf_file, instruction, content, settings):
+    """Expected tokens and requests for one extracted document, including splitting and merging"""
+    chunks = split_document(instruction, content, settings)
+    requests = len(chunks)
+    input_tokens = request_input_tokens(instruction, content) + count_tokens(instruction) * (requests - 1)
+    output_tokens = output_tokens_per_request(settings) * requests
+    if requests > 1 and reduce_mode(settings) == 'model':
+        # The merge request reads every partial result and writes one more
+        input_tokens += output_tokens
+        output_tokens += output_tokens_per_request(settings)
+        requests += 1
+    return FileEstimate(pdf_file, input_tokens, output_tokens, requests)
+
+
+class PreflightReport:
+    """Token, cost and wall time estimates for running an instruction over a folder"""
+
+    def __init__(self, model_name, settings, concurrency, estimates, unreadable):
+        self.model_name = model_name
+        self.settings = settings
+        self.concurrency = concurrency
+        self.estimates = estimates  # FileEstimate per readable PDF
+        self.unreadable = unreadable  # PDFs that could not be extracted
+        self.prices = model_prices(model_name, settings)
+
+    @property
+    def input_tokens(self):
+        return sum(e.input_tokens for e in self.estimates)
+
+    @property
+    def output_tokens(self):
+        return sum(e.output_tokens for e in self.estimates)
+
+    @property
+    def requests(self):
+        return sum(e.requests for e in self.estimates)
+
+    @property
+    def cost(self):
+        return cost_of(self.input_tokens, self.output_tokens, self.prices)
+
+    def wall_time(self):
+        """Seconds to process every file, limited by concurrency and any rate limits"""
+        tps = float(self.settings.get('estimated_output_tps', DEFAULT_OUTPUT_TOKENS_PER_SECOND) or 1)
+        slots = max(1, min(self.concurrency, int(self.settings.get('global_max_concurrent_requests',
+                                                                   DEFAULT_GLOBAL_MAX_CONCURRENT_REQUESTS))))
+        busy = sum(e.requests * REQUEST_OVERHEAD_SECONDS + e.output_tokens / tps for e in self.estimates)
+        seconds = busy / slots
+        rpm = int(self.settings.get('model_rate_limits', {}).get(self.model_name,
+                                                                 self.settings.get('model_rate_limit_rpm', 0)) or 0)
+        if rpm:
+            seconds = max(seconds, self.requests * 60.0 / rpm)
+        return seconds
+
+    def token_estimates(self):
+        """{pdf_file: expected tokens}, stored with the process to order its work"""
+        return {e.pdf_file: e.tokens for e in self.estimates}
+
+    def files_within(self, token_budget=0, cost_budget=0):
+        """How many files fit in the budgets when run smallest first"""
+        tokens = cost = 0.0
+        count = 0
+        for e in sorted(self.estimates, key=lambda e: e.tokens):
+            tokens += e.tokens
+            cost += cost_of(e.input_tokens, e.output_tokens, self.prices)
+            if (token_budget and tokens > token_budget) or (cost_budget and cost > cost_budget):
+                break
+            count += 1
+        return count
+
+    def summary(self, token_budget=0, cost_budget=0):
+        minutes = self.wall_time() / 60
+        lines = [
+            f"{len(self.estimates)} files, {self.requests} requests to {self.model_name}",
+            f"~{self.input_tokens:,} input + ~{self.output_tokens:,} output tokens",
+            f"~${self.cost:,.2f}" if any(self.prices) else "Cost: no prices configured for this model",
+            f"~{minutes:,.0f} min at {self.concurrency} files in flight",
+        ]
+        if self.unreadable:
+            lines.append(f"{len(self.unreadable)} files could not be extracted")
+        if token_budget or cost_budget:
+            lines.append(f"{self.files_within(token_budget, cost_budget)} of {len(self.estimates)} "
+                         f"files fit in the budget (smallest first)")
+        return "\n".join(lines)
+
+
+def run_preflight(pdf_folder, instruction, model_name, settings, concurrency=None,
+                  progress=None, is_cancelled=None):
+    """
+    Estimates every PDF in pdf_folder. Text comes from the extraction cache, or
+    is extracted in the shared pool and cached, so the real run reuses it.
+    progress(done, total) is called after each file; returns None if cancelled.
+    """
+    from utils.extraction_pool import submit_extraction, default_pool_size
+
+    pdf_files = list_pdf_files(pdf_folder)
+    extraction_workers = settings.get('extraction_workers')
+    max_pages = settings.get('max_pages_per_pdf')
+    # Like the worker's producer, keep only a pool's worth of files submitted at
+    # once, so running processes' extractions don't queue behind the estimate
+    lookahead = int(extraction_workers or default_pool_size())
+    remaining = iter(pdf_files)
+    pending = deque()
+
+    def submit_next():
+        pdf_file = next(remaining, None)
+        if pdf_file is not None:
+            pending.append((pdf_file, submit_extraction(os.path.join(pdf_folder, pdf_file), extraction_workers,
+                                                        max_pages)))
+
+    estimates = []
+    unreadable = []
+    try:
+        for _ in range(lookahead):
+            submit_next()
+        done = 0
+        while pending:
+            if is_cancelled is not None and is_cancelled():
+                return None
+            pdf_file, future = pending.popleft()
+            submit_next()
+            try:
+                content, _ = future.result()
+            except Exception:
+                content = None
+            if content and content.strip():
+                estimates.append(estimate_file(pdf_file, instruction, content, settings))
+            else:
+                unreadable.append(pdf_file)
+            done += 1
+            if progress is not None:
+                progress(done, len(pdf_files))
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+    concurrency = concurrency or max_concurrent_files({}, settings)
+    return PreflightReport(model_name or DEFAULT_MODEL_NAME, settings, concurrency, estimates, unreadable)
+
+
+class BudgetExceeded(Exception):
+    """Raised for a file whose expected tokens or cost do not fit in the rest of the budget"""
+
+
+class Budget:
+    """
+    Token and cost budget of a process, shared by its concurrent files.
+
+    Each file reserves its expected tokens before its requests are sent and
+    settles with the tokens reported by the API afterwards; files whose reservation does
+    not fit are skipped. Spending is kept in process_data so it survives a restart.
+    """
+
+    def __init__(self, process_data, settings):
+        self.process_data = process_data
+        self.max_tokens = int(process_data.get('token_budget') or 0)
+        self.max_cost = float(process_data.get('cost_budget') or 0)
+        self.prices = model_prices(process_data.get('model_name', DEFAULT_MODEL_NAME), settings)
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.max_tokens or self.max_cost)
+
+    def spent(self):
+        return (self.process_data.get('budget_used_tokens', 0), self.process_data.get('budget_used_cost', 0.0))
+
+    def add(self, tokens, cost):
+        used_tokens, used_cost = self.spent()
+        self.process_data['budget_used_tokens'] = used_tokens + tokens
+        self.process_data['budget_used_cost'] = used_cost + cost
+
+    def reserve(self, estimate):
+        """Reserves a FileEstimate and returns the reservation; raises BudgetExceeded if it does not fit"""
+        reservation = (estimate.tokens, cost_of(estimate.input_tokens, estimate.output_tokens, self.prices))
+        with self.lock:
+            used_tokens, used_cost = self.spent()
+            if ((self.max_tokens and used_tokens + reservation[0] > self.max_tokens) or
+                    (self.max_cost and used_cost + reservation[1] > self.max_cost)):
+                raise BudgetExceeded(f"over the process budget ({self.describe()} used, "
+                                     f"~{estimate.tokens:,} tokens needed)")
+            self.add(*reservation)
+        return reservation
+
+    def settle(self, reservation, input_tokens, output_tokens):
+        """Replaces a reservation with the tokens the file's requests actually used"""
+        with self.lock:
+            self.add(input_tokens + output_tokens - reservation[0],
+                     cost_of(input_tokens, output_tokens, self.prices) - reservation[1])
+
+    def order(self, work_items):
+        """Smallest files first, by the pre-flight estimates, so the most files fit in the budget"""
+        estimates = self.process_data.get('preflight_tokens')
+        if not self.enabled or not estimates:
+            return work_items
+        return sorted(work_items, key=lambda item: estimates.get(item[1], float('inf')))
+
+    def describe(self):
+        used_tokens, used_cost = self.spent()
+        parts = []
+        if self.max_tokens:
+            parts.append(f"{used_tokens:,} of {self.max_tokens:,} tokens")
+        if self.max_cost:
+            parts.append(f"${used_cost:,.2f} of ${self.max_cost:,.2f}")
+        return ", ".join(parts)
@@ -0,0 +1,59 @@
+from collections import Counter
+
+
+class ProcessIndex:
+    """
+    In-memory folder and status bookkeeping for every process.
+
+    Keeps a folder_id -> process ids index and per-folder status counters,
+    updated on each add, status change and removal, so the dashboard and
+    folder operations never have to scan or query all processes.
+    """
+
+    def __init__(self, entries=()):
+        self.entries = {}  # process_id -> (folder_id, status)
+        self.folders = {}  # folder_id -> set of process ids
+        self.counts = {}  # folder_id -> Counter of statuses
+        for process_id, folder_id, status in entries:
+            self.add(process_id, folder_id, status)
+
+    def add(self, process_id, folder_id, status):
+        if process_id in self.entries:
+            self.remove(process_id)
+        self.entries[process_id] = (folder_id, status)
+        self.folders.setdefault(folder_id, set()).add(process_id)
+        self.counts.setdefault(folder_id, Counter())[status] += 1
+
+    def set_status(self, process_id, status):
+        entry = self.entries.get(process_id)
+        if entry is None or entry[1] == status:
+            return
+        folder_id, old_status = entry
+        counts = self.counts[folder_id]
+        counts[old_status] -= 1
+        if not counts[old_status]:
+            del counts[old_status]
+        counts[status] += 1
+        self.entries[process_id] = (folder_id, status)
+
+    def remove(self, process_id):
+        entry = self.entries.pop(process_id, None)
+        if entry is None:
+            return
+        folder_id, status = entry
+        self.folders[folder_id].discard(process_id)
+        counts = self.counts[folder_id]
+        counts[status] -= 1
+        if not counts[status]:
+            del counts[status]
+
+    def process_ids(self, folder_id):
+        """Ids of the processes in a folder (a copy, safe to iterate while deleting)"""
+        return set(self.folders.get(folder_id, ()))
+
+    def status_counts(self, folder_id):
+        """{status: count} for a folder"""
+        return self.counts.get(folder_id, Counter())
+
+    def folder_size(self, folder_id):
+        return len(self.folders.get(folder_id, ()))
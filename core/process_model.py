@@ -0,0 +1,325 @@
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QRectF, QSize, QEvent, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen, QLinearGradient
+
+from core.theme import PALETTES
+
+
+PROCESS_ROLE = Qt.ItemDataRole.UserRole
+STREAMING_ROLE = Qt.ItemDataRole.UserRole + 1
+
+ROW_HEIGHT = 212
+
+# (action, label, colour, hover colour, pressed colour)
+BUTTONS = [
+    ('pause', "⏸ Pause", '#F39C12', '#E67E22', '#D35400'),
+    ('resume', "▶ Resume", '#2ECC71', '#27AE60', '#219653'),
+    ('cancel', "⏹ Cancel", '#E74C3C', '#C0392B', '#A93226'),
+    ('delete', "🗑 Delete", '#C0392B', '#A93226', '#922B21'),
+    ('open_folder', "📂 Open Folder", '#3498DB', '#2980B9', '#21618C'),
+    ('view_logs', "📋 View Logs", '#9B59B6', '#8E44AD', '#7D3C98'),
+]
+
+
+class ProcessListModel(QAbstractListModel):
+    """
+    The processes of the current folder, for a QListView.
+
+    Rows refer to the shared process records by id; updates only emit
+    dataChanged for the affected row, so the view repaints just that row
+    (and only if it is visible).
+    """
+
+    def __init__(self, records, parent=None):
+        super().__init__(parent)
+        self.records = records  # process_id -> record, shared with MainWindow
+        self.process_ids = []
+        self.rows = {}  # process_id -> row
+        self.streaming = {}  # process_id -> {pdf_file: tokens}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.process_ids)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.process_ids):
+            return None
+        process_id = self.process_ids[index.row()]
+        record = self.records.get(process_id)
+        if record is None:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return record['name']
+        if role == PROCESS_ROLE:
+            return record
+        if role == STREAMING_ROLE:
+            return self.streaming.get(process_id, {})
+        return None
+
+    def set_processes(self, process_ids):
+        self.beginResetModel()
+        self.process_ids = list(process_ids)
+        self.rows = {process_id: row for row, process_id in enumerate(self.process_ids)}
+        self.streaming = {pid: files for pid, files in self.streaming.items() if pid in self.rows}
+        self.endResetModel()
+
+    def add_process(self, process_id):
+        if process_id in self.rows:
+            return
+        row = len(self.process_ids)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.process_ids.append(process_id)
+        self.rows[process_id] = row
+        self.endInsertRows()
+
+    def remove_process(self, process_id):
+        row = self.rows.get(process_id)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.process_ids[row]
+        self.rows = {pid: index for index, pid in enumerate(self.process_ids)}
+        self.streaming.pop(process_id, None)
+        self.endRemoveRows()
+
+    def refresh(self, process_id):
+        """Repaint one row after its record changed"""
+        row = self.rows.get(process_id)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+    def set_token_progress(self, process_id, pdf_file, tokens):
+        files = self.streaming.setdefault(process_id, {})
+        if tokens < 0:
+            files.pop(pdf_file, None)
+            if not files:
+                del self.streaming[process_id]
+        else:
+            files[pdf_file] = tokens
+        self.refresh(process_id)
+
+
+class ProcessDelegate(QStyledItemDelegate):
+    """
+    Paints a process card (status, progress, model, instruction and action
+    buttons) directly, instead of creating widgets per row, and turns clicks
+    on the painted buttons into signals.
+    """
+
+    pause_clicked = pyqtSignal(str)
+    resume_clicked = pyqtSignal(str)
+    cancel_clicked = pyqtSignal(str)
+    delete_clicked = pyqtSignal(str)
+    open_folder_clicked = pyqtSignal(str)
+    view_logs_clicked = pyqtSignal(str)
+
+    def __init__(self, theme='light', parent=None):
+        super().__init__(parent)
+        self.theme = theme
+        self.hovered = None  # (row, action) under the mouse
+        self.pressed = None  # (row, action) being clicked
+
+        self.name_font = QFont("Segoe UI", 11, QFont.Weight.Bold)
+        self.status_font = QFont("Segoe UI", 9, QFont.Weight.Bold)
+        self.small_bold_font = QFont("Segoe UI", 8, QFont.Weight.Bold)
+        self.small_font = QFont("Segoe UI", 8)
+        self.button_font = QFont("Segoe UI", 8, QFont.Weight.Bold)
+
+        metrics = QFontMetrics(self.button_font)
+        self.button_widths = {action: max(80, metrics.horizontalAdvance(label) + 24)
+                              for action, label, *_ in BUTTONS}
+
+    def set_theme(self, theme):
+        self.theme = theme
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def visible_buttons(self, record):
+        """Pause and resume share a slot depending on the status"""
+        hidden = 'pause' if record.get('status') == 'paused' else 'resume'
+        return [button for button in BUTTONS if button[0] != hidden]
+
+    def layout(self, rect, record):
+        """Rectangles of the card's parts within a row"""
+        card = rect.adjusted(8, 6, -8, -6)
+        inner = card.adjusted(12, 12, -12, -12)
+        x, width, y = inner.x(), inner.width(), inner.y()
+
+        parts = {'card': card}
+        parts['header'] = QRect(x, y, width, 24)
+        y += 30
+        parts['bar'] = QRect(x, y, width, 20)
+        y += 24
+        parts['progress_text'] = QRect(x, y, width, 16)
+        y += 18
+        parts['streaming'] = QRect(x, y, width, 14)
+        y += 16
+        parts['model'] = QRect(x, y, width, 14)
+        y += 20
+        parts['instruction'] = QRect(x, y, width, 26)
+        y += 34
+
+        buttons = {}
+        button_x = x
+        for action, *_ in self.visible_buttons(record):
+            buttons[action] = QRect(button_x, y, self.button_widths[action], 26)
+            button_x += self.button_widths[action] + 6
+        parts['buttons'] = buttons
+        return parts
+
+    def paint(self, painter, option, index):
+        record = index.data(PROCESS_ROLE)
+        if record is None:
+            return
+        colors = PALETTES.get(self.theme, PALETTES['light'])
+        parts = self.layout(option.rect, record)
+        row = index.row()
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        # Card
+        card = QRectF(parts['card'])
+        gradient = QLinearGradient(card.topLeft(), card.bottomLeft())
+        gradient.setColorAt(0, QColor(colors['card']))
+        gradient.setColorAt(1, QColor(colors['card_bottom']))
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        painter.setPen(QPen(QColor(colors['hover_border'] if hovered else colors['border']), 2))
+        painter.setBrush(gradient)
+        painter.drawRoundedRect(card, 8, 8)
+
+        # Header: name and status badge
+        status = record.get('status', 'pending')
+        text_color, badge_bg, badge_border = colors['status'].get(status, colors['status']['pending'])
+        painter.setFont(self.status_font)
+        status_text = status.upper()
+        badge_width = painter.fontMetrics().horizontalAdvance(status_text) + 16
+        header = parts['header']
+        badge = QRect(header.right() - badge_width, header.y(), badge_width, header.height())
+        painter.setPen(QPen(QColor(badge_border), 1))
+        painter.setBrush(QColor(badge_bg))
+        painter.drawRoundedRect(QRectF(badge), 4, 4)
+        painter.setPen(QColor(text_color))
+        painter.drawText(badge, Qt.AlignmentFlag.AlignCenter, status_text)
+
+        painter.setFont(self.name_font)
+        painter.setPen(QColor(colors['name']))
+        name_rect = QRect(header.x(), header.y(), header.width() - badge_width - 10, header.height())
+        painter.drawText(name_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                         painter.fontMetrics().elidedText(record['name'], Qt.TextElideMode.ElideRight,
+                                                          name_rect.width()))
+
+        # Progress bar
+        current, total = record.get('current', 0), record.get('total', 0)
+        percent = int(current / total * 100) if total else record.get('progress', 0)
+        bar = QRectF(parts['bar'])
+        painter.setPen(QPen(QColor(colors['border']), 1))
+        painter.setBrush(QColor(colors['bar_bg']))
+        painter.drawRoundedRect(bar, 6, 6)
+        if percent > 0:
+            chunk = QRectF(bar.x() + 1, bar.y() + 1, (bar.width() - 2) * min(percent, 100) / 100, bar.height() - 2)
+            fill = QLinearGradient(bar.topLeft(), bar.topRight())
+            fill.setColorAt(0, QColor('#3498DB'))
+            fill.setColorAt(1, QColor('#2ECC71'))
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(fill)
+            painter.drawRoundedRect(chunk, 5, 5)
+        painter.setPen(QColor(colors['bar_text']))
+        painter.setFont(self.small_bold_font)
+        painter.drawText(parts['bar'], Qt.AlignmentFlag.AlignCenter, f"{percent}%")
+
+        align = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+        painter.setPen(QColor(colors['progress_text']))
+        painter.drawText(parts['progress_text'], align, f"{current}/{total} files")
+
+        # Live token counts for files whose responses are being streamed
+        streaming = index.data(STREAMING_ROLE)
+        if streaming:
+            painter.setFont(self.small_font)
+            painter.setPen(QColor(colors['streaming']))
+            text = "✍ " + "  |  ".join(f"{name}: {count} tokens" for name, count in streaming.items())
+            painter.drawText(parts['streaming'], align, painter.fontMetrics().elidedText(
+                text, Qt.TextElideMode.ElideRight, parts['streaming'].width()))
+
+        painter.setFont(self.small_bold_font)
+        painter.setPen(QColor(colors['model']))
+        painter.drawText(parts['model'], align, painter.fontMetrics().elidedText(
+            f"Model: {record.get('model_name', 'N/A')}", Qt.TextElideMode.ElideRight, parts['model'].width()))
+
+        # Instruction preview
+        instruction = parts['instruction']
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(colors['instruction_bg']))
+        painter.drawRoundedRect(QRectF(instruction), 4, 4)
+        painter.setBrush(QColor('#3498DB'))
+        painter.drawRect(QRect(instruction.x(), instruction.y(), 3, instruction.height()))
+        painter.setFont(self.small_font)
+        painter.setPen(QColor(colors['instruction']))
+        text_rect = instruction.adjusted(9, 0, -6, 0)
+        preview = " ".join(record.get('instruction', '').split())
+        painter.drawText(text_rect, align, painter.fontMetrics().elidedText(
+            f"Instruction: {preview}", Qt.TextElideMode.ElideRight, text_rect.width()))
+
+        # Buttons
+        painter.setFont(self.button_font)
+        for action, label, color, hover_color, pressed_color in self.visible_buttons(record):
+            rect = parts['buttons'][action]
+            if self.pressed == (row, action):
+                fill = pressed_color
+            elif self.hovered == (row, action):
+                fill = hover_color
+            else:
+                fill = color
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(fill))
+            painter.drawRoundedRect(QRectF(rect), 4, 4)
+            painter.setPen(QColor('white'))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, label)
+
+        painter.restore()
+
+    def button_at(self, option, index, pos):
+        record = index.data(PROCESS_ROLE)
+        if record is None:
+            return None
+        for action, rect in self.layout(option.rect, record)['buttons'].items():
+            if rect.contains(pos):
+                return action
+        return None
+
+    def repaint(self, option):
+        """Button hover and press states are drawn by us, so the view must be told to repaint"""
+        if option.widget is not None:
+            option.widget.viewport().update()
+
+    def editorEvent(self, event, model, option, index):
+        event_type = event.type()
+        if event_type not in (QEvent.Type.MouseMove, QEvent.Type.MouseButtonPress,
+                              QEvent.Type.MouseButtonRelease):
+            return False
+
+        action = self.button_at(option, index, event.position().toPoint())
+        target = (index.row(), action) if action else None
+
+        if event_type == QEvent.Type.MouseMove:
+            if target != self.hovered:
+                self.hovered = target
+                self.repaint(option)
+            return False
+
+        if event.button() != Qt.MouseButton.LeftButton:
+            return False
+
+        if event_type == QEvent.Type.MouseButtonPress:
+            self.pressed = target
+            self.repaint(option)
+            return target is not None
+
+        pressed, self.pressed = self.pressed, None
+        self.repaint(option)
+        if target is not None and target == pressed:
+            process_id = index.data(PROCESS_ROLE)['id']
+            getattr(self, f"{action}_clicked").emit(process_id)
+            return True
+        return False
@@ -0,0 +1,69 @@
+import time
+import random
+from email.utils import parsedate_to_datetime
+
+
+DEFAULT_MAX_RETRIES = 5
+BASE_DELAY = 2.0
+MAX_DELAY = 120.0
+
+# HTTP statuses worth retrying; 429 and 503 also mean the provider is throttling
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+THROTTLING_STATUS_CODES = {429, 503}
+
+# Exceptions without a status code that are still transient: openai's connection
+# errors and the httpx transport errors that can surface mid-stream
+RETRYABLE_ERROR_NAMES = {'APIConnectionError', 'APITimeoutError', 'TransportError'}
+
+
+def status_code_of(error):
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status
+
+
+def retry_after_of(error):
+    """Seconds requested by the server's Retry-After (or retry-after-ms) header, if any"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if not headers:
+        return None
+
+    value = headers.get('retry-after-ms')
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+
+    value = headers.get('retry-after')
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(error):
+    """Returns (retryable, throttled) for an exception raised by an API call"""
+    status = status_code_of(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES, status in THROTTLING_STATUS_CODES
+    retryable = (any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+                 or isinstance(error, (ConnectionError, TimeoutError)))
+    return retryable, False
+
+
+def backoff_delay(attempt, retry_after=None, base_delay=BASE_DELAY, max_delay=MAX_DELAY):
+    """
+    Delay before retry number `attempt` (0-based): full-jitter exponential
+    backoff, or the server's Retry-After plus a little jitter when given.
+    """
+    if retry_after is not None:
+        return min(max_delay, retry_after) + random.uniform(0, 1)
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
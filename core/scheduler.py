@@ -0,0 +1,271 @@
+import time
+import asyncio
+import threading
+from collections import deque
+
+
+DEFAULT_GLOBAL_MAX_CONCURRENT_REQUESTS = 16
+
+
+def provider_for_model(model_name):
+    """Hugging Face router models name their provider after a colon, e.g. 'org/model:novita'"""
+    return model_name.rsplit(':', 1)[1] if ':' in model_name else 'default'
+
+
+class TokenBucket:
+    """Classic token bucket: refills at rate_per_minute, bursts up to capacity"""
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or max(1.0, float(rate_per_minute) / 6)  # ~10 s burst
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now):
+        """Seconds until one token is available (0 if available now)"""
+        self.refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+
+class AdaptiveLimit:
+    """
+    AIMD concurrency limit: halves when the provider throttles us (at most
+    once per cooldown, since a burst of in-flight requests usually fails
+    together) and grows by roughly one slot per window of successes.
+    """
+
+    def __init__(self, maximum, cooldown=5.0):
+        self.maximum = maximum
+        self.value = float(maximum)
+        self.cooldown = cooldown
+        self.last_decrease = 0.0
+
+    def on_throttled(self):
+        now = time.monotonic()
+        if now - self.last_decrease >= self.cooldown:
+            self.value = max(1.0, self.value / 2)
+            self.last_decrease = now
+
+    def on_success(self):
+        self.value = min(float(self.maximum), self.value + 1.0 / self.value)
+
+    def slots(self):
+        return int(self.value)
+
+
+class Ticket:
+    __slots__ = ('process_id', 'model_name', 'priority', 'granted', 'on_grant')
+
+    def __init__(self, process_id, model_name, priority, on_grant=None):
+        self.process_id = process_id
+        self.model_name = model_name
+        self.priority = priority
+        self.granted = False
+        self.on_grant = on_grant  # called (under the lock) when granted by another thread
+
+
+class JobScheduler:
+    """
+    Central gate for API requests from every running process.
+
+    Workers ask for a slot before each request. Slots are limited by a global
+    concurrency limit and by per-model and per-provider request rate limits
+    (token buckets), plus an adaptive per-provider limit that backs off when
+    the provider throttles and recovers as requests succeed. Waiting requests
+    are queued per process and granted by priority, round-robin between
+    processes of equal priority, so one large process cannot starve the others.
+    """
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.max_concurrent = DEFAULT_GLOBAL_MAX_CONCURRENT_REQUESTS
+        self.active = 0
+        self.waiting = {}  # process_id -> deque of Ticket
+        self.last_served = {}  # process_id -> grant counter, for round-robin
+        self.grant_counter = 0
+
+        self.model_rpm = 0
+        self.provider_rpm = 0
+        self.model_overrides = {}
+        self.buckets = {}  # ('model'|'provider', name) -> TokenBucket
+        self.provider_active = {}  # provider -> requests in flight
+        self.provider_limits = {}  # provider -> AdaptiveLimit
+
+    def configure(self, settings):
+        """Apply limits from the application settings (0 means unlimited)"""
+        with self.cond:
+            self.max_concurrent = max(1, int(settings.get('global_max_concurrent_requests',
+                                                          DEFAULT_GLOBAL_MAX_CONCURRENT_REQUESTS)))
+            self.model_rpm = int(settings.get('model_rate_limit_rpm', 0) or 0)
+            self.provider_rpm = int(settings.get('provider_rate_limit_rpm', 0) or 0)
+            self.model_overrides = dict(settings.get('model_rate_limits', {}))
+            self.buckets.clear()
+            for limit in self.provider_limits.values():
+                limit.maximum = self.max_concurrent
+                limit.value = min(limit.value, self.max_concurrent)
+            self.cond.notify_all()
+
+    def bucket(self, kind, name):
+        rpm = self.model_overrides.get(name, self.model_rpm) if kind == 'model' else self.provider_rpm
+        if not rpm:
+            return None
+        key = (kind, name)
+        if key not in self.buckets:
+            self.buckets[key] = TokenBucket(rpm)
+        return self.buckets[key]
+
+    def provider_limit(self, provider):
+        if provider not in self.provider_limits:
+            self.provider_limits[provider] = AdaptiveLimit(self.max_concurrent)
+        return self.provider_limits[provider]
+
+    def report_success(self, model_name):
+        with self.cond:
+            self.provider_limit(provider_for_model(model_name)).on_success()
+            self.dispatch()
+
+    def report_throttled(self, model_name):
+        """Called when a request was rejected with 429/503 or similar"""
+        with self.cond:
+            self.provider_limit(provider_for_model(model_name)).on_throttled()
+
+    def current_limit(self, model_name):
+        with self.cond:
+            return self.provider_limit(provider_for_model(model_name)).slots()
+
+    def acquire(self, process_id, model_name, priority=0, is_cancelled=None):
+        """
+        Block until a request slot is granted. Returns False (without a slot)
+        if is_cancelled() becomes true while waiting.
+        """
+        ticket = Ticket(process_id, model_name, priority)
+        with self.cond:
+            self.waiting.setdefault(process_id, deque()).append(ticket)
+            while True:
+                wait = self.dispatch()
+                if ticket.granted:
+                    return True
+                if is_cancelled is not None and is_cancelled():
+                    self.remove(ticket)
+                    self.dispatch()
+                    return False
+                # Wake up for rate limit refills and to poll for cancellation
+                self.cond.wait(timeout=min(wait, 0.5) if wait else 0.5)
+
+    async def acquire_async(self, process_id, model_name, priority=0, is_cancelled=None):
+        """
+        acquire() for coroutines: waits on the event loop instead of blocking a
+        thread. Slots released by other threads wake the waiter through the loop.
+        """
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        ticket = Ticket(process_id, model_name, priority,
+                        on_grant=lambda: loop.call_soon_threadsafe(event.set))
+        with self.cond:
+            self.waiting.setdefault(process_id, deque()).append(ticket)
+        try:
+            while True:
+                with self.cond:
+                    wait = self.dispatch()
+                    if ticket.granted:
+                        return True
+                    if is_cancelled is not None and is_cancelled():
+                        self.remove(ticket)
+                        self.dispatch()
+                        return False
+                # Wake up for rate limit refills and to poll for cancellation
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=min(wait, 0.5) if wait else 0.5)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            with self.cond:
+                if ticket.granted:
+                    self.active -= 1
+                    provider = provider_for_model(model_name)
+                    self.provider_active[provider] = self.provider_active.get(provider, 1) - 1
+                else:
+                    self.remove(ticket)
+                self.dispatch()
+            raise
+
+    def release(self, model_name):
+        with self.cond:
+            self.active -= 1
+            provider = provider_for_model(model_name)
+            self.provider_active[provider] = self.provider_active.get(provider, 1) - 1
+            self.dispatch()
+
+    def remove(self, ticket):
+        queue = self.waiting.get(ticket.process_id)
+        if queue and ticket in queue:
+            queue.remove(ticket)
+            if not queue:
+                del self.waiting[ticket.process_id]
+
+    def dispatch(self):
+        """
+        Grant as many queued tickets as the limits allow; caller holds the lock.
+        Returns the shortest rate limit wait among blocked tickets (0 if none).
+        """
+        shortest_wait = 0.0
+        granted_any = False
+        while self.active < self.max_concurrent and self.waiting:
+            now = time.monotonic()
+            # Highest priority first, then whichever process was served longest ago
+            order = sorted(self.waiting, key=lambda pid: (-self.waiting[pid][0].priority,
+                                                          self.last_served.get(pid, -1)))
+            granted = None
+            for process_id in order:
+                ticket = self.waiting[process_id][0]
+                provider = provider_for_model(ticket.model_name)
+                if self.provider_active.get(provider, 0) >= self.provider_limit(provider).slots():
+                    continue
+                buckets = [b for b in (self.bucket('model', ticket.model_name),
+                                       self.bucket('provider', provider)) if b]
+                wait = max((b.wait_time(now) for b in buckets), default=0.0)
+                if wait > 0:
+                    shortest_wait = wait if not shortest_wait else min(shortest_wait, wait)
+                    continue
+                for b in buckets:
+                    b.take()
+                granted = ticket
+                break
+
+            if granted is None:
+                break
+
+            self.remove(granted)
+            granted.granted = True
+            if granted.on_grant is not None:
+                granted.on_grant()
+            self.active += 1
+            provider = provider_for_model(granted.model_name)
+            self.provider_active[provider] = self.provider_active.get(provider, 0) + 1
+            self.grant_counter += 1
+            self.last_served[granted.process_id] = self.grant_counter
+            granted_any = True
+
+        if granted_any:
+            self.cond.notify_all()
+        return shortest_wait
+
+    def forget(self, process_id):
+        """Drop round-robin bookkeeping for a finished process"""
+        with self.cond:
+            self.last_served.pop(process_id, None)
+
+
+_scheduler = JobScheduler()
+
+
+def get_scheduler():
+    """Returns the scheduler shared by all workers"""
+    return _scheduler
@@ -0,0 +1,133 @@
+import os
+import sys
+import time
+import builtins
+import threading
+
+
+STARTUP_REPORT_FLAG = '--startup-report'
+STARTUP_REPORT_ENV = 'PDF_MANAGER_STARTUP_REPORT'
+STARTUP_LOG_FILE = os.path.join("saves", "logs", "startup.log")
+REPORT_TOP_IMPORTS = 25
+
+# Loaded after the window is shown instead of at startup
+PREWARM_MODULES = ('httpx', 'openai')
+
+
+class ImportTimer:
+    """
+    Times every first import made through the import statement, like
+    `python -X importtime`: cumulative time per module, and self time with
+    nested imports subtracted. Installed by wrapping builtins.__import__.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.records = {}  # module name -> [self_seconds, cumulative_seconds]
+        self.original_import = None
+
+    def install(self):
+        if self.original_import is None:
+            self.original_import = builtins.__import__
+            builtins.__import__ = self.timed_import
+
+    def uninstall(self):
+        if self.original_import is not None:
+            builtins.__import__ = self.original_import
+            self.original_import = None
+
+    def timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Relative and already loaded imports cost (almost) nothing; skip the bookkeeping
+        if level or name in sys.modules:
+            return self.original_import(name, globals, locals, fromlist, level)
+
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        stack.append(0.0)  # time spent in nested imports
+        start = time.perf_counter()
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self.lock:
+                self.records[name] = [elapsed - nested, elapsed]
+
+    def slowest(self, count):
+        """[(name, self_seconds, cumulative_seconds)] sorted by cumulative time"""
+        with self.lock:
+            items = [(name, own, total) for name, (own, total) in self.records.items()]
+        return sorted(items, key=lambda item: -item[2])[:count]
+
+
+class StartupProfile:
+    """Startup phase timings and the optional import-time report"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = []  # (label, seconds since start)
+        self.import_timer = None
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.import_timer is not None
+
+    def begin(self, argv):
+        """Call first thing in main.py; enables the report when asked for on the command line or environment"""
+        if STARTUP_REPORT_FLAG in argv:
+            argv.remove(STARTUP_REPORT_FLAG)
+        elif not os.environ.get(STARTUP_REPORT_ENV):
+            return
+        self.import_timer = ImportTimer()
+        self.import_timer.install()
+
+    def mark(self, label):
+        with self.lock:
+            self.phases.append((label, time.perf_counter() - self.start))
+
+    def report(self):
+        lines = ["Startup timing:"]
+        with self.lock:
+            phases = list(self.phases)
+        for label, seconds in phases:
+            lines.append(f"  {seconds * 1000:8.1f} ms  {label}")
+        if self.import_timer is not None:
+            lines.append("Slowest imports (self ms | cumulative ms | module):")
+            for name, own, total in self.import_timer.slowest(REPORT_TOP_IMPORTS):
+                lines.append(f"  {own * 1000:8.1f} | {total * 1000:8.1f} | {name}")
+        return "\n".join(lines)
+
+    def finish(self):
+        """Prints and saves the report, if enabled, and stops timing imports"""
+        if not self.enabled:
+            return
+        self.import_timer.uninstall()
+        text = self.report()
+        print(text, file=sys.stderr)
+        try:
+            os.makedirs(os.path.dirname(STARTUP_LOG_FILE), exist_ok=True)
+            with open(STARTUP_LOG_FILE, 'w', encoding='utf-8') as f:
+                f.write(text + "\n")
+        except OSError as e:
+            print(f"Error saving startup report: {e}")
+
+    def prewarm(self, modules=PREWARM_MODULES):
+        """Imports heavy modules on a background thread once the window is up"""
+        def run():
+            for name in modules:
+                try:
+                    __import__(name)
+                except Exception as e:
+                    print(f"Error pre-loading {name}: {e}")
+            self.mark("background pre-warm finished")
+            self.finish()
+
+        threading.Thread(target=run, name="prewarm", daemon=True).start()
+
+
+startup = StartupProfile()
@@ -0,0 +1,43 @@
+from PyQt6.QtCore import QObject, QTimer
+
+
+class StateStore(QObject):
+    """
+    Debounced persistence of the in-memory process records to the database.
+
+    Changes are only marked here; they are written together in one
+    transaction once the timer fires, so a burst of progress updates costs a
+    single write, and only the records that changed are serialized.
+    """
+
+    def __init__(self, database, records, delay_ms=1000, parent=None):
+        super().__init__(parent)
+        self.db = database
+        self.records = records
+        self.dirty = set()
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.flush)
+
+    def mark_dirty(self, record_id):
+        """Schedule a write for a record that was added, changed or removed"""
+        self.dirty.add(record_id)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        """Write pending changes now"""
+        self.timer.stop()
+        if not self.dirty:
+            return
+
+        changed = [self.records[record_id] for record_id in self.dirty if record_id in self.records]
+        deleted = [record_id for record_id in self.dirty if record_id not in self.records]
+        self.dirty.clear()
+
+        try:
+            self.db.save_processes(changed, deleted)
+        except Exception as e:
+            print(f"Error saving processes: {e}")
@@ -0,0 +1,1058 @@
+from PyQt6.QtWidgets import QApplication
+
+
+# Colours of the painted process cards and the status styles; status entries are (text, background, border)
+PALETTES = {
+    'dark': {
+        'card': '#34495E', 'card_bottom': '#2C3E50', 'border': '#5D6D7E', 'hover_border': '#3498DB',
+        'name': '#ECF0F1', 'progress_text': '#BDC3C7', 'streaming': '#5DADE2', 'model': '#BDC3C7',
+        'instruction': '#AEB6BF', 'instruction_bg': '#2C3E50', 'bar_bg': '#2C3E50', 'bar_text': '#ECF0F1',
+        'status': {
+            'pending': ('#F39C12', '#2C3E50', '#F1C40F'),
+            'queued': ('#F39C12', '#2C3E50', '#F1C40F'),
+            'running': ('#3498DB', '#2C3E50', '#5DADE2'),
+            'completed': ('#27AE60', '#2C3E50', '#58D68D'),
+            'failed': ('#E74C3C', '#2C3E50', '#F1948A'),
+            'cancelled': ('#95A5A6', '#2C3E50', '#BDC3C7'),
+            'paused': ('#8E44AD', '#2C3E50', '#BB8FCE'),
+        },
+    },
+    'light': {
+        'card': '#FFFFFF', 'card_bottom': '#F8F9FA', 'border': '#BDC3C7', 'hover_border': '#3498DB',
+        'name': '#2C3E50', 'progress_text': '#7F8C8D', 'streaming': '#2E86C1', 'model': '#34495E',
+        'instruction': '#5D6D7E', 'instruction_bg': '#F2F4F4', 'bar_bg': '#ECF0F1', 'bar_text': '#2C3E50',
+        'status': {
+            'pending': ('#F39C12', '#FEF9E7', '#F1C40F'),
+            'queued': ('#F39C12', '#FEF9E7', '#F1C40F'),
+            'running': ('#3498DB', '#EBF5FB', '#5DADE2'),
+            'completed': ('#27AE60', '#EAFAF1', '#58D68D'),
+            'failed': ('#E74C3C', '#FDEDEC', '#F1948A'),
+            'cancelled': ('#95A5A6', '#F4F6F6', '#BDC3C7'),
+            'paused': ('#8E44AD', '#F4ECF7', '#BB8FCE'),
+        },
+    },
+}
+
+
+# Main window and anything without more specific rules
+MAIN_WINDOW = {
+    'dark': """
+    QMainWindow {
+        background-color: #0a0a0a;
+    }
+    QWidget#centralWidget {
+        background-color: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+                                          stop:0 #0a0a0a, stop:1 #1a1a1a);
+    }
+    QLabel {
+        color: #e0e0e0;
+    }
+    QLineEdit, QTextEdit {
+        background-color: #2a2a2a;
+        color: #e0e0e0;
+        border: 1px solid #404040;
+        border-radius: 4px;
+        padding: 6px;
+        selection-background-color: #3498DB;
+    }
+    QLineEdit:focus, QTextEdit:focus {
+        border: 2px solid #3498DB;
+    }
+    QTextEdit {
+        font-family: 'Segoe UI', Arial;
+    }
+    QListWidget {
+        background-color: #2a2a2a;
+        color: #e0e0e0;
+        border: 1px solid #404040;
+        border-radius: 6px;
+        padding: 5px;
+    }
+    QListWidget::item {
+        padding: 8px;
+        border-bottom: 1px solid #333333;
+    }
+    QListWidget::item:selected {
+        background-color: #3498DB;
+        color: white;
+        border-radius: 4px;
+    }
+    QListWidget::item:hover {
+        background-color: #3a3a3a;
+        border-radius: 4px;
+    }
+    QScrollArea {
+        border: none;
+        background-color: transparent;
+    }
+    QScrollBar:vertical {
+        background-color: #1a1a1a;
+        width: 12px;
+        border-radius: 6px;
+    }
+    QScrollBar::handle:vertical {
+        background-color: #404040;
+        border-radius: 6px;
+        min-height: 20px;
+    }
+    QScrollBar::handle:vertical:hover {
+        background-color: #505050;
+    }
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+        height: 0px;
+    }
+    QGroupBox#statsGroup {
+        font-weight: bold;
+        border: 2px solid #404040;
+        border-radius: 8px;
+        padding-top: 10px;
+        background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                                          stop:0 #2a2a2a, stop:1 #1a1a1a);
+        color: #e0e0e0;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 10px 0 10px;
+        color: #e0e0e0;
+    }
+    QLabel#statsLabel {
+        padding: 10px;
+        background-color: #151515;
+        border-radius: 6px;
+        border: 1px solid #404040;
+        min-width: 150px;
+        text-align: center;
+    }
+    QPushButton#newProcessButton {
+        background-color: #2ECC71;
+        color: white;
+        border: none;
+        padding: 12px 24px;
+        border-radius: 6px;
+        font-weight: bold;
+        font-size: 12px;
+    }
+    QPushButton#newProcessButton:hover {
+        background-color: #27AE60;
+    }
+    QPushButton#newProcessButton:pressed {
+        background-color: #219653;
+    }
+    QPushButton#newFolderButton {
+        background-color: #3498DB;
+        color: white;
+        border: none;
+        padding: 12px 24px;
+        border-radius: 6px;
+        font-weight: bold;
+        font-size: 12px;
+    }
+    QPushButton#newFolderButton:hover {
+        background-color: #2980B9;
+    }
+    QPushButton#newFolderButton:pressed {
+        background-color: #21618C;
+    }
+    QPushButton#settingsButton, QPushButton#analyticsButton {
+        background-color: #9B59B6;
+        color: white;
+        border: none;
+        padding: 12px 24px;
+        border-radius: 6px;
+        font-weight: bold;
+        font-size: 12px;
+    }
+    QPushButton#settingsButton:hover, QPushButton#analyticsButton:hover {
+        background-color: #8E44AD;
+    }
+    QPushButton#settingsButton:pressed, QPushButton#analyticsButton:pressed {
+        background-color: #7D3C98;
+    }
+    QPushButton#deleteFolderButton {
+        background-color: #E74C3C;
+        color: white;
+        border: none;
+        padding: 10px;
+        border-radius: 6px;
+        font-weight: bold;
+    }
+    QPushButton#deleteFolderButton:hover {
+        background-color: #C0392B;
+    }
+    QPushButton#deleteFolderButton:pressed {
+        background-color: #A93226;
+    }
+    QWidget#folderWidget {
+        background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                                          stop:0 #2a2a2a, stop:1 #1a1a1a);
+        border-radius: 8px;
+    }
+    QWidget#processWidget {
+        background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                                          stop:0 #2a2a2a, stop:1 #1a1a1a);
+        border-radius: 8px;
+    }
+    QWidget#processContainer {
+        background-color: #151515;
+    }
+    QLabel#folderHeader, QLabel#currentFolderLabel {
+        color: #e0e0e0;
+        padding: 10px;
+        background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                                          stop:0 #2a2a2a, stop:1 #1a1a1a);
+        border-radius: 6px;
+        border: 2px solid #404040;
+    }
+    QSplitter#contentSplitter::handle {
+        background-color: #404040;
+        width: 3px;
+    }
+    QSplitter#contentSplitter::handle:hover {
+        background-color: #3498DB;
+    }
+""",
+    'light': """
+    QMainWindow {
+        background-color: #ECF0F1;
+    }
+    QWidget#centralWidget {
+        background-color: #ECF0F1;
+    }
+    QLabel {
+        color: #2C3E50;
+    }
+    QLineEdit, QTextEdit {
+        background-color: #FFFFFF;
+        border: 1px solid #BDC3C7;
+        border-radius: 4px;
+        padding: 6px;
+        selection-background-color: #3498DB;
+    }
+    QLineEdit:focus, QTextEdit:focus {
+        border: 2px solid #3498DB;
+    }
+    QTextEdit {
+        font-family: 'Segoe UI', Arial;
+    }
+    QListWidget {
+        background-color: #FFFFFF;
+        border: 1px solid #BDC3C7;
+        border-radius: 6px;
+        padding: 5px;
+    }
+    QListWidget::item {
+        padding: 8px;
+        border-bottom: 1px solid #ECF0F1;
+    }
+    QListWidget::item:selected {
+        background-color: #3498DB;
+        color: white;
+        border-radius: 4px;
+    }
+    QListWidget::item:hover {
+        background-color: #D6EAF8;
+        border-radius: 4px;
+    }
+    QScrollArea {
+        border: none;
+        background-color: transparent;
+    }
+    QScrollBar:vertical {
+        background-color: #ECF0F1;
+        width: 12px;
+        border-radius: 6px;
+    }
+    QScrollBar::handle:vertical {
+        background-color: #95A5A6;
+        border-radius: 6px;
+        min-height: 20px;
+    }
+    QScrollBar::handle:vertical:hover {
+        background-color: #7F8C8D;
+    }
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+        height: 0px;
+    }
+    QGroupBox#statsGroup {
+        font-weight: bold;
+        border: 2px solid #7F8C8D;
+        border-radius: 8px;
+        padding-top: 10px;
+        background-color: #FFFFFF;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 10px 0 10px;
+        color: #2C3E50;
+    }
+    QLabel#statsLabel {
+        padding: 10px;
+        background-color: #F8F9FA;
+        border-radius: 6px;
+        border: 1px solid #BDC3C7;
+        min-width: 150px;
+        text-align: center;
+    }
+    QPushButton#newProcessButton {
+        background-color: #2ECC71;
+        color: white;
+        border: none;
+        padding: 12px 24px;
+        border-radius: 6px;
+        font-weight: bold;
+        font-size: 12px;
+    }
+    QPushButton#newProcessButton:hover {
+        background-color: #27AE60;
+    }
+    QPushButton#newProcessButton:pressed {
+        background-color: #219653;
+    }
+    QPushButton#newFolderButton {
+        background-color: #3498DB;
+        color: white;
+        border: none;
+        padding: 12px 24px;
+        border-radius: 6px;
+        font-weight: bold;
+        font-size: 12px;
+    }
+    QPushButton#newFolderButton:hover {
+        background-color: #2980B9;
+    }
+    QPushButton#newFolderButton:pressed {
+        background-color: #21618C;
+    }
+    QPushButton#settingsButton, QPushButton#analyticsButton {
+        background-color: #9B59B6;
+        color: white;
+        border: none;
+        padding: 12px 24px;
+        border-radius: 6px;
+        font-weight: bold;
+        font-size: 12px;
+    }
+    QPushButton#settingsButton:hover, QPushButton#analyticsButton:hover {
+        background-color: #8E44AD;
+    }
+    QPushButton#settingsButton:pressed, QPushButton#analyticsButton:pressed {
+        background-color: #7D3C98;
+    }
+    QPushButton#deleteFolderButton {
+        background-color: #E74C3C;
+        color: white;
+        border: none;
+        padding: 10px;
+        border-radius: 6px;
+        font-weight: bold;
+    }
+    QPushButton#deleteFolderButton:hover {
+        background-color: #C0392B;
+    }
+    QPushButton#deleteFolderButton:pressed {
+        background-color: #A93226;
+    }
+    QWidget#folderWidget {
+        background-color: #F8F9FA;
+        border-radius: 8px;
+    }
+    QWidget#processWidget {
+        background-color: #FFFFFF;
+        border-radius: 8px;
+    }
+    QWidget#processContainer {
+        background-color: #ECF0F1;
+    }
+    QLabel#folderHeader, QLabel#currentFolderLabel {
+        color: #2C3E50;
+        padding: 10px;
+        background-color: #F8F9FA;
+        border-radius: 6px;
+        border: 2px solid #BDC3C7;
+    }
+    QSplitter#contentSplitter::handle {
+        background-color: #BDC3C7;
+        width: 3px;
+    }
+    QSplitter#contentSplitter::handle:hover {
+        background-color: #3498DB;
+    }
+""",
+}
+
+# Create New Folder dialog
+NEW_FOLDER_DIALOG = {
+    'dark': """
+    QDialog#newFolderDialog {
+        background-color: #0a0a0a;
+    }
+    QDialog#newFolderDialog QLabel {
+        color: #e0e0e0;
+    }
+    QDialog#newFolderDialog QLineEdit#folderNameInput {
+        padding: 10px;
+        border: 2px solid #404040;
+        border-radius: 6px;
+        background-color: #2a2a2a;
+        color: #e0e0e0;
+        font-size: 12px;
+    }
+    QDialog#newFolderDialog QLineEdit#folderNameInput:focus {
+        border: 2px solid #3498DB;
+    }
+    QDialog#newFolderDialog QPushButton#createFolderButton {
+        background-color: #2ECC71;
+        color: white;
+        border: none;
+        padding: 10px 25px;
+        border-radius: 6px;
+        font-weight: bold;
+    }
+    QDialog#newFolderDialog QPushButton#createFolderButton:hover {
+        background-color: #27AE60;
+    }
+    QDialog#newFolderDialog QPushButton#createFolderButton:pressed {
+        background-color: #219653;
+    }
+    QDialog#newFolderDialog QPushButton#cancelFolderButton {
+        background-color: #505050;
+        color: white;
+        border: none;
+        padding: 10px 25px;
+        border-radius: 6px;
+        font-weight: bold;
+    }
+    QDialog#newFolderDialog QPushButton#cancelFolderButton:hover {
+        background-color: #606060;
+    }
+    QDialog#newFolderDialog QPushButton#cancelFolderButton:pressed {
+        background-color: #707070;
+    }
+""",
+    'light': """
+    QDialog#newFolderDialog {
+        background-color: #ECF0F1;
+    }
+    QDialog#newFolderDialog QLabel {
+        color: #2C3E50;
+    }
+    QDialog#newFolderDialog QLineEdit#folderNameInput {
+        padding: 10px;
+        border: 2px solid #BDC3C7;
+        border-radius: 6px;
+        background-color: #FFFFFF;
+        font-size: 12px;
+    }
+    QDialog#newFolderDialog QLineEdit#folderNameInput:focus {
+        border: 2px solid #3498DB;
+    }
+    QDialog#newFolderDialog QPushButton#createFolderButton {
+        background-color: #2ECC71;
+        color: white;
+        border: none;
+        padding: 10px 25px;
+        border-radius: 6px;
+        font-weight: bold;
+    }
+    QDialog#newFolderDialog QPushButton#createFolderButton:hover {
+        background-color: #27AE60;
+    }
+    QDialog#newFolderDialog QPushButton#createFolderButton:pressed {
+        background-color: #219653;
+    }
+    QDialog#newFolderDialog QPushButton#cancelFolderButton {
+        background-color: #95A5A6;
+        color: white;
+        border: none;
+        padding: 10px 25px;
+        border-radius: 6px;
+        font-weight: bold;
+    }
+    QDialog#newFolderDialog QPushButton#cancelFolderButton:hover {
+        background-color: #7F8C8D;
+    }
+    QDialog#newFolderDialog QPushButton#cancelFolderButton:pressed {
+        background-color: #6C7B7D;
+    }
+""",
+}
+
+# Create New Process dialog
+NEW_PROCESS_DIALOG = {
+    'dark': """
+    QDialog#newProcessDialog {
+        background-color: #0a0a0a;
+    }
+    QDialog#newProcessDialog QLabel {
+        color: #e0e0e0;
+        font-weight: bold;
+    }
+    QDialog#newProcessDialog QLineEdit#processNameInput,
+    QDialog#newProcessDialog QLineEdit#modelInput {
+        padding: 10px;
+        border: 2px solid #404040;
+        border-radius: 6px;
+        background-color: #2a2a2a;
+        color: #e0e0e0;
+        font-size: 12px;
+    }
+    QDialog#newProcessDialog QLineEdit#processNameInput:focus,
+    QDialog#newProcessDialog QLineEdit#modelInput:focus {
+        border: 2px solid #3498DB;
+    }
+    QDialog#newProcessDialog QSpinBox#concurrencyInput,
+    QDialog#newProcessDialog QSpinBox#priorityInput,
+    QDialog#newProcessDialog QSpinBox#tokenBudgetInput,
+    QDialog#newProcessDialog QDoubleSpinBox#costBudgetInput {
+        padding: 6px;
+        border: 2px solid #404040;
+        border-radius: 6px;
+        background-color: #2a2a2a;
+        color: #e0e0e0;
+        font-size: 12px;
+    }
+    QDialog#newProcessDialog QCheckBox#reuseCacheInput,
+    QDialog#newProcessDialog QCheckBox#streamInput {
+        color: #e0e0e0;
+        font-weight: bold;
+    }
+    QDialog#newProcessDialog QLineEdit#pdfFolderInput {
+        padding: 10px;
+        border: 2px solid #404040;
+        border-radius: 6px;
+        background-color: #1a1a1a;
+        font-size: 12px;
+        color: #a0a0a0;
+    }
+    QDialog#newProcessDialog QTextEdit#instructionInput {
+        padding: 10px;
+        border: 2px solid #404040;
+        border-radius: 6px;
+        background-color: #2a2a2a;
+        font-size: 12px;
+        color: #e0e0e0;
+    }
+    QDialog#newProcessDialog QTextEdit#instructionInput:focus {
+        border: 2px solid #3498DB;
+    }
+    QDialog#newProcessDialog QPushButton#browseButton {
+        background-color: #3498DB;
+        color: white;
+        border: none;
+        padding: 10px 20px;
+        border-radius: 6px;
+        font-weight: bold;
+    }
+    QDialog#newProcessDialog QPushButton#browseButton:hover {
+        background-color: #2980B9;
+    }
+    QDialog#newProcessDialog QPushButton#browseButton:pressed {
+        background-color: #21618C;
+    }
+    QDialog#newProcessDialog QPushButton#createProcessButton {
+        background-color: #2ECC71;
+        color: white;
+        border: none;
+        padding: 12px 30px;
+        border-radius: 6px;
+        font-weight: bold;
+        font-size: 12px;
+    }
+    QDialog#newProcessDialog QPushButton#createProcessButton:hover {
+        background-color: #27AE60;
+    }
+    QDialog#newProcessDialog QPushButton#createProcessButton:pressed {
+        background-color: #219653;
+    }
+    QDialog#newProcessDialog QPushButton#cancelProcessButton {
+        background-color: #505050;
+        color: white;
+        border: none;
+        padding: 12px 30px;
+        border-radius: 6px;
+        font-weight: bold;
+        font-size: 12px;
+    }
+    QDialog#newProcessDialog QPushButton#cancelProcessButton:hover {
+        background-color: #606060;
+    }
+    QDialog#newProcessDialog QPushButton#cancelProcessButton:pressed {
+        background-color: #707070;
+    }
+""",
+    'light': """
+    QDialog#newProcessDialog {
+        background-color: #ECF0F1;
+    }
+    QDialog#newProcessDialog QLabel {
+        color: #2C3E50;
+        font-weight: bold;
+    }
+    QDialog#newProcessDialog QLineEdit#processNameInput,
+    QDialog#newProcessDialog QLineEdit#modelInput {
+        padding: 10px;
+        border: 2px solid #BDC3C7;
+        border-radius: 6px;
+        background-color: #FFFFFF;
+        font-size: 12px;
+    }
+    QDialog#newProcessDialog QLineEdit#processNameInput:focus,
+    QDialog#newProcessDialog QLineEdit#modelInput:focus {
+        border: 2px solid #3498DB;
+    }
+    QDialog#newProcessDialog QSpinBox#concurrencyInput,
+    QDialog#newProcessDialog QSpinBox#priorityInput,
+    QDialog#newProcessDialog QSpinBox#tokenBudgetInput,
+    QDialog#newProcessDialog QDoubleSpinBox#costBudgetInput {
+        padding: 6px;
+        border: 2px solid #BDC3C7;
+        border-radius: 6px;
+        background-color: #FFFFFF;
+        font-size: 12px;
+    }
+    QDialog#newProcessDialog QCheckBox#reuseCacheInput,
+    QDialog#newProcessDialog QCheckBox#streamInput {
+        color: #2C3E50;
+        font-weight: bold;
+    }
+    QDialog#newProcessDialog QLineEdit#pdfFolderInput {
+        padding: 10px;
+        border: 2px solid #BDC3C7;
+        border-radius: 6px;
+        background-color: #F8F9FA;
+        font-size: 12px;
+        color: #7F8C8D;
+    }
+    QDialog#newProcessDialog QTextEdit#instructionInput {
+        padding: 10px;
+        border: 2px solid #BDC3C7;
+        border-radius: 6px;
+        background-color: #FFFFFF;
+        font-size: 12px;
+    }
+    QDialog#newProcessDialog QTextEdit#instructionInput:focus {
+        border: 2px solid #3498DB;
+    }
+    QDialog#newProcessDialog QPushButton#browseButton {
+        background-color: #3498DB;
+        color: white;
+        border: none;
+        padding: 10px 20px;
+        border-radius: 6px;
+        font-weight: bold;
+    }
+    QDialog#newProcessDialog QPushButton#browseButton:hover {
+        background-color: #2980B9;
+    }
+    QDialog#newProcessDialog QPushButton#browseButton:pressed {
+        background-color: #21618C;
+    }
+    QDialog#newProcessDialog QPushButton#createProcessButton {
+        background-color: #2ECC71;
+        color: white;
+        border: none;
+        padding: 12px 30px;
+        border-radius: 6px;
+        font-weight: bold;
+        font-size: 12px;
+    }
+    QDialog#newProcessDialog QPushButton#createProcessButton:hover {
+        background-color: #27AE60;
+    }
+    QDialog#newProcessDialog QPushButton#createProcessButton:pressed {
+        background-color: #219653;
+    }
+    QDialog#newProcessDialog QPushButton#cancelProcessButton {
+        background-color: #95A5A6;
+        color: white;
+        border: none;
+        padding: 12px 30px;
+        border-radius: 6px;
+        font-weight: bold;
+        font-size: 12px;
+    }
+    QDialog#newProcessDialog QPushButton#cancelProcessButton:hover {
+        background-color: #7F8C8D;
+    }
+    QDialog#newProcessDialog QPushButton#cancelProcessButton:pressed {
+        background-color: #6C7B7D;
+    }
+""",
+}
+
+# Settings dialog
+SETTINGS_DIALOG = {
+    'dark': """
+    QDialog#settingsDialog {
+        background-color: #2C3E50;
+    }
+    QDialog#settingsDialog QGroupBox#apiGroup,
+    QDialog#settingsDialog QGroupBox#folderGroup,
+    QDialog#settingsDialog QGroupBox#cacheGroup,
+    QDialog#settingsDialog QGroupBox#estimateGroup,
+    QDialog#settingsDialog QGroupBox#mockGroup,
+    QDialog#settingsDialog QGroupBox#themeGroup {
+        font-weight: bold;
+        border: 2px solid #4A90E2;
+        border-radius: 8px;
+        margin-top: 10px;
+        padding-top: 15px;
+        background-color: #34495E;
+        color: #ECF0F1;
+    }
+    QDialog#settingsDialog QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 10px 0 10px;
+        color: #ECF0F1;
+    }
+    QDialog#settingsDialog QLineEdit {
+        padding: 8px;
+        border: 1px solid #5D6D7E;
+        border-radius: 4px;
+        background-color: #2C3E50;
+        color: #ECF0F1;
+    }
+    QDialog#settingsDialog QLineEdit:focus {
+        border: 2px solid #3498DB;
+        background-color: #34495E;
+    }
+    QDialog#settingsDialog QLineEdit[readOnly="true"] {
+        background-color: #2C3E50;
+        color: #BDC3C7;
+    }
+    QDialog#settingsDialog QPushButton {
+        background-color: #7F8C8D;
+        color: white;
+        border: none;
+        padding: 8px 16px;
+        border-radius: 4px;
+        font-weight: bold;
+    }
+    QDialog#settingsDialog QPushButton:hover {
+        background-color: #717D7E;
+    }
+    QDialog#settingsDialog QPushButton:pressed {
+        background-color: #616A6B;
+    }
+    QDialog#settingsDialog QPushButton#saveButton {
+        background-color: #27AE60;
+        color: white;
+    }
+    QDialog#settingsDialog QPushButton#saveButton:hover {
+        background-color: #229954;
+    }
+    QDialog#settingsDialog QPushButton#saveButton:pressed {
+        background-color: #1E8449;
+    }
+    QDialog#settingsDialog QPushButton#cancelButton {
+        background-color: #E74C3C;
+        color: white;
+    }
+    QDialog#settingsDialog QPushButton#cancelButton:hover {
+        background-color: #CB4335;
+    }
+    QDialog#settingsDialog QPushButton#cancelButton:pressed {
+        background-color: #B03A2E;
+    }
+    QDialog#settingsDialog QWidget#settingsContent {
+        background-color: transparent;
+    }
+    QDialog#settingsDialog QLabel#folderInfo {
+        color: #BDC3C7;
+        font-size: 10px;
+        padding: 5px;
+    }
+    QDialog#settingsDialog QComboBox,
+    QDialog#settingsDialog QSpinBox,
+    QDialog#settingsDialog QDoubleSpinBox {
+        padding: 6px;
+        border: 1px solid #5D6D7E;
+        border-radius: 4px;
+        background-color: #2C3E50;
+        color: #ECF0F1;
+    }
+    QDialog#settingsDialog QComboBox:hover {
+        border: 1px solid #3498DB;
+    }
+    QDialog#settingsDialog QComboBox::drop-down {
+        border: none;
+    }
+    QDialog#settingsDialog QComboBox::down-arrow {
+        image: none;
+        border: none;
+    }
+""",
+    'light': """
+    QDialog#settingsDialog {
+        background-color: #ECF0F1;
+    }
+    QDialog#settingsDialog QGroupBox#apiGroup,
+    QDialog#settingsDialog QGroupBox#folderGroup,
+    QDialog#settingsDialog QGroupBox#cacheGroup,
+    QDialog#settingsDialog QGroupBox#estimateGroup,
+    QDialog#settingsDialog QGroupBox#mockGroup,
+    QDialog#settingsDialog QGroupBox#themeGroup {
+        font-weight: bold;
+        border: 2px solid #4A90E2;
+        border-radius: 8px;
+        margin-top: 10px;
+        padding-top: 15px;
+        background-color: #FFFFFF;
+    }
+    QDialog#settingsDialog QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 10px 0 10px;
+        color: #2C3E50;
+    }
+    QDialog#settingsDialog QLineEdit {
+        padding: 8px;
+        border: 1px solid #BDC3C7;
+        border-radius: 4px;
+        background-color: #F8F9FA;
+    }
+    QDialog#settingsDialog QLineEdit:focus {
+        border: 2px solid #3498DB;
+        background-color: #FFFFFF;
+    }
+    QDialog#settingsDialog QLineEdit[readOnly="true"] {
+        background-color: #ECF0F1;
+        color: #2C3E50;
+    }
+    QDialog#settingsDialog QPushButton {
+        background-color: #7F8C8D;
+        color: white;
+        border: none;
+        padding: 8px 16px;
+        border-radius: 4px;
+        font-weight: bold;
+    }
+    QDialog#settingsDialog QPushButton:hover {
+        background-color: #95A5A6;
+    }
+    QDialog#settingsDialog QPushButton:pressed {
+        background-color: #6C7B7D;
+    }
+    QDialog#settingsDialog QPushButton#saveButton {
+        background-color: #2ECC71;
+        color: white;
+    }
+    QDialog#settingsDialog QPushButton#saveButton:hover {
+        background-color: #27AE60;
+    }
+    QDialog#settingsDialog QPushButton#saveButton:pressed {
+        background-color: #219653;
+    }
+    QDialog#settingsDialog QPushButton#cancelButton {
+        background-color: #E74C3C;
+        color: white;
+    }
+    QDialog#settingsDialog QPushButton#cancelButton:hover {
+        background-color: #C0392B;
+    }
+    QDialog#settingsDialog QPushButton#cancelButton:pressed {
+        background-color: #A93226;
+    }
+    QDialog#settingsDialog QWidget#settingsContent {
+        background-color: transparent;
+    }
+    QDialog#settingsDialog QLabel#folderInfo {
+        color: #7F8C8D;
+        font-size: 10px;
+        padding: 5px;
+    }
+    QDialog#settingsDialog QComboBox,
+    QDialog#settingsDialog QSpinBox,
+    QDialog#settingsDialog QDoubleSpinBox {
+        padding: 6px;
+        border: 1px solid #BDC3C7;
+        border-radius: 4px;
+        background-color: #F8F9FA;
+    }
+    QDialog#settingsDialog QComboBox:hover {
+        border: 1px solid #3498DB;
+    }
+""",
+}
+
+# Log viewer
+LOG_DIALOG = {
+    'dark': """
+    QDialog#logDialog {
+        background-color: #0a0a0a;
+    }
+    QPlainTextEdit#logDisplay {
+        background-color: #1a1a1a;
+        color: #e0e0e0;
+        font-family: 'Courier New', monospace;
+        font-size: 11px;
+        padding: 10px;
+        border: 2px solid #404040;
+        border-radius: 6px;
+    }
+    QPushButton#closeLogButton, QPushButton#loadOlderButton {
+        background-color: #3498DB;
+        color: white;
+        border: none;
+        padding: 10px 20px;
+        border-radius: 6px;
+        font-weight: bold;
+    }
+    QPushButton#closeLogButton:hover, QPushButton#loadOlderButton:hover {
+        background-color: #2980B9;
+    }
+    QPushButton#closeLogButton:pressed, QPushButton#loadOlderButton:pressed {
+        background-color: #21618C;
+    }
+    QPushButton#loadOlderButton:disabled {
+        background-color: #404040;
+        color: #808080;
+    }
+""",
+    'light': """
+    QDialog#logDialog {
+        background-color: #ECF0F1;
+    }
+    QPlainTextEdit#logDisplay {
+        background-color: #2C3E50;
+        color: #ECF0F1;
+        font-family: 'Courier New', monospace;
+        font-size: 11px;
+        padding: 10px;
+        border: 2px solid #34495E;
+        border-radius: 6px;
+    }
+    QPushButton#closeLogButton, QPushButton#loadOlderButton {
+        background-color: #3498DB;
+        color: white;
+        border: none;
+        padding: 10px 20px;
+        border-radius: 6px;
+        font-weight: bold;
+    }
+    QPushButton#closeLogButton:hover, QPushButton#loadOlderButton:hover {
+        background-color: #2980B9;
+    }
+    QPushButton#closeLogButton:pressed, QPushButton#loadOlderButton:pressed {
+        background-color: #21618C;
+    }
+    QPushButton#loadOlderButton:disabled {
+        background-color: #BDC3C7;
+        color: #7F8C8D;
+    }
+""",
+}
+
+# Analytics dashboard
+ANALYTICS_DIALOG = {
+    'dark': """
+    QDialog#analyticsDialog {
+        background-color: #1e1e1e;
+        color: #e0e0e0;
+    }
+    QDialog#analyticsDialog QLabel {
+        color: #e0e0e0;
+        font-weight: bold;
+    }
+    QDialog#analyticsDialog QTableWidget {
+        background-color: #2a2a2a;
+        color: #e0e0e0;
+        gridline-color: #404040;
+        border: 2px solid #404040;
+        border-radius: 6px;
+    }
+    QDialog#analyticsDialog QHeaderView::section {
+        background-color: #333333;
+        color: #e0e0e0;
+        padding: 4px;
+        border: none;
+    }
+    QPushButton#closeAnalyticsButton {
+        background-color: #3498DB;
+        color: white;
+        border: none;
+        padding: 10px 20px;
+        border-radius: 6px;
+        font-weight: bold;
+    }
+    QPushButton#closeAnalyticsButton:hover {
+        background-color: #2980B9;
+    }
+""",
+    'light': """
+    QDialog#analyticsDialog {
+        background-color: #ECF0F1;
+    }
+    QDialog#analyticsDialog QLabel {
+        color: #2C3E50;
+        font-weight: bold;
+    }
+    QDialog#analyticsDialog QTableWidget {
+        background-color: #FFFFFF;
+        gridline-color: #D5DBDB;
+        border: 2px solid #BDC3C7;
+        border-radius: 6px;
+    }
+    QDialog#analyticsDialog QHeaderView::section {
+        background-color: #D5DBDB;
+        color: #2C3E50;
+        padding: 4px;
+        border: none;
+    }
+    QPushButton#closeAnalyticsButton {
+        background-color: #3498DB;
+        color: white;
+        border: none;
+        padding: 10px 20px;
+        border-radius: 6px;
+        font-weight: bold;
+    }
+    QPushButton#closeAnalyticsButton:hover {
+        background-color: #2980B9;
+    }
+""",
+}
+
+# Widgets opt in with set_status(); one rule per status and theme
+STATUS_RULE = """
+QLabel[status="{status}"] {{
+    color: {text};
+    background-color: {background};
+    border: 1px solid {border};
+    font-weight: bold;
+}}"""
+
+SECTIONS = (MAIN_WINDOW, NEW_FOLDER_DIALOG, NEW_PROCESS_DIALOG, SETTINGS_DIALOG, LOG_DIALOG, ANALYTICS_DIALOG)
+
+_compiled = {}
+
+
+def stylesheet(theme):
+    """
+    The application's whole stylesheet for a theme, built once. Windows and
+    dialogs are styled through object names, and status colours through the
+    dynamic 'status' property, so no widget needs a stylesheet of its own.
+    """
+    if theme not in _compiled:
+        parts = [section[theme] for section in SECTIONS]
+        for status, (text, background, border) in PALETTES[theme]['status'].items():
+            parts.append(STATUS_RULE.format(status=status, text=text, background=background, border=border))
+        _compiled[theme] = "\n".join(parts)
+    return _compiled[theme]
+
+
+def apply_theme(theme):
+    """Switch the whole application to a theme ('dark' or 'light')"""
+    QApplication.instance().setStyleSheet(stylesheet(theme))
+
+
+def set_status(widget, status):
+    """Restyle a widget for a status: a property flip and re-polish, no stylesheet parsing"""
+    if widget.property('status') == status:
+        return
+    widget.setProperty('status', status)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
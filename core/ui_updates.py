@@ -0,0 +1,78 @@
+from PyQt6.QtCore import QObject, QTimer
+
+
+UI_REFRESH_INTERVAL_MS = 100  # 10 Hz
+
+
+class UpdateCoalescer(QObject):
+    """
+    Collects progress, status, token and log events from all workers and
+    hands them to the GUI in one batch per frame.
+
+    Only the latest progress and status per process is kept between frames,
+    so a burst of updates from many workers costs a single refresh instead of
+    one repaint per event. Log messages are delivered in order as one batch.
+    """
+
+    def __init__(self, progress_handler, status_handler, logs_handler, tokens_handler,
+                 interval_ms=UI_REFRESH_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.progress_handler = progress_handler
+        self.status_handler = status_handler
+        self.logs_handler = logs_handler
+        self.tokens_handler = tokens_handler
+
+        self.pending_progress = {}
+        self.pending_status = {}
+        self.pending_logs = []
+        self.pending_tokens = {}
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.flush)
+
+    def schedule(self):
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def queue_progress(self, process_id, current, total):
+        self.pending_progress[process_id] = (current, total)
+        self.schedule()
+
+    def queue_status(self, process_id, status):
+        self.pending_status[process_id] = status
+        self.schedule()
+
+    def queue_log(self, process_id, message):
+        self.pending_logs.append((process_id, message))
+        self.schedule()
+
+    def queue_tokens(self, process_id, pdf_file, tokens):
+        self.pending_tokens[(process_id, pdf_file)] = tokens
+        self.schedule()
+
+    def flush(self):
+        """Deliver everything queued so far"""
+        self.timer.stop()
+
+        statuses, self.pending_status = self.pending_status, {}
+        progress, self.pending_progress = self.pending_progress, {}
+        logs, self.pending_logs = self.pending_logs, []
+        tokens, self.pending_tokens = self.pending_tokens, {}
+
+        for process_id, status in statuses.items():
+            self.status_handler(process_id, status)
+        for process_id, (current, total) in progress.items():
+            self.progress_handler(process_id, current, total)
+        for (process_id, pdf_file), count in tokens.items():
+            self.tokens_handler(process_id, pdf_file, count)
+        if logs:
+            self.logs_handler(logs)
+
+    def discard(self, process_id):
+        """Drop pending events for a process that no longer exists"""
+        self.pending_progress.pop(process_id, None)
+        self.pending_status.pop(process_id, None)
+        self.pending_logs = [entry for entry in self.pending_logs if entry[0] != process_id]
+        self.pending_tokens = {key: count for key, count in self.pending_tokens.items() if key[0] != process_id}
@@ -1,8 +1,18 @@
 import os
-from datetime import datetime
-from pathlib import Path
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from core.async_engine import AsyncProcessRunner, get_async_engine
+from core.clients import get_client_manager
+from core.scheduler import get_scheduler
+from core.preflight import run_preflight
+from core.pipeline import (REQUEST_PARAMS, ProcessRun, FileJob, StreamRecorder, max_concurrent_files,
+                           document_requests, advance)
+from utils.fileio import atomic_write_text
 
 
 class ProcessWorker(QThread):
@@ -11,6 +21,7 @@ class ProcessWorker(QThread):
     status_changed = pyqtSignal(str, str)  # process_id, status
     finished = pyqtSignal(str, bool, str)  # process_id, success, message
     log_message = pyqtSignal(str, str)  # process_id, message
+    token_progress = pyqtSignal(str, str, int)  # process_id, pdf_file, tokens received (-1 when done)
 
     def __init__(self, process_data, settings):
         super().__init__()
@@ -18,146 +29,343 @@ class ProcessWorker(QThread):
         self.settings = settings
         self.is_paused = False
         self.is_cancelled = False
+        self.extraction_error = None
+        self.run_state = ProcessRun(process_data, settings, self)
+
+    def get_max_concurrent_files(self):
+        """Number of files allowed in flight at once for this process"""
+        return max_concurrent_files(self.process_data, self.settings)
 
     def run(self):
         """Execute the PDF processing"""
         process_id = self.process_data['id']
-        instruction = self.process_data['instruction']
-        pdf_folder = self.process_data['pdf_folder']
-        output_folder = self.process_data['output_folder']
-        model_name = self.process_data.get('model_name', 'ServiceNow-AI/Apriel-1.6-15b-Thinker:together')
+        run = self.run_state
 
         try:
-            self.log_message.emit(process_id, "Initializing process...")
-
-            # Import here to avoid issues with threading
-            from openai import OpenAI
-            from utils.pdf_extract import extract_text_with_precision
-
-            # Initialize OpenAI client
-            api_key = self.settings.get('hf_api_key', '')
-            if not api_key:
-                self.finished.emit(process_id, False, "API key not configured")
+            prepared = run.prepare()
+            if prepared is None:
                 return
+            api_key, work_items = prepared
 
-            client = OpenAI(
-                base_url="https://router.huggingface.co/v1",
-                api_key=api_key,
-            )
+            # Shared pooled client, so connections are reused across processes
+            client = get_client_manager().get_client(api_key, self.settings)
+            try:
+                self.process_files(client, work_items)
+            finally:
+                get_client_manager().release_client(client)
 
-            # Get all PDF files
-            if not os.path.exists(pdf_folder):
-                self.finished.emit(process_id, False, "PDF folder does not exist")
-                return
-
-            pdf_files = [f for f in os.listdir(pdf_folder) if f.lower().endswith('.pdf')]
-            total_files = len(pdf_files)
-
-            if total_files == 0:
-                self.finished.emit(process_id, False, "No PDF files found in folder")
-                return
+        except Exception as e:
+            self.status_changed.emit(process_id, "failed")
+            self.finished.emit(process_id, False, f"Error: {str(e)}")
 
-            self.log_message.emit(process_id, f"Found {total_files} PDF files")
-            self.log_message.emit(process_id, f"Using model: {model_name}")
-            self.status_changed.emit(process_id, "running")
+    def process_files(self, client, work_items):
+        """Runs the extraction producer and the API stage over the work items, then finishes the run"""
+        process_id = self.process_data['id']
+        run = self.run_state
+
+        max_concurrent = max(1, min(self.get_max_concurrent_files(), len(work_items)))
+        run.start(client, max_concurrent)
+
+        # Extraction runs ahead in the shared process pool and feeds a
+        # bounded queue, so at most max_concurrent extracted files wait
+        # for the API stage at any time
+        extraction_queue = queue.Queue(maxsize=max_concurrent)
+        producer = threading.Thread(target=self.extract_files,
+                                    args=(work_items, extraction_queue), daemon=True)
+        producer.start()
+
+        # Keep at most max_concurrent files in the API stage; a new file is
+        # only submitted once a previous one has finished
+        with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+            in_flight = set()
+            while True:
+                item = extraction_queue.get()
+                if item is None:
+                    break
+
+                while len(in_flight) >= max_concurrent:
+                    _, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                if not self.wait_while_paused():
+                    item[2].cancel()
+                    break
+
+                in_flight.add(executor.submit(self.process_file, client, *item))
+
+            wait(in_flight)
+
+        # Drop extractions that were queued but never reached the API stage
+        while producer.is_alive() or not extraction_queue.empty():
+            try:
+                item = extraction_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is not None:
+                item[2].cancel()
+
+        get_scheduler().forget(process_id)
+
+        error = f"Extraction stage failed: {self.extraction_error}" if self.extraction_error else None
+        run.finish(self.is_cancelled, error)
+
+    def wait_while_paused(self):
+        """Block while paused. Returns False if the process was cancelled."""
+        while self.is_paused and not self.is_cancelled:
+            self.msleep(100)
+        return not self.is_cancelled
+
+    def extract_files(self, work_items, extraction_queue):
+        """Producer: submit (index, file) work items to the extraction pool in order"""
+        from utils.extraction_pool import submit_extraction
 
-            # Create output folder if it doesn't exist
-            os.makedirs(output_folder, exist_ok=True)
+        pdf_folder = self.process_data['pdf_folder']
+        extraction_workers = self.settings.get('extraction_workers')
+        max_pages = self.settings.get('max_pages_per_pdf')
+        try:
+            for idx, pdf_file in work_items:
+                if not self.wait_while_paused():
+                    break
 
-            # Update total first
-            self.progress_updated.emit(process_id, 0, total_files)
+                future = submit_extraction(os.path.join(pdf_folder, pdf_file), extraction_workers, max_pages)
 
-            # Process each PDF
-            successful_count = 0
-            failed_count = 0
+                # Block while the API stage is saturated, but keep watching for cancel
+                while True:
+                    if self.is_cancelled:
+                        future.cancel()
+                        return
+                    try:
+                        extraction_queue.put((idx, pdf_file, future), timeout=0.2)
+                        break
+                    except queue.Full:
+                        continue
+        except Exception as e:
+            self.extraction_error = str(e)
+        finally:
+            extraction_queue.put(None)
 
-            for idx, pdf_file in enumerate(pdf_files):
-                if self.is_cancelled:
-                    self.status_changed.emit(process_id, "cancelled")
-                    self.finished.emit(process_id, False, "Process cancelled by user")
-                    return
+    def process_file(self, client, idx, pdf_file, extraction):
+        """Send an extracted PDF to the model and save the result"""
+        job = FileJob(self.run_state, idx, pdf_file)
+        try:
+            job.begin()
 
-                # Handle pause
-                while self.is_paused and not self.is_cancelled:
-                    self.msleep(100)
+            # Wait for the extraction submitted by the producer
+            try:
+                result, error = extraction.result(), None
+            except Exception as pdf_error:
+                result, error = None, pdf_error
 
-                if self.is_cancelled:
-                    self.status_changed.emit(process_id, "cancelled")
-                    self.finished.emit(process_id, False, "Process cancelled by user")
+            if job.check_extraction(result, error):
+                # Extraction may have been slow; honour pause/cancel before paying for the API call
+                if not self.wait_while_paused():
                     return
 
-                try:
-                    self.log_message.emit(process_id, f"Processing: {pdf_file}")
-
-                    # Extract text from PDF
-                    pdf_path = os.path.join(pdf_folder, pdf_file)
-
-                    # Try to extract with error handling for corrupted PDFs
+                if not job.use_cached_response():
+                    job.reserve()
                     try:
-                        content = extract_text_with_precision(pdf_path)
-                    except Exception as pdf_error:
-                        self.log_message.emit(process_id, f"PDF Error in {pdf_file}: {str(pdf_error)}")
-                        self.log_message.emit(process_id, f"Skipping corrupted/invalid PDF: {pdf_file}")
-                        failed_count += 1
-                        # Update progress even for skipped files
-                        self.progress_updated.emit(process_id, idx + 1, total_files)
-                        continue
+                        response = self.complete_document(client, job)
+                    finally:
+                        job.settle()
+                    if response is None:
+                        return  # Cancelled; the file stays unrecorded
+                    job.complete(response)
 
-                    if not content or len(content.strip()) == 0:
-                        self.log_message.emit(process_id, f"Warning: No text extracted from {pdf_file}")
-                        failed_count += 1
-                        # Update progress even for empty files
-                        self.progress_updated.emit(process_id, idx + 1, total_files)
-                        continue
+        except Exception as e:
+            job.fail(e)
 
+        job.record_metrics()
+        self.run_state.file_finished(job.success)
+
+    def complete_document(self, client, job):
+        """
+        Runs the instruction on a document and returns the result, or None if
+        cancelled. Parts of a split document are sent concurrently.
+        """
+        plan = document_requests(self.run_state, job)
+        try:
+            requests, response = advance(plan)
+            while requests is not None:
+                if len(requests) == 1:
+                    results = [self.request_completion(client, *requests[0], job.metrics)]
+                else:
+                    workers = min(len(requests), self.get_max_concurrent_files())
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        futures = [executor.submit(self.request_completion, client, *request, job.metrics)
+                                   for request in requests]
+                        try:
+                            results = [future.result() for future in futures]
+                        except Exception:
+                            # One failed part fails the document; don't start the others
+                            for future in futures:
+                                future.cancel()
+                            raise
+                requests, response = advance(plan, results)
+            return response
+        finally:
+            plan.close()
+
+    def request_completion(self, client, messages, pdf_file, result_path, metrics):
+        """
+        Sends one completion request through the global scheduler, retrying
+        throttled and transient failures with backoff. Writes the result to
+        result_path and returns it, or None if cancelled. Timings and token
+        usage are added to metrics.
+        """
+        process_id = self.process_data['id']
+        model_name = self.run_state.model_name
+        scheduler = get_scheduler()
+        attempt = 0
+
+        while True:
+            # Wait for a slot from the global scheduler, shared with all other processes
+            queued = time.monotonic()
+            if not scheduler.acquire(process_id, model_name, self.process_data.get('priority', 0),
+                                     lambda: self.is_cancelled):
+                return None
+            started = time.monotonic()
+            metrics.add_queue_wait(started - queued)
+            try:
+                if self.process_data.get('stream_responses', True):
+                    response, usage = self.stream_completion(client, messages, pdf_file, result_path, metrics)
+                    if response is None:
+                        return None
+                else:
                     # Call API with specified model
                     completion = client.chat.completions.create(
                         model=model_name,
-                        messages=[
-                            {"role": "system", "content": instruction},
-                            {"role": "user", "content": content}
-                        ],
-                        max_tokens = 72000,
-                        extra_body={
-                            "reasoning" : {
-                                "effort" : "high"
-                            }
-                        },
+                        messages=messages,
+                        **REQUEST_PARAMS,
                     )
+                    response = completion.choices[0].message.content
+                    usage = completion.usage
+                    atomic_write_text(result_path, response)
+            except Exception as e:
+                delay = self.run_state.retry_delay(e, attempt, pdf_file)
+            else:
+                self.run_state.request_succeeded(started, usage, messages, response, metrics)
+                return response
+            finally:
+                scheduler.release(model_name)
+
+            # Back off without holding a slot, so other requests can use it
+            attempt += 1
+            deadline = time.monotonic() + delay
+            while time.monotonic() < deadline:
+                if self.is_cancelled:
+                    return None
+                self.msleep(100)
+
+    def stream_completion(self, client, messages, pdf_file, result_path, metrics):
+        """
+        Streams the completion into result_path + '.partial' as tokens arrive and
+        renames it into place when done. Pause and cancel are honoured between
+        chunks. Returns (full text, usage if the provider sent it), or
+        (None, None) if cancelled.
+        """
+        stream = client.chat.completions.create(
+            model=self.run_state.model_name,
+            messages=messages,
+            stream=True,
+            **REQUEST_PARAMS,
+        )
+        recorder = StreamRecorder(self.run_state, pdf_file, result_path, metrics)
+        try:
+            for chunk in stream:
+                if not self.wait_while_paused():
+                    break
+                recorder.add(chunk)
+        except BaseException:
+            recorder.discard()
+            raise
+        finally:
+            stream.close()
+            recorder.end()
+
+        if self.is_cancelled:
+            recorder.discard()
+            return None, None
+        return recorder.commit()
 
-                    # Save result
-                    result_filename = f"{idx + 1:03d}_{Path(pdf_file).stem}.md"
-                    result_path = os.path.join(output_folder, result_filename)
+    def pause(self):
+        self.is_paused = True
+
+    def resume(self):
+        self.is_paused = False
 
-                    with open(result_path, 'w', encoding='utf-8') as f:
-                        f.write(completion.choices[0].message.content)
+    def cancel(self):
+        self.is_cancelled = True
 
-                    successful_count += 1
-                    self.log_message.emit(process_id, f"✓ Completed: {pdf_file}")
 
-                except Exception as e:
-                    failed_count += 1
-                    self.log_message.emit(process_id, f"✗ Error processing {pdf_file}: {str(e)}")
+class AsyncProcessWorker(QObject):
+    """
+    Runs a process on the shared asyncio engine instead of its own thread.
 
-                # Always update progress after each file (success or failure)
-                self.progress_updated.emit(process_id, idx + 1, total_files)
+    Exposes the same signals and controls as ProcessWorker (start, pause,
+    resume, cancel, isRunning, wait, terminate), so the main window can use
+    either engine interchangeably.
+    """
+    progress_updated = pyqtSignal(str, int, int)  # process_id, current, total
+    status_changed = pyqtSignal(str, str)  # process_id, status
+    finished = pyqtSignal(str, bool, str)  # process_id, success, message
+    log_message = pyqtSignal(str, str)  # process_id, message
+    token_progress = pyqtSignal(str, str, int)  # process_id, pdf_file, tokens received (-1 when done)
 
-                # Small delay to ensure UI updates
-                self.msleep(50)
+    def __init__(self, process_data, settings):
+        super().__init__()
+        self.process_data = process_data
+        self.runner = AsyncProcessRunner(process_data, settings, self)
+        self.future = None
 
-            self.status_changed.emit(process_id, "completed")
-            summary = f"Finished: {successful_count} successful, {failed_count} failed/skipped out of {total_files} files"
-            self.finished.emit(process_id, True, summary)
+    def start(self):
+        self.future = get_async_engine().submit(self.runner.run())
 
-        except Exception as e:
-            self.status_changed.emit(process_id, "failed")
-            self.finished.emit(process_id, False, f"Error: {str(e)}")
+    def isRunning(self):
+        return self.future is not None and not self.future.done()
+
+    def wait(self, msecs=None):
+        """Block until the process task ends; returns False on timeout"""
+        if self.future is None:
+            return True
+        done, _ = wait([self.future], timeout=None if msecs is None else msecs / 1000)
+        return bool(done)
+
+    def terminate(self):
+        if self.future is not None:
+            self.future.cancel()
 
     def pause(self):
-        self.is_paused = True
+        self.runner.pause()
 
     def resume(self):
-        self.is_paused = False
+        self.runner.resume()
+
+    def cancel(self):
+        self.runner.cancel()
+
+
+class PreflightWorker(QThread):
+    """Runs the pre-flight estimate of a new process off the GUI thread"""
+    progress = pyqtSignal(int, int)  # files estimated, total files
+    report_ready = pyqtSignal(object)  # PreflightReport, or None if cancelled
+    failed = pyqtSignal(str)
+
+    def __init__(self, pdf_folder, instruction, model_name, settings, concurrency):
+        super().__init__()
+        self.pdf_folder = pdf_folder
+        self.instruction = instruction
+        self.model_name = model_name
+        self.settings = settings
+        self.concurrency = concurrency
+        self.is_cancelled = False
+
+    def run(self):
+        try:
+            report = run_preflight(self.pdf_folder, self.instruction, self.model_name, self.settings,
+                                   self.concurrency, self.progress.emit, lambda: self.is_cancelled)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.report_ready.emit(report)
 
     def cancel(self):
         self.is_cancelled = True
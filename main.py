@@ -1,21 +1,38 @@
 import sys
 import os
-import json
 import shutil
+import multiprocessing
 from datetime import datetime
-from pathlib import Path
+
+# Installed before the GUI imports so the optional startup report can time them
+from core.startup import startup
+startup.begin(sys.argv)
 
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QPushButton, QLabel, QLineEdit,
-                             QTextEdit, QFileDialog, QProgressBar, QGroupBox,
-                             QMessageBox, QDialog, QFormLayout, QScrollArea,
-                             QFrame, QListWidget, QSplitter, QComboBox)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
+                             QTextEdit, QFileDialog, QGroupBox,
+                             QMessageBox, QDialog, QFormLayout,
+                             QFrame, QListWidget, QSplitter, QSpinBox,
+                             QCheckBox, QListView, QAbstractItemView, QDoubleSpinBox)
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont, QPalette, QColor
 
-from core.worker import ProcessWorker
-from core.process_widget import ProcessWidget
-from core.dialogs import SettingsDialog
+from core.worker import ProcessWorker, AsyncProcessWorker, PreflightWorker
+from core.pipeline import DEFAULT_MAX_CONCURRENT_FILES
+from core.process_model import ProcessListModel, ProcessDelegate
+from core.theme import apply_theme as apply_application_theme, set_status
+from core.database import get_database, UNFINISHED_STATUSES, LEASE_HEARTBEAT_INTERVAL
+from core.log_store import ProcessLogStore
+from core.scheduler import get_scheduler
+from core.clients import get_client_manager
+from core.async_engine import shutdown_async_engine
+from core.mock_backend import shutdown_mock_backend
+from core.state_store import StateStore
+from core.process_index import ProcessIndex
+from core.ui_updates import UpdateCoalescer
+from utils.extraction_pool import shutdown_extraction_pool
+
+startup.mark("modules imported")
 
 
 class MainWindow(QMainWindow):
@@ -26,17 +43,17 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("PDF Processing Manager")
         self.setGeometry(100, 100, 1200, 700)
 
-        self.settings_file = "saves/app_settings.json"
-        self.processes_file = "saves/processes_state.json"
-        self.folders_file = "saves/folders_state.json"
+        self.db = get_database()
+        self.log_store = ProcessLogStore()
 
         self.settings = self.load_settings()
-        self.processes = {}
+        get_scheduler().configure(self.settings)
+        self.processes = {}  # Records loaded so far, shared with widgets and workers
         self.folders = {}
         self.current_folder = "root"
         self.workers = {}
-        self.process_widgets = {}
-        self.process_logs = {}
+        self.preflight_worker = None
+        self.stopping_preflights = set()  # cancelled estimates still finishing their current file
 
         # Determine theme from settings
         self.theme = 'dark' if self.settings.get('theme', 'Light Theme') == 'Dark Theme' else 'light'
@@ -45,9 +62,18 @@ class MainWindow(QMainWindow):
         self.apply_theme()
         self.load_folders_state()
         self.load_processes_state()
+        self.process_index = ProcessIndex(self.db.load_process_index())
+        self.process_store = StateStore(self.db, self.processes, parent=self)
+        self.ui_updates = UpdateCoalescer(self.on_progress_updated, self.on_status_changed,
+                                          self.on_log_messages, self.on_token_progress, parent=self)
         self.refresh_folder_list()
         self.refresh_process_list()
 
+        # Renew the leases of the processes this window runs, so other runners leave them alone
+        self.lease_timer = QTimer(self)
+        self.lease_timer.timeout.connect(self.renew_leases)
+        self.lease_timer.start(LEASE_HEARTBEAT_INTERVAL * 1000)
+
         # Use timer to resume processes after UI is fully initialized
         QTimer.singleShot(500, self.resume_processes)
 
@@ -71,6 +97,10 @@ class MainWindow(QMainWindow):
         new_folder_btn.setObjectName("newFolderButton")
         new_folder_btn.clicked.connect(self.create_new_folder)
 
+        analytics_btn = QPushButton("📈 Analytics")
+        analytics_btn.setObjectName("analyticsButton")
+        analytics_btn.clicked.connect(self.open_analytics)
+
         settings_btn = QPushButton("⚙ Settings")
         settings_btn.setObjectName("settingsButton")
         settings_btn.clicked.connect(self.open_settings)
@@ -78,6 +108,7 @@ class MainWindow(QMainWindow):
         toolbar_layout.addWidget(new_process_btn)
         toolbar_layout.addWidget(new_folder_btn)
         toolbar_layout.addStretch()
+        toolbar_layout.addWidget(analytics_btn)
         toolbar_layout.addWidget(settings_btn)
 
         # Statistics dashboard
@@ -140,18 +171,27 @@ class MainWindow(QMainWindow):
         self.current_folder_label.setObjectName("currentFolderLabel")
         process_layout.addWidget(self.current_folder_label)
 
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setFrameShape(QFrame.Shape.NoFrame)
-        scroll.setObjectName("processScroll")
-
-        self.process_container = QWidget()
-        self.process_container.setObjectName("processContainer")
-        self.process_layout = QVBoxLayout(self.process_container)
-        self.process_layout.addStretch()
-
-        scroll.setWidget(self.process_container)
-        process_layout.addWidget(scroll)
+        # Rows are painted by a delegate, so only visible processes cost anything
+        self.process_model = ProcessListModel(self.processes, self)
+        self.process_delegate = ProcessDelegate(self.theme, self)
+        self.process_delegate.pause_clicked.connect(self.pause_process)
+        self.process_delegate.resume_clicked.connect(self.resume_process)
+        self.process_delegate.cancel_clicked.connect(self.cancel_process)
+        self.process_delegate.delete_clicked.connect(self.delete_process)
+        self.process_delegate.open_folder_clicked.connect(self.open_output_folder)
+        self.process_delegate.view_logs_clicked.connect(self.view_logs)
+
+        self.process_view = QListView()
+        self.process_view.setObjectName("processContainer")
+        self.process_view.setModel(self.process_model)
+        self.process_view.setItemDelegate(self.process_delegate)
+        self.process_view.setUniformItemSizes(True)
+        self.process_view.setMouseTracking(True)
+        self.process_view.setFrameShape(QFrame.Shape.NoFrame)
+        self.process_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.process_view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.process_view.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        process_layout.addWidget(self.process_view)
 
         # Add to splitter
         content_splitter.addWidget(folder_widget)
@@ -170,352 +210,8 @@ class MainWindow(QMainWindow):
         self.stats_timer.start(1000)
 
     def apply_theme(self):
-        if self.theme == 'dark':
-            self.setStyleSheet("""
-                QMainWindow {
-                    background-color: #0a0a0a;
-                }
-                QWidget#centralWidget {
-                    background-color: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                                                      stop:0 #0a0a0a, stop:1 #1a1a1a);
-                }
-                QLabel {
-                    color: #e0e0e0;
-                }
-                QLineEdit, QTextEdit {
-                    background-color: #2a2a2a;
-                    color: #e0e0e0;
-                    border: 1px solid #404040;
-                    border-radius: 4px;
-                    padding: 6px;
-                    selection-background-color: #3498DB;
-                }
-                QLineEdit:focus, QTextEdit:focus {
-                    border: 2px solid #3498DB;
-                }
-                QTextEdit {
-                    font-family: 'Segoe UI', Arial;
-                }
-                QListWidget {
-                    background-color: #2a2a2a;
-                    color: #e0e0e0;
-                    border: 1px solid #404040;
-                    border-radius: 6px;
-                    padding: 5px;
-                }
-                QListWidget::item {
-                    padding: 8px;
-                    border-bottom: 1px solid #333333;
-                }
-                QListWidget::item:selected {
-                    background-color: #3498DB;
-                    color: white;
-                    border-radius: 4px;
-                }
-                QListWidget::item:hover {
-                    background-color: #3a3a3a;
-                    border-radius: 4px;
-                }
-                QScrollArea {
-                    border: none;
-                    background-color: transparent;
-                }
-                QScrollBar:vertical {
-                    background-color: #1a1a1a;
-                    width: 12px;
-                    border-radius: 6px;
-                }
-                QScrollBar::handle:vertical {
-                    background-color: #404040;
-                    border-radius: 6px;
-                    min-height: 20px;
-                }
-                QScrollBar::handle:vertical:hover {
-                    background-color: #505050;
-                }
-                QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                    height: 0px;
-                }
-                QGroupBox#statsGroup {
-                    font-weight: bold;
-                    border: 2px solid #404040;
-                    border-radius: 8px;
-                    padding-top: 10px;
-                    background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                                                      stop:0 #2a2a2a, stop:1 #1a1a1a);
-                    color: #e0e0e0;
-                }
-                QGroupBox::title {
-                    subcontrol-origin: margin;
-                    left: 10px;
-                    padding: 0 10px 0 10px;
-                    color: #e0e0e0;
-                }
-                QLabel#statsLabel {
-                    padding: 10px;
-                    background-color: #151515;
-                    border-radius: 6px;
-                    border: 1px solid #404040;
-                    min-width: 150px;
-                    text-align: center;
-                }
-                QPushButton#newProcessButton {
-                    background-color: #2ECC71;
-                    color: white;
-                    border: none;
-                    padding: 12px 24px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }
-                QPushButton#newProcessButton:hover {
-                    background-color: #27AE60;
-                }
-                QPushButton#newProcessButton:pressed {
-                    background-color: #219653;
-                }
-                QPushButton#newFolderButton {
-                    background-color: #3498DB;
-                    color: white;
-                    border: none;
-                    padding: 12px 24px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }
-                QPushButton#newFolderButton:hover {
-                    background-color: #2980B9;
-                }
-                QPushButton#newFolderButton:pressed {
-                    background-color: #21618C;
-                }
-                QPushButton#settingsButton {
-                    background-color: #9B59B6;
-                    color: white;
-                    border: none;
-                    padding: 12px 24px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }
-                QPushButton#settingsButton:hover {
-                    background-color: #8E44AD;
-                }
-                QPushButton#settingsButton:pressed {
-                    background-color: #7D3C98;
-                }
-                QPushButton#deleteFolderButton {
-                    background-color: #E74C3C;
-                    color: white;
-                    border: none;
-                    padding: 10px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                }
-                QPushButton#deleteFolderButton:hover {
-                    background-color: #C0392B;
-                }
-                QPushButton#deleteFolderButton:pressed {
-                    background-color: #A93226;
-                }
-                QWidget#folderWidget {
-                    background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                                                      stop:0 #2a2a2a, stop:1 #1a1a1a);
-                    border-radius: 8px;
-                }
-                QWidget#processWidget {
-                    background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                                                      stop:0 #2a2a2a, stop:1 #1a1a1a);
-                    border-radius: 8px;
-                }
-                QWidget#processContainer {
-                    background-color: #151515;
-                }
-                QLabel#folderHeader, QLabel#currentFolderLabel {
-                    color: #e0e0e0;
-                    padding: 10px;
-                    background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                                                      stop:0 #2a2a2a, stop:1 #1a1a1a);
-                    border-radius: 6px;
-                    border: 2px solid #404040;
-                }
-                QSplitter#contentSplitter::handle {
-                    background-color: #404040;
-                    width: 3px;
-                }
-                QSplitter#contentSplitter::handle:hover {
-                    background-color: #3498DB;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QMainWindow {
-                    background-color: #ECF0F1;
-                }
-                QWidget#centralWidget {
-                    background-color: #ECF0F1;
-                }
-                QLabel {
-                    color: #2C3E50;
-                }
-                QLineEdit, QTextEdit {
-                    background-color: #FFFFFF;
-                    border: 1px solid #BDC3C7;
-                    border-radius: 4px;
-                    padding: 6px;
-                    selection-background-color: #3498DB;
-                }
-                QLineEdit:focus, QTextEdit:focus {
-                    border: 2px solid #3498DB;
-                }
-                QTextEdit {
-                    font-family: 'Segoe UI', Arial;
-                }
-                QListWidget {
-                    background-color: #FFFFFF;
-                    border: 1px solid #BDC3C7;
-                    border-radius: 6px;
-                    padding: 5px;
-                }
-                QListWidget::item {
-                    padding: 8px;
-                    border-bottom: 1px solid #ECF0F1;
-                }
-                QListWidget::item:selected {
-                    background-color: #3498DB;
-                    color: white;
-                    border-radius: 4px;
-                }
-                QListWidget::item:hover {
-                    background-color: #D6EAF8;
-                    border-radius: 4px;
-                }
-                QScrollArea {
-                    border: none;
-                    background-color: transparent;
-                }
-                QScrollBar:vertical {
-                    background-color: #ECF0F1;
-                    width: 12px;
-                    border-radius: 6px;
-                }
-                QScrollBar::handle:vertical {
-                    background-color: #95A5A6;
-                    border-radius: 6px;
-                    min-height: 20px;
-                }
-                QScrollBar::handle:vertical:hover {
-                    background-color: #7F8C8D;
-                }
-                QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                    height: 0px;
-                }
-                QGroupBox#statsGroup {
-                    font-weight: bold;
-                    border: 2px solid #7F8C8D;
-                    border-radius: 8px;
-                    padding-top: 10px;
-                    background-color: #FFFFFF;
-                }
-                QGroupBox::title {
-                    subcontrol-origin: margin;
-                    left: 10px;
-                    padding: 0 10px 0 10px;
-                    color: #2C3E50;
-                }
-                QLabel#statsLabel {
-                    padding: 10px;
-                    background-color: #F8F9FA;
-                    border-radius: 6px;
-                    border: 1px solid #BDC3C7;
-                    min-width: 150px;
-                    text-align: center;
-                }
-                QPushButton#newProcessButton {
-                    background-color: #2ECC71;
-                    color: white;
-                    border: none;
-                    padding: 12px 24px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }
-                QPushButton#newProcessButton:hover {
-                    background-color: #27AE60;
-                }
-                QPushButton#newProcessButton:pressed {
-                    background-color: #219653;
-                }
-                QPushButton#newFolderButton {
-                    background-color: #3498DB;
-                    color: white;
-                    border: none;
-                    padding: 12px 24px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }
-                QPushButton#newFolderButton:hover {
-                    background-color: #2980B9;
-                }
-                QPushButton#newFolderButton:pressed {
-                    background-color: #21618C;
-                }
-                QPushButton#settingsButton {
-                    background-color: #9B59B6;
-                    color: white;
-                    border: none;
-                    padding: 12px 24px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }
-                QPushButton#settingsButton:hover {
-                    background-color: #8E44AD;
-                }
-                QPushButton#settingsButton:pressed {
-                    background-color: #7D3C98;
-                }
-                QPushButton#deleteFolderButton {
-                    background-color: #E74C3C;
-                    color: white;
-                    border: none;
-                    padding: 10px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                }
-                QPushButton#deleteFolderButton:hover {
-                    background-color: #C0392B;
-                }
-                QPushButton#deleteFolderButton:pressed {
-                    background-color: #A93226;
-                }
-                QWidget#folderWidget {
-                    background-color: #F8F9FA;
-                    border-radius: 8px;
-                }
-                QWidget#processWidget {
-                    background-color: #FFFFFF;
-                    border-radius: 8px;
-                }
-                QWidget#processContainer {
-                    background-color: #ECF0F1;
-                }
-                QLabel#folderHeader, QLabel#currentFolderLabel {
-                    color: #2C3E50;
-                    padding: 10px;
-                    background-color: #F8F9FA;
-                    border-radius: 6px;
-                    border: 2px solid #BDC3C7;
-                }
-                QSplitter#contentSplitter::handle {
-                    background-color: #BDC3C7;
-                    width: 3px;
-                }
-                QSplitter#contentSplitter::handle:hover {
-                    background-color: #3498DB;
-                }
-            """)
+        # One stylesheet for the whole application, dialogs included
+        apply_application_theme(self.theme)
 
     def create_new_folder(self):
         dialog = QDialog(self)
@@ -552,102 +248,6 @@ class MainWindow(QMainWindow):
 
         dialog.setLayout(layout)
 
-        # Apply theme to dialog
-        if self.theme == 'dark':
-            dialog.setStyleSheet("""
-                QDialog#newFolderDialog {
-                    background-color: #0a0a0a;
-                }
-                QLabel {
-                    color: #e0e0e0;
-                }
-                QLineEdit#folderNameInput {
-                    padding: 10px;
-                    border: 2px solid #404040;
-                    border-radius: 6px;
-                    background-color: #2a2a2a;
-                    color: #e0e0e0;
-                    font-size: 12px;
-                }
-                QLineEdit#folderNameInput:focus {
-                    border: 2px solid #3498DB;
-                }
-                QPushButton#createFolderButton {
-                    background-color: #2ECC71;
-                    color: white;
-                    border: none;
-                    padding: 10px 25px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                }
-                QPushButton#createFolderButton:hover {
-                    background-color: #27AE60;
-                }
-                QPushButton#createFolderButton:pressed {
-                    background-color: #219653;
-                }
-                QPushButton#cancelFolderButton {
-                    background-color: #505050;
-                    color: white;
-                    border: none;
-                    padding: 10px 25px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                }
-                QPushButton#cancelFolderButton:hover {
-                    background-color: #606060;
-                }
-                QPushButton#cancelFolderButton:pressed {
-                    background-color: #707070;
-                }
-            """)
-        else:
-            dialog.setStyleSheet("""
-                QDialog#newFolderDialog {
-                    background-color: #ECF0F1;
-                }
-                QLabel {
-                    color: #2C3E50;
-                }
-                QLineEdit#folderNameInput {
-                    padding: 10px;
-                    border: 2px solid #BDC3C7;
-                    border-radius: 6px;
-                    background-color: #FFFFFF;
-                    font-size: 12px;
-                }
-                QLineEdit#folderNameInput:focus {
-                    border: 2px solid #3498DB;
-                }
-                QPushButton#createFolderButton {
-                    background-color: #2ECC71;
-                    color: white;
-                    border: none;
-                    padding: 10px 25px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                }
-                QPushButton#createFolderButton:hover {
-                    background-color: #27AE60;
-                }
-                QPushButton#createFolderButton:pressed {
-                    background-color: #219653;
-                }
-                QPushButton#cancelFolderButton {
-                    background-color: #95A5A6;
-                    color: white;
-                    border: none;
-                    padding: 10px 25px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                }
-                QPushButton#cancelFolderButton:hover {
-                    background-color: #7F8C8D;
-                }
-                QPushButton#cancelFolderButton:pressed {
-                    background-color: #6C7B7D;
-                }
-            """)
 
         dialog.exec()
 
@@ -663,7 +263,7 @@ class MainWindow(QMainWindow):
             'created_at': datetime.now().isoformat()
         }
 
-        self.save_folders_state()
+        self.db.save_folder(self.folders[folder_id])
         self.refresh_folder_list()
         dialog.accept()
 
@@ -682,13 +282,13 @@ class MainWindow(QMainWindow):
             return
 
         # Check if folder has processes
-        processes_in_folder = [p for p in self.processes.values() if p.get('folder_id') == self.current_folder]
+        process_ids = self.process_index.process_ids(self.current_folder)
 
-        if processes_in_folder:
+        if process_ids:
             reply = QMessageBox.question(
                 self,
                 "Confirm Delete",
-                f"Folder '{folder_name}' contains {len(processes_in_folder)} process(es).\n"
+                f"Folder '{folder_name}' contains {len(process_ids)} process(es).\n"
                 "Deleting this folder will also delete all processes and their outputs.\n\n"
                 "Are you sure you want to continue?",
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
@@ -702,13 +302,14 @@ class MainWindow(QMainWindow):
             )
 
         if reply == QMessageBox.StandardButton.Yes:
-            # Delete all processes in the folder
-            for process in processes_in_folder:
-                self.delete_process_internal(process['id'], skip_confirmation=True)
+            # Delete all processes in the folder (the current folder's records are loaded)
+            for process_id in process_ids:
+                self.delete_process_internal(process_id, skip_confirmation=True)
 
             # Delete folder
             del self.folders[self.current_folder]
-            self.save_folders_state()
+            self.db.delete_folder(self.current_folder)
+            self.save_processes_state()
 
             # Switch to root
             self.current_folder = "root"
@@ -749,18 +350,19 @@ class MainWindow(QMainWindow):
                 item.setSelected(True)
 
     def refresh_process_list(self):
-        # Clear existing widgets
-        while self.process_layout.count() > 1:  # Keep the stretch
-            item = self.process_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        self.process_widgets.clear()
-
-        # Add processes from current folder
-        for process_id, process_data in self.processes.items():
-            if process_data.get('folder_id', 'root') == self.current_folder:
-                self.add_process_widget(process_data)
+        # Show the processes of the current folder
+        self.process_model.set_processes(self.load_folder_processes(self.current_folder).keys())
+
+    def load_folder_processes(self, folder_id):
+        """
+        Returns {process_id: record} for a folder, querying the database and
+        keeping records that are already loaded (and possibly newer) in memory.
+        """
+        self.process_store.flush()
+        folder_processes = {}
+        for process_id, record in self.db.load_processes(folder_id=folder_id).items():
+            folder_processes[process_id] = self.processes.setdefault(process_id, record)
+        return folder_processes
 
     def create_new_process(self):
         dialog = QDialog(self)
@@ -797,6 +399,37 @@ class MainWindow(QMainWindow):
         model_layout.addWidget(QLabel("🤖 Model:"))
         model_layout.addWidget(model_input)
 
+        # Concurrency
+        concurrency_layout = QHBoxLayout()
+        concurrency_input = QSpinBox()
+        concurrency_input.setRange(1, 64)
+        concurrency_input.setValue(int(self.settings.get('max_concurrent_files', DEFAULT_MAX_CONCURRENT_FILES)))
+        concurrency_input.setToolTip("Number of PDFs extracted and sent to the model at the same time")
+        concurrency_input.setObjectName("concurrencyInput")
+        concurrency_layout.addWidget(QLabel("⚡ Files in flight:"))
+        concurrency_layout.addWidget(concurrency_input)
+
+        priority_input = QSpinBox()
+        priority_input.setRange(-10, 10)
+        priority_input.setValue(0)
+        priority_input.setToolTip("Higher priority processes get API slots first when the global limit is reached")
+        priority_input.setObjectName("priorityInput")
+        concurrency_layout.addWidget(QLabel("🔝 Priority:"))
+        concurrency_layout.addWidget(priority_input)
+        concurrency_layout.addStretch()
+
+        reuse_cache_input = QCheckBox("♻ Reuse cached results")
+        reuse_cache_input.setChecked(True)
+        reuse_cache_input.setToolTip("Skip the API call when the same model, instruction and PDF text were already processed")
+        reuse_cache_input.setObjectName("reuseCacheInput")
+        concurrency_layout.addWidget(reuse_cache_input)
+
+        stream_input = QCheckBox("📡 Stream responses")
+        stream_input.setChecked(True)
+        stream_input.setToolTip("Write output to a .partial file as tokens arrive and show live token counts")
+        stream_input.setObjectName("streamInput")
+        concurrency_layout.addWidget(stream_input)
+
         # PDF Folder
         pdf_folder_layout = QHBoxLayout()
         pdf_folder_input = QLineEdit()
@@ -812,6 +445,50 @@ class MainWindow(QMainWindow):
         pdf_folder_layout.addWidget(pdf_folder_input)
         pdf_folder_layout.addWidget(pdf_folder_btn)
 
+        # Budget, and a pre-flight estimate of what the process will cost
+        budget_layout = QHBoxLayout()
+        token_budget_input = QSpinBox()
+        token_budget_input.setRange(0, 2000000000)
+        token_budget_input.setSingleStep(100000)
+        token_budget_input.setSpecialValueText("No limit")
+        token_budget_input.setSuffix(" tokens")
+        token_budget_input.setToolTip("Files that would go over the budget are skipped, smallest files first")
+        token_budget_input.setObjectName("tokenBudgetInput")
+        budget_layout.addWidget(QLabel("💰 Budget:"))
+        budget_layout.addWidget(token_budget_input)
+
+        cost_budget_input = QDoubleSpinBox()
+        cost_budget_input.setRange(0, 1000000)
+        cost_budget_input.setDecimals(2)
+        cost_budget_input.setPrefix("$")
+        cost_budget_input.setSpecialValueText("No limit")
+        cost_budget_input.setToolTip("Uses the model prices from the settings")
+        cost_budget_input.setObjectName("costBudgetInput")
+        budget_layout.addWidget(cost_budget_input)
+
+        estimate_btn = QPushButton("📊 Estimate")
+        estimate_btn.setObjectName("estimateButton")
+        estimate_btn.setToolTip("Extract every PDF (or reuse the cached text) and estimate tokens, cost and time")
+        budget_layout.addWidget(estimate_btn)
+        budget_layout.addStretch()
+
+        estimate_label = QLabel()
+        estimate_label.setWordWrap(True)
+        estimate_label.setObjectName("estimateLabel")
+
+        dialog.preflight_report = None
+        estimate_btn.clicked.connect(lambda: self.estimate_process(
+            dialog,
+            pdf_folder_input.text(),
+            instruction_input.toPlainText(),
+            model_input.text(),
+            concurrency_input.value(),
+            token_budget_input.value(),
+            cost_budget_input.value(),
+            estimate_label
+        ))
+        dialog.finished.connect(lambda _: self.cancel_preflight())
+
         # Buttons
         button_layout = QHBoxLayout()
         create_btn = QPushButton("🚀 Create & Start")
@@ -824,6 +501,12 @@ class MainWindow(QMainWindow):
             instruction_input.toPlainText(),
             pdf_folder_input.text(),
             model_input.text(),
+            concurrency_input.value(),
+            priority_input.value(),
+            reuse_cache_input.isChecked(),
+            stream_input.isChecked(),
+            token_budget_input.value(),
+            cost_budget_input.value(),
             dialog
         ))
         cancel_btn.clicked.connect(dialog.reject)
@@ -837,188 +520,62 @@ class MainWindow(QMainWindow):
         layout.addWidget(instruction_label)
         layout.addWidget(instruction_input)
         layout.addLayout(model_layout)
+        layout.addLayout(concurrency_layout)
         layout.addLayout(pdf_folder_layout)
+        layout.addLayout(budget_layout)
+        layout.addWidget(estimate_label)
         layout.addStretch()
         layout.addLayout(button_layout)
 
         dialog.setLayout(layout)
 
-        # Apply theme to dialog
-        if self.theme == 'dark':
-            dialog.setStyleSheet("""
-                QDialog#newProcessDialog {
-                    background-color: #0a0a0a;
-                }
-                QLabel {
-                    color: #e0e0e0;
-                    font-weight: bold;
-                }
-                QLineEdit#processNameInput, QLineEdit#modelInput {
-                    padding: 10px;
-                    border: 2px solid #404040;
-                    border-radius: 6px;
-                    background-color: #2a2a2a;
-                    color: #e0e0e0;
-                    font-size: 12px;
-                }
-                QLineEdit#processNameInput:focus, QLineEdit#modelInput:focus {
-                    border: 2px solid #3498DB;
-                }
-                QLineEdit#pdfFolderInput {
-                    padding: 10px;
-                    border: 2px solid #404040;
-                    border-radius: 6px;
-                    background-color: #1a1a1a;
-                    font-size: 12px;
-                    color: #a0a0a0;
-                }
-                QTextEdit#instructionInput {
-                    padding: 10px;
-                    border: 2px solid #404040;
-                    border-radius: 6px;
-                    background-color: #2a2a2a;
-                    font-size: 12px;
-                    color: #e0e0e0;
-                }
-                QTextEdit#instructionInput:focus {
-                    border: 2px solid #3498DB;
-                }
-                QPushButton#browseButton {
-                    background-color: #3498DB;
-                    color: white;
-                    border: none;
-                    padding: 10px 20px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                }
-                QPushButton#browseButton:hover {
-                    background-color: #2980B9;
-                }
-                QPushButton#browseButton:pressed {
-                    background-color: #21618C;
-                }
-                QPushButton#createProcessButton {
-                    background-color: #2ECC71;
-                    color: white;
-                    border: none;
-                    padding: 12px 30px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }
-                QPushButton#createProcessButton:hover {
-                    background-color: #27AE60;
-                }
-                QPushButton#createProcessButton:pressed {
-                    background-color: #219653;
-                }
-                QPushButton#cancelProcessButton {
-                    background-color: #505050;
-                    color: white;
-                    border: none;
-                    padding: 12px 30px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }
-                QPushButton#cancelProcessButton:hover {
-                    background-color: #606060;
-                }
-                QPushButton#cancelProcessButton:pressed {
-                    background-color: #707070;
-                }
-            """)
-        else:
-            dialog.setStyleSheet("""
-                QDialog#newProcessDialog {
-                    background-color: #ECF0F1;
-                }
-                QLabel {
-                    color: #2C3E50;
-                    font-weight: bold;
-                }
-                QLineEdit#processNameInput, QLineEdit#modelInput {
-                    padding: 10px;
-                    border: 2px solid #BDC3C7;
-                    border-radius: 6px;
-                    background-color: #FFFFFF;
-                    font-size: 12px;
-                }
-                QLineEdit#processNameInput:focus, QLineEdit#modelInput:focus {
-                    border: 2px solid #3498DB;
-                }
-                QLineEdit#pdfFolderInput {
-                    padding: 10px;
-                    border: 2px solid #BDC3C7;
-                    border-radius: 6px;
-                    background-color: #F8F9FA;
-                    font-size: 12px;
-                    color: #7F8C8D;
-                }
-                QTextEdit#instructionInput {
-                    padding: 10px;
-                    border: 2px solid #BDC3C7;
-                    border-radius: 6px;
-                    background-color: #FFFFFF;
-                    font-size: 12px;
-                }
-                QTextEdit#instructionInput:focus {
-                    border: 2px solid #3498DB;
-                }
-                QPushButton#browseButton {
-                    background-color: #3498DB;
-                    color: white;
-                    border: none;
-                    padding: 10px 20px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                }
-                QPushButton#browseButton:hover {
-                    background-color: #2980B9;
-                }
-                QPushButton#browseButton:pressed {
-                    background-color: #21618C;
-                }
-                QPushButton#createProcessButton {
-                    background-color: #2ECC71;
-                    color: white;
-                    border: none;
-                    padding: 12px 30px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }
-                QPushButton#createProcessButton:hover {
-                    background-color: #27AE60;
-                }
-                QPushButton#createProcessButton:pressed {
-                    background-color: #219653;
-                }
-                QPushButton#cancelProcessButton {
-                    background-color: #95A5A6;
-                    color: white;
-                    border: none;
-                    padding: 12px 30px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                    font-size: 12px;
-                }
-                QPushButton#cancelProcessButton:hover {
-                    background-color: #7F8C8D;
-                }
-                QPushButton#cancelProcessButton:pressed {
-                    background-color: #6C7B7D;
-                }
-            """)
 
         dialog.exec()
 
+    def estimate_process(self, dialog, pdf_folder, instruction, model_name, concurrency,
+                         token_budget, cost_budget, label):
+        if not pdf_folder or not os.path.exists(pdf_folder):
+            label.setText("Select a PDF folder to estimate.")
+            return
+
+        self.cancel_preflight()
+        worker = PreflightWorker(pdf_folder, instruction, model_name, self.settings, concurrency)
+        worker.progress.connect(lambda done, total: label.setText(f"Estimating... {done}/{total} files"))
+        worker.failed.connect(lambda error: label.setText(f"Estimate failed: {error}"))
+
+        def on_report(report):
+            if report is None:
+                return
+            dialog.preflight_report = report
+            label.setText(report.summary(token_budget, cost_budget))
+
+        worker.report_ready.connect(on_report)
+        self.preflight_worker = worker
+        label.setText("Estimating...")
+        worker.start()
+
+    def cancel_preflight(self):
+        """Stops the running estimate without waiting; its thread is deleted once it ends"""
+        worker, self.preflight_worker = self.preflight_worker, None
+        if worker is None:
+            return
+        worker.cancel()
+        for signal in (worker.progress, worker.report_ready, worker.failed):
+            signal.disconnect()
+        self.stopping_preflights.add(worker)
+        worker.finished.connect(lambda: self.stopping_preflights.discard(worker))
+        worker.finished.connect(worker.deleteLater)
+        if not worker.isRunning():  # ended before the connections were made
+            self.stopping_preflights.discard(worker)
+            worker.deleteLater()
+
     def select_folder(self, line_edit):
         folder = QFileDialog.getExistingDirectory(self, "Select Folder")
         if folder:
             line_edit.setText(folder)
 
-    def start_new_process(self, name, instruction, pdf_folder, model_name, dialog):
+    def start_new_process(self, name, instruction, pdf_folder, model_name, max_concurrent_files,
+                          priority, reuse_cached_results, stream_responses, token_budget, cost_budget, dialog):
         if not name or not instruction or not pdf_folder:
             QMessageBox.warning(self, "Error", "All fields are required!")
             return
@@ -1050,6 +607,12 @@ class MainWindow(QMainWindow):
             'pdf_folder': pdf_folder,
             'output_folder': output_folder,
             'model_name': model_name,
+            'max_concurrent_files': max_concurrent_files,
+            'priority': priority,
+            'reuse_cached_results': reuse_cached_results,
+            'stream_responses': stream_responses,
+            'token_budget': token_budget,
+            'cost_budget': cost_budget,
             'folder_id': self.current_folder,
             'status': 'pending',
             'current': 0,
@@ -1058,33 +621,22 @@ class MainWindow(QMainWindow):
             'created_at': datetime.now().isoformat()
         }
 
+        if dialog.preflight_report is not None:
+            process_data['preflight_tokens'] = dialog.preflight_report.token_estimates()
+
         self.processes[process_id] = process_data
-        self.process_logs[process_id] = []
+        self.process_index.add(process_id, process_data['folder_id'], process_data['status'])
 
         if process_data.get('folder_id', 'root') == self.current_folder:
-            self.add_process_widget(process_data)
+            self.process_model.add_process(process_id)
 
-        self.save_processes_state()
+        self.process_store.mark_dirty(process_id)
 
         # Start worker
         QTimer.singleShot(100, lambda: self.start_worker(process_id))
 
         dialog.accept()
 
-    def add_process_widget(self, process_data):
-        widget = ProcessWidget(process_data, self, self.theme)
-
-        # Connect signals
-        widget.pause_clicked.connect(self.pause_process)
-        widget.resume_clicked.connect(self.resume_process)
-        widget.cancel_clicked.connect(self.cancel_process)
-        widget.delete_clicked.connect(self.delete_process)
-        widget.open_folder_clicked.connect(self.open_output_folder)
-        widget.view_logs_clicked.connect(self.view_logs)
-
-        self.process_layout.insertWidget(self.process_layout.count() - 1, widget)
-        self.process_widgets[process_data['id']] = widget
-
     def start_worker(self, process_id):
         if process_id in self.workers and self.workers[process_id].isRunning():
             return
@@ -1092,11 +644,21 @@ class MainWindow(QMainWindow):
         if process_id not in self.processes:
             return
 
-        worker = ProcessWorker(self.processes[process_id], self.settings)
-        worker.progress_updated.connect(self.on_progress_updated)
-        worker.status_changed.connect(self.on_status_changed)
+        # A live lease means cli.py (or another window) is running the process
+        if not self.db.acquire_lease(process_id):
+            self.on_log_message(process_id, "Not started: the process is running in another instance")
+            return
+
+        if self.settings.get('execution_engine') == 'asyncio':
+            worker = AsyncProcessWorker(self.processes[process_id], self.settings)
+        else:
+            worker = ProcessWorker(self.processes[process_id], self.settings)
+        # Progress, status and logs are batched into one UI refresh per frame
+        worker.progress_updated.connect(self.ui_updates.queue_progress)
+        worker.status_changed.connect(self.ui_updates.queue_status)
+        worker.log_message.connect(self.ui_updates.queue_log)
+        worker.token_progress.connect(self.ui_updates.queue_tokens)
         worker.finished.connect(self.on_process_finished)
-        worker.log_message.connect(self.on_log_message)
 
         self.workers[process_id] = worker
         worker.start()
@@ -1105,19 +667,11 @@ class MainWindow(QMainWindow):
         if process_id in self.workers:
             self.workers[process_id].pause()
             self.on_status_changed(process_id, 'paused')
-            widget = self.process_widgets.get(process_id)
-            if widget:
-                widget.pause_btn.hide()
-                widget.resume_btn.show()
 
     def resume_process(self, process_id):
         if process_id in self.workers:
             self.workers[process_id].resume()
             self.on_status_changed(process_id, 'running')
-            widget = self.process_widgets.get(process_id)
-            if widget:
-                widget.resume_btn.hide()
-                widget.pause_btn.show()
 
     def cancel_process(self, process_id):
         reply = QMessageBox.question(self, "Confirm Cancel",
@@ -1175,18 +729,14 @@ class MainWindow(QMainWindow):
                     QMessageBox.warning(self, "Warning", f"Failed to delete output folder: {str(e)}")
 
         # Remove from UI
-        if process_id in self.process_widgets:
-            widget = self.process_widgets[process_id]
-            self.process_layout.removeWidget(widget)
-            widget.deleteLater()
-            del self.process_widgets[process_id]
-
-        # Remove from data
-        if process_id in self.process_logs:
-            del self.process_logs[process_id]
+        self.process_model.remove_process(process_id)
 
+        # Remove from data (per-file results are removed with the record)
+        self.ui_updates.discard(process_id)
+        self.log_store.delete(process_id)
         del self.processes[process_id]
-        self.save_processes_state()
+        self.process_index.remove(process_id)
+        self.process_store.mark_dirty(process_id)
 
         if not skip_confirmation:
             QMessageBox.information(self, "Success", f"Process '{process_name}' deleted successfully!")
@@ -1204,124 +754,47 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "Output folder does not exist yet.")
 
     def view_logs(self, process_id):
-        logs = self.process_logs.get(process_id, [])
-        log_text = "\n".join(logs) if logs else "No logs available yet."
-
-        dialog = QDialog(self)
-        dialog.setWindowTitle(f"📋 Logs - {self.processes[process_id]['name']}")
-        dialog.setMinimumWidth(600)
-        dialog.setMinimumHeight(400)
-        dialog.setObjectName("logDialog")
-
-        layout = QVBoxLayout()
-
-        log_display = QTextEdit()
-        log_display.setReadOnly(True)
-        log_display.setPlainText(log_text)
-        log_display.setObjectName("logDisplay")
-
-        close_btn = QPushButton("Close")
-        close_btn.setObjectName("closeLogButton")
-        close_btn.clicked.connect(dialog.accept)
-
-        layout.addWidget(log_display)
-        layout.addWidget(close_btn)
-
-        dialog.setLayout(layout)
-
-        # Apply theme to log dialog
-        if self.theme == 'dark':
-            dialog.setStyleSheet("""
-                QDialog#logDialog {
-                    background-color: #0a0a0a;
-                }
-                QTextEdit#logDisplay {
-                    background-color: #1a1a1a;
-                    color: #e0e0e0;
-                    font-family: 'Courier New', monospace;
-                    font-size: 11px;
-                    padding: 10px;
-                    border: 2px solid #404040;
-                    border-radius: 6px;
-                }
-                QPushButton#closeLogButton {
-                    background-color: #3498DB;
-                    color: white;
-                    border: none;
-                    padding: 10px 20px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                }
-                QPushButton#closeLogButton:hover {
-                    background-color: #2980B9;
-                }
-                QPushButton#closeLogButton:pressed {
-                    background-color: #21618C;
-                }
-            """)
-        else:
-            dialog.setStyleSheet("""
-                QDialog#logDialog {
-                    background-color: #ECF0F1;
-                }
-                QTextEdit#logDisplay {
-                    background-color: #2C3E50;
-                    color: #ECF0F1;
-                    font-family: 'Courier New', monospace;
-                    font-size: 11px;
-                    padding: 10px;
-                    border: 2px solid #34495E;
-                    border-radius: 6px;
-                }
-                QPushButton#closeLogButton {
-                    background-color: #3498DB;
-                    color: white;
-                    border: none;
-                    padding: 10px 20px;
-                    border-radius: 6px;
-                    font-weight: bold;
-                }
-                QPushButton#closeLogButton:hover {
-                    background-color: #2980B9;
-                }
-                QPushButton#closeLogButton:pressed {
-                    background-color: #21618C;
-                }
-            """)
+        from core.dialogs import LogViewerDialog
 
+        dialog = LogViewerDialog(self.log_store, process_id, self.processes[process_id]['name'],
+                                 self, self.theme)
         dialog.exec()
 
     def on_progress_updated(self, process_id, current, total):
-        if process_id in self.process_widgets:
-            # Force immediate UI update
-            widget = self.process_widgets[process_id]
-            widget.update_progress(current, total)
-            widget.repaint()  # Force widget repaint
-            QApplication.processEvents()  # Process pending events
-
         if process_id in self.processes:
             self.processes[process_id]['current'] = current
             self.processes[process_id]['total'] = total
-            self.save_processes_state()
+            self.processes[process_id]['progress'] = int((current / total) * 100) if total > 0 else 0
+            self.process_store.mark_dirty(process_id)
+            self.process_model.refresh(process_id)
 
-    def on_status_changed(self, process_id, status):
-        if process_id in self.process_widgets:
-            self.process_widgets[process_id].update_status(status)
+    def on_token_progress(self, process_id, pdf_file, tokens):
+        self.process_model.set_token_progress(process_id, pdf_file, tokens)
 
+    def on_status_changed(self, process_id, status):
         if process_id in self.processes:
             self.processes[process_id]['status'] = status
-            self.save_processes_state()
+            self.process_index.set_status(process_id, status)
+            self.process_store.mark_dirty(process_id)
+            self.process_model.refresh(process_id)
 
     def on_log_message(self, process_id, message):
-        if process_id not in self.process_logs:
-            self.process_logs[process_id] = []
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        self.process_logs[process_id].append(f"[{timestamp}] {message}")
+        if process_id in self.processes:
+            self.log_store.append([(process_id, message)])
+
+    def on_log_messages(self, entries):
+        """Store a batch of (process_id, message) log entries"""
+        self.log_store.append([(process_id, message) for process_id, message in entries
+                               if process_id in self.processes])
 
     def on_process_finished(self, process_id, success, message):
+        # Apply queued updates first so they cannot overwrite the final status
+        self.ui_updates.flush()
+
         if process_id in self.workers:
             self.workers[process_id].wait()  # Wait for thread to finish
             del self.workers[process_id]
+        self.db.release_lease(process_id)
 
         status = 'completed' if success else 'failed'
         self.on_status_changed(process_id, status)
@@ -1336,81 +809,86 @@ class MainWindow(QMainWindow):
             msg.exec()
 
     def update_statistics(self):
-        # Only count processes in current folder
-        current_processes = [p for p in self.processes.values()
-                             if p.get('folder_id', 'root') == self.current_folder]
+        # Only count processes in current folder; counters are kept up to date on every change
+        counts = self.process_index.status_counts(self.current_folder)
 
-        total = len(current_processes)
-        completed = sum(1 for p in current_processes if p['status'] == 'completed')
-        failed = sum(1 for p in current_processes if p['status'] == 'failed')
-        running = sum(1 for p in current_processes if p['status'] == 'running')
+        total = sum(counts.values())
+        completed = counts.get('completed', 0)
+        failed = counts.get('failed', 0)
+        running = counts.get('running', 0)
 
         self.total_label.setText(f"📋 Total: {total}")
         self.completed_label.setText(f"✅ Completed: {completed}")
         self.failed_label.setText(f"❌ Failed: {failed}")
         self.running_label.setText(f"⚡ Running: {running}")
 
+        # Highlight non-zero counters; unchanged values cost nothing
+        set_status(self.completed_label, 'completed' if completed else '')
+        set_status(self.failed_label, 'failed' if failed else '')
+        set_status(self.running_label, 'running' if running else '')
+
     def open_settings(self):
+        from core.dialogs import SettingsDialog
+
         dialog = SettingsDialog(self, self.theme)
         if dialog.exec():
             self.settings = dialog.get_settings()
+            get_scheduler().configure(self.settings)
             # Update theme if changed
             new_theme = 'dark' if self.settings.get('theme', 'Light Theme') == 'Dark Theme' else 'light'
             if new_theme != self.theme:
                 self.theme = new_theme
                 self.apply_theme()
-                # Update all existing process widgets
-                for widget in self.process_widgets.values():
-                    widget.set_theme(self.theme)
+                self.process_delegate.set_theme(self.theme)
+                self.process_view.viewport().update()
+
+    def open_analytics(self):
+        from core.dialogs import AnalyticsDialog
+
+        # Non-modal, so it can stay open next to running processes
+        dialog = AnalyticsDialog(self, self.theme)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.show()
 
     def load_settings(self):
         try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r') as f:
-                    return json.load(f)
+            return self.db.load_settings()
         except Exception as e:
             print(f"Error loading settings: {e}")
         return {}
 
     def save_processes_state(self):
-        try:
-            with open(self.processes_file, 'w') as f:
-                json.dump(self.processes, f, indent=2)
-        except Exception as e:
-            print(f"Error saving processes: {e}")
+        """Write any pending process changes immediately"""
+        self.process_store.flush()
 
     def load_processes_state(self):
+        """Load the current folder's processes plus any that need resuming"""
         try:
-            if os.path.exists(self.processes_file):
-                with open(self.processes_file, 'r') as f:
-                    self.processes = json.load(f)
-
-                    for process_data in self.processes.values():
-                        if process_data['id'] not in self.process_logs:
-                            self.process_logs[process_data['id']] = []
+            self.processes.update(self.db.load_processes(statuses=UNFINISHED_STATUSES))
+            self.processes.update(self.db.load_processes(folder_id=self.current_folder))
         except Exception as e:
             print(f"Error loading processes: {e}")
 
-    def save_folders_state(self):
+    def load_folders_state(self):
         try:
-            with open(self.folders_file, 'w') as f:
-                json.dump(self.folders, f, indent=2)
+            self.folders = self.db.load_folders()
         except Exception as e:
-            print(f"Error saving folders: {e}")
+            print(f"Error loading folders: {e}")
 
-    def load_folders_state(self):
+    def renew_leases(self):
         try:
-            if os.path.exists(self.folders_file):
-                with open(self.folders_file, 'r') as f:
-                    self.folders = json.load(f)
+            self.db.renew_leases()
         except Exception as e:
-            print(f"Error loading folders: {e}")
+            print(f"Error renewing process leases: {e}")
 
     def resume_processes(self):
         """Resume incomplete processes on startup"""
-        for process_id, process_data in self.processes.items():
-            if process_data['status'] in ['pending', 'running', 'paused']:
-                self.start_worker(process_id)
+        # API requests are gated by the global scheduler, so starting every
+        # worker here only queues their work; higher priorities start first.
+        # Processes leased by a live headless runner are skipped in start_worker
+        unfinished = [p for p in self.processes.values() if p['status'] in UNFINISHED_STATUSES]
+        for process_data in sorted(unfinished, key=lambda p: -p.get('priority', 0)):
+            self.start_worker(process_data['id'])
 
     def closeEvent(self, event):
         """Save state and cleanup before closing"""
@@ -1422,12 +900,23 @@ class MainWindow(QMainWindow):
                 if worker.isRunning():
                     worker.terminate()
 
+        self.cancel_preflight()
+        for worker in list(self.stopping_preflights):
+            worker.wait(2000)
+
+        shutdown_async_engine()
+        shutdown_extraction_pool()
+        shutdown_mock_backend()
+        get_client_manager().close_all()
         self.save_processes_state()
-        self.save_folders_state()
+        self.db.release_leases()
         event.accept()
 
 
 def main():
+    # Required for the extraction process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
+
     app = QApplication(sys.argv)
 
     # Set application style
@@ -1451,7 +940,12 @@ def main():
     app.setPalette(palette)
 
     window = MainWindow()
+    startup.mark("main window created")
     window.show()
+    startup.mark("main window shown")
+
+    # Heavy libraries load in the background once the window is up
+    QTimer.singleShot(0, startup.prewarm)
 
     sys.exit(app.exec())
 
@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+pytest.importorskip('PyQt6.QtWidgets')
+
+from PyQt6.QtCore import qInstallMessageHandler
+from PyQt6.QtGui import QColor, QPalette
+from PyQt6.QtWidgets import QApplication, QLabel
+
+from core.theme import PALETTES, stylesheet, set_status
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def qt_messages():
+    """Warnings Qt logs while the test runs, e.g. stylesheet parse errors"""
+    messages = []
+    previous = qInstallMessageHandler(lambda mode, context, message: messages.append(message))
+    yield messages
+    qInstallMessageHandler(previous)
+
+
+@pytest.mark.parametrize('theme', ['dark', 'light'])
+def test_status_label_uses_the_status_colour(app, qt_messages, theme):
+    app.setStyleSheet(stylesheet(theme))
+    label = QLabel("running")
+    set_status(label, 'running')
+    label.ensurePolished()
+
+    assert not [message for message in qt_messages if 'parse' in message.lower()]
+    text = PALETTES[theme]['status']['running'][0]
+    assert label.palette().color(QPalette.ColorRole.WindowText) == QColor(text)
+
+    set_status(label, 'failed')
+    assert label.palette().color(QPalette.ColorRole.WindowText) == QColor(PALETTES[theme]['status']['failed'][0])
+    app.setStyleSheet("")
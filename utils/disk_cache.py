@@ -0,0 +1,131 @@
+import os
+import logging
+import threading
+
+from utils.fileio import atomic_write_text
+
+
+logger = logging.getLogger(__name__)
+
+# Writes between full rescans of the directory; other processes sharing it
+# make the in-memory size estimate drift
+RESCAN_INTERVAL = 200
+
+
+class DiskCache:
+    """
+    Content-addressed text cache on disk with size-bounded LRU eviction.
+
+    Each entry is one file named after its key (sharded by the first two hex
+    characters). Recency is tracked through the file modification time, which is
+    refreshed on every hit, so several processes can share the same directory
+    without any index file. The total size is tracked in memory, so the
+    directory is only scanned when the cache looks full or every
+    RESCAN_INTERVAL writes.
+    """
+
+    def __init__(self, cache_dir, max_bytes, suffix='.txt'):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.lock = threading.Lock()
+        self.total_bytes = None  # estimate; None until the first scan
+        self.writes_since_scan = 0
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + self.suffix)
+
+    def get(self, key):
+        """Returns the cached text for key, or None on a miss"""
+        path = self.path_for(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except OSError:
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return text
+
+    def put(self, key, text):
+        """Stores text under key and evicts old entries if over the size limit"""
+        path = self.path_for(key)
+        old_size = self.size_of(path)
+        try:
+            atomic_write_text(path, text)
+        except OSError as e:
+            logger.error("Error writing cache entry: %s", e)
+            return
+
+        with self.lock:
+            if self.total_bytes is not None:
+                self.total_bytes += self.size_of(path) - old_size
+                self.writes_since_scan += 1
+            scan = (self.total_bytes is None or self.total_bytes > self.max_bytes
+                    or self.writes_since_scan >= RESCAN_INTERVAL)
+        if scan:
+            self.evict()
+
+    def size_of(self, path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    def delete(self, key):
+        path = self.path_for(key)
+        size = self.size_of(path)
+        try:
+            os.remove(path)
+        except OSError:
+            return
+        with self.lock:
+            if self.total_bytes is not None:
+                self.total_bytes -= size
+
+    def entries(self):
+        """Yields (path, size, mtime) for every entry in the cache"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(self.suffix) and not entry.name.startswith('.tmp_'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def evict(self):
+        """
+        Scans the directory, resetting the size estimate, and removes least
+        recently used entries until the cache fits in max_bytes
+        """
+        with self.lock:
+            entries = list(self.entries())
+            total = sum(size for _, size, _ in entries)
+            if total > self.max_bytes:
+                for path, size, _ in sorted(entries, key=lambda e: e[2]):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        continue
+                    total -= size
+                    if total <= self.max_bytes:
+                        break
+            self.total_bytes = total
+            self.writes_since_scan = 0
+
+    def clear(self):
+        for path, _, _ in list(self.entries()):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self.lock:
+            self.total_bytes = None
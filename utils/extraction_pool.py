@@ -0,0 +1,62 @@
+import os
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from utils.pdf_extract import extract_text_with_precision, load_extractor
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def default_pool_size():
+    """One extraction process per core, leaving one core for the GUI"""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def get_extraction_pool(max_workers=None):
+    """
+    Returns the process pool shared by every worker for PDF extraction.
+
+    Layout analysis in pymupdf4llm is CPU bound and holds the GIL, so it runs in
+    separate processes instead of on the worker threads. The pool is created on
+    first use; max_workers only applies to that first call.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Each worker loads the extraction libraries as it starts, not on its first file
+            _pool = ProcessPoolExecutor(max_workers=max_workers or default_pool_size(),
+                                        initializer=load_extractor)
+        return _pool
+
+
+def extract_timed(pdf_path, max_pages=None):
+    """Runs in a pool process: (extracted text, seconds spent on it, excluding time queued in the pool)"""
+    start = time.perf_counter()
+    content = extract_text_with_precision(pdf_path, True, max_pages)
+    return content, time.perf_counter() - start
+
+
+def submit_extraction(pdf_path, max_workers=None, max_pages=None):
+    """Schedules extract_timed in the pool and returns its Future"""
+    global _pool
+    try:
+        return get_extraction_pool(max_workers).submit(extract_timed, pdf_path, max_pages)
+    except BrokenProcessPool:
+        # A crashed child (e.g. a segfault on a malformed PDF) breaks the whole
+        # pool; replace it so the remaining files can still be extracted
+        with _pool_lock:
+            _pool = None
+        return get_extraction_pool(max_workers).submit(extract_timed, pdf_path, max_pages)
+
+
+def shutdown_extraction_pool():
+    """Stops the pool without waiting for queued extractions"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
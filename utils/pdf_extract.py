@@ -1,74 +1,159 @@
-import os
-import re
-import pymupdf.layout
-import pymupdf4llm
-
-
-def extract_text_with_precision(pdf_path):
-    """
-    Extracts text from a PDF using pymupdf4llm for fast Markdown conversion.
-    """
-    try:
-        # Check if file exists
-        if not os.path.exists(pdf_path):
-            print(f"Error: File not found at {pdf_path}")
-            return None
-
-        print(f"Converting {pdf_path} using pymupdf4llm...")
-
-        # specific_pages parameter can be used if you only want certain pages
-        # e.g., to_markdown(pdf_path, pages=[0, 1, 2])
-        full_text = pymupdf4llm.to_markdown(pdf_path)
-
-        # --- Post-Processing to remove References ---
-        # pymupdf4llm generates clean Markdown headers, making regex matching reliable.
-
-        lower_text = full_text.lower()
-        split_index = -1
-
-        pattern = re.compile(r'(?im)^#{2,}.*?references\b')  # case-insensitive, multiline
-        m = pattern.search(lower_text)
-        if m:
-            split_index = m.start()
-            print("match found at index:", m.start())  # index of match in the full string
-            print("matched text:", repr(m.group()))
-        else:
-            print("no match")
-
-        if split_index != -1:
-            print("References section detected and removed.")
-            res = full_text[:split_index].strip()
-        else:
-            res = full_text.strip()
-
-        return res
-
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        return None
-
-
-if __name__ == "__main__":
-    # Note: Ensure you have installed the library:
-    # pip install pymupdf4llm
-
-    pdf_file = r"D:\3_PC\temp\Repo_Draft\papers-2025-W05\2501.13925.pdf"
-
-    extracted_content = extract_text_with_precision(pdf_file)
-
-    if extracted_content:
-        # Saving to file
-        output_file = pdf_file.replace(".pdf", ".md")
-
-        # Ensure we don't accidentally overwrite the source if extensions match (unlikely here)
-        if output_file == pdf_file:
-            output_file += ".md"
-
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(extracted_content)
-
-        print(f"\n--- Extraction Complete ---\nSaved to: {output_file}")
-
-        # Print preview
-        print("\nPreview (first 500 chars):")
-        print(extracted_content[:500])
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+
+from utils.disk_cache import DiskCache
+from utils.fileio import hash_file
+
+
+EXTRACTION_CACHE_DIR = os.path.join("saves", "cache", "extraction")
+EXTRACTION_CACHE_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+
+# Anything that changes the extracted Markdown must be part of the cache key
+EXTRACTOR_OPTIONS = {
+    'strip_references': True,
+}
+
+# Pages converted per to_markdown call; small enough to stop soon after the references heading
+PAGE_BATCH_SIZE = 8
+
+REFERENCES_HEADING = re.compile(r'(?im)^#{2,}.*?references\b')  # case-insensitive, multiline
+
+extraction_cache = DiskCache(EXTRACTION_CACHE_DIR, EXTRACTION_CACHE_MAX_BYTES, suffix='.md')
+
+# Extraction runs in pool workers that share the CLI's stdout, which carries
+# its event stream, so messages go to logging (stderr) rather than print()
+logger = logging.getLogger(__name__)
+
+_extractor = None
+_extractor_lock = threading.Lock()
+
+
+def load_extractor():
+    """
+    Imports pymupdf and pymupdf4llm on first use; they pull in the layout
+    models and take seconds to load, so nothing imports them at startup.
+    Returns (pymupdf, pymupdf4llm).
+    """
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            import pymupdf
+            import pymupdf.layout  # must come before pymupdf4llm to enable layout analysis
+            import pymupdf4llm
+            _extractor = (pymupdf, pymupdf4llm)
+        return _extractor
+
+
+def extractor_version():
+    """Version string of the libraries that produce the Markdown"""
+    pymupdf, pymupdf4llm = load_extractor()
+    return "pymupdf4llm-{}/pymupdf-{}".format(
+        getattr(pymupdf4llm, '__version__', getattr(pymupdf4llm, 'version', 'unknown')),
+        getattr(pymupdf, 'VersionBind', 'unknown'),
+    )
+
+
+def extraction_cache_key(content_hash, max_pages=None):
+    """Cache key for a PDF's content hash under the current extractor version and options"""
+    payload = json.dumps({
+        'content_hash': content_hash,
+        'extractor': extractor_version(),
+        'options': dict(EXTRACTOR_OPTIONS, max_pages=max_pages or None),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def iter_markdown_pages(pdf_path, max_pages=None, batch_size=PAGE_BATCH_SIZE):
+    """
+    Yields the Markdown of a PDF a few pages at a time, as each batch is converted.
+
+    Stops at the first references heading (the chunk is cut just before it), so
+    the bibliography and appendices of long documents are never laid out, and
+    after max_pages pages if given.
+    """
+    pymupdf, pymupdf4llm = load_extractor()
+    with pymupdf.open(pdf_path) as doc:
+        page_count = doc.page_count if not max_pages else min(doc.page_count, max_pages)
+        for first in range(0, page_count, batch_size):
+            pages = list(range(first, min(first + batch_size, page_count)))
+            text = pymupdf4llm.to_markdown(doc, pages=pages)
+            if EXTRACTOR_OPTIONS['strip_references']:
+                # pymupdf4llm generates clean Markdown headers, making regex matching reliable
+                m = REFERENCES_HEADING.search(text)
+                if m:
+                    logger.info("References section detected in pages %d-%d; skipping the remaining pages.",
+                                first + 1, pages[-1] + 1)
+                    yield text[:m.start()]
+                    return
+            yield text
+
+
+def extract_text_with_precision(pdf_path, use_cache=True, max_pages=None):
+    """
+    Extracts text from a PDF using pymupdf4llm for fast Markdown conversion.
+    Results are cached on disk by file content hash, so the same paper is only
+    parsed once regardless of its path or the process that asks for it.
+    max_pages caps how many pages are converted (None or 0 for all).
+    """
+    try:
+        # Check if file exists
+        if not os.path.exists(pdf_path):
+            logger.error("File not found at %s", pdf_path)
+            return None
+
+        cache_key = None
+        if use_cache:
+            cache_key = extraction_cache_key(hash_file(pdf_path), max_pages)
+            cached = extraction_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Using cached extraction for %s", pdf_path)
+                return cached
+
+        logger.info("Converting %s using pymupdf4llm...", pdf_path)
+        res = "".join(iter_markdown_pages(pdf_path, max_pages)).strip()
+
+        if cache_key:
+            extraction_cache.put(cache_key, res)
+
+        return res
+
+    except Exception as e:
+        logger.error("Error extracting %s: %s", pdf_path, e)
+        return None
+
+
+if __name__ == "__main__":
+    # Converts one PDF to Markdown next to it:
+    # python -m utils.pdf_extract paper.pdf [output.md]
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m utils.pdf_extract PDF [OUTPUT]")
+        sys.exit(2)
+
+    pdf_file = sys.argv[1]
+
+    extracted_content = extract_text_with_precision(pdf_file)
+
+    if extracted_content:
+        # Saving to file
+        output_file = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(pdf_file)[0] + ".md"
+
+        # Ensure we don't accidentally overwrite the source if extensions match (unlikely here)
+        if output_file == pdf_file:
+            output_file += ".md"
+
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(extracted_content)
+
+        print(f"\n--- Extraction Complete ---\nSaved to: {output_file}")
+
+        # Print preview
+        print("\nPreview (first 500 chars):")
+        print(extracted_content[:500])
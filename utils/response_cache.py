@@ -0,0 +1,78 @@
+import os
+import json
+import time
+import hashlib
+
+from utils.disk_cache import DiskCache
+
+
+RESPONSE_CACHE_DIR = os.path.join("saves", "cache", "responses")
+DEFAULT_RESPONSE_CACHE_MAX_MB = 512
+DEFAULT_RESPONSE_CACHE_MAX_AGE_DAYS = 30
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def response_cache_key(model_name, instruction, params, content, endpoint=None, chunking=None):
+    """
+    Key for a completion: same endpoint, model, prompt, request parameters,
+    chunking options (documents split differently get different results) and
+    input text
+    """
+    payload = json.dumps({
+        'endpoint': endpoint,
+        'model': model_name,
+        'instruction': instruction,
+        'params': params,
+        'chunking': chunking,
+        'content_hash': content_hash(content),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Persistent cache of model completions.
+
+    Entries are evicted least-recently-used once the cache exceeds max_bytes,
+    and are ignored (and removed) once they are older than max_age_seconds.
+    """
+
+    def __init__(self, cache_dir=RESPONSE_CACHE_DIR,
+                 max_bytes=DEFAULT_RESPONSE_CACHE_MAX_MB * 1024 * 1024,
+                 max_age_seconds=DEFAULT_RESPONSE_CACHE_MAX_AGE_DAYS * 86400):
+        self.cache = DiskCache(cache_dir, max_bytes, suffix='.json')
+        self.max_age_seconds = max_age_seconds
+
+    @classmethod
+    def from_settings(cls, settings):
+        max_mb = settings.get('response_cache_max_mb', DEFAULT_RESPONSE_CACHE_MAX_MB)
+        max_age_days = settings.get('response_cache_max_age_days', DEFAULT_RESPONSE_CACHE_MAX_AGE_DAYS)
+        return cls(max_bytes=int(max_mb) * 1024 * 1024,
+                   max_age_seconds=float(max_age_days) * 86400)
+
+    def get(self, key):
+        """Returns the cached completion text, or None on a miss or expired entry"""
+        raw = self.cache.get(key)
+        if raw is None:
+            return None
+
+        try:
+            entry = json.loads(raw)
+        except ValueError:
+            self.cache.delete(key)
+            return None
+
+        if time.time() - entry.get('created_at', 0) > self.max_age_seconds:
+            self.cache.delete(key)
+            return None
+        return entry.get('response')
+
+    def put(self, key, response, model_name=None):
+        self.cache.put(key, json.dumps({
+            'created_at': time.time(),
+            'model': model_name,
+            'response': response,
+        }))